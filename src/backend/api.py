@@ -32,6 +32,7 @@ class BackendAPI(QObject):
         super().__init__()
         self.main_window = main_window
         self._converter = None  # Lazy loaded for faster startup
+        self._diagram_cache = None
         logger.info("Backend API initialized")
 
     @property
@@ -43,6 +44,43 @@ class BackendAPI(QObject):
             logger.info("DocumentConverter initialized (lazy load)")
         return self._converter
 
+    @property
+    def diagram_cache(self):
+        """Rasterized Mermaid diagrams for the PDF export (lazy loaded)"""
+        if self._diagram_cache is None:
+            from backend.diagram_cache import DiagramCache
+            self._diagram_cache = DiagramCache()
+        return self._diagram_cache
+
+    def _pdf_import_workers(self) -> int:
+        """Worker processes for PDF import (0 = one per CPU core, 1 = serial)"""
+        settings = QSettings("Saekim", "SaekimEditor")
+        return settings.value("pdf_import/workers", 0, type=int)
+
+    def _pdf_import_options(self):
+        """Image, cache and memory settings for PDF import"""
+        from backend.pdf_import import PdfImportOptions
+
+        settings = QSettings("Saekim", "SaekimEditor")
+        defaults = PdfImportOptions()
+        return PdfImportOptions(
+            image_max_dimension=settings.value("pdf_import/image_max_dimension",
+                                               defaults.image_max_dimension, type=int),
+            image_format=settings.value("pdf_import/image_format", defaults.image_format, type=str),
+            image_quality=settings.value("pdf_import/image_quality", defaults.image_quality, type=int),
+            image_writer_threads=settings.value("pdf_import/image_writer_threads",
+                                                defaults.image_writer_threads, type=int),
+            page_cache=settings.value("pdf_import/page_cache", defaults.page_cache, type=bool),
+            page_cache_max_mb=settings.value("pdf_import/page_cache_max_mb",
+                                             defaults.page_cache_max_mb, type=int),
+            low_memory=settings.value("pdf_import/low_memory", defaults.low_memory, type=bool),
+            table_engine=settings.value("pdf_import/table_engine", defaults.table_engine, type=str),
+            column_detection=settings.value("pdf_import/column_detection",
+                                            defaults.column_detection, type=bool),
+            vector_figures=settings.value("pdf_import/vector_figures", defaults.vector_figures, type=bool),
+            figure_dpi=settings.value("pdf_import/figure_dpi", defaults.figure_dpi, type=int),
+        )
+
     @property
     def tab_manager(self):
         """Get tab manager from main window"""
@@ -422,6 +460,18 @@ class BackendAPI(QObject):
             self.main_window.status_bar.update_position(line, column)
             self.main_window.status_bar.update_word_count(word_count, char_count)
 
+    @pyqtSlot(int, int)
+    def editor_scrolled(self, top_line: int, line_count: int):
+        """
+        Follow editor scrolling in the PDF source viewer
+
+        Args:
+            top_line: Line at the top of the editor (0-based)
+            line_count: Number of lines in the editor
+        """
+        if hasattr(self.main_window, 'on_editor_scrolled'):
+            self.main_window.on_editor_scrolled(top_line, line_count)
+
     def _ensure_playwright_browser(self) -> bool:
         """Check and install Playwright browser if needed"""
         if self.converter.check_playwright_browser():
@@ -500,7 +550,12 @@ class BackendAPI(QObject):
             if lines and lines[0].startswith('#'):
                 title = lines[0].lstrip('#').strip()
 
-            success, error = self.converter.markdown_to_pdf(markdown_content, file_path, title)
+            # Relative image paths are relative to the Markdown file
+            base_dir = None
+            if self.active_tab and self.active_tab.file_path:
+                base_dir = str(self.active_tab.file_path.parent)
+
+            success, error = self.converter.markdown_to_pdf(markdown_content, file_path, title, base_dir)
 
             if success:
                 logger.info(f"PDF exported: {file_path}")
@@ -573,19 +628,113 @@ class BackendAPI(QObject):
 
             success, error = self.converter.html_to_pdf(rendered_html, file_path, title)
 
+            optimizing = False
             if success:
                 logger.info(f"PDF exported from HTML: {file_path}")
+                # Shrinks the file in the background (if enabled); the export is already usable
+                optimizing = self.main_window.optimize_exported_pdf(file_path)
 
             return json.dumps({
                 "success": success,
                 "filepath": file_path if success else "",
-                "error": error
+                "error": error,
+                "optimizing": optimizing
             })
 
         except Exception as e:
             logger.error(f"Error in generate_pdf_from_html: {e}")
             return json.dumps({"success": False, "filepath": "", "error": str(e)})
 
+    @pyqtSlot(result=str)
+    def get_pdf_export_engine(self) -> str:
+        """
+        PDF export engine selected in settings
+
+        Returns:
+            "playwright" (separate headless Chromium) or "qt" (print the preview with QtWebEngine)
+        """
+        settings = QSettings("Saekim", "SaekimEditor")
+        return settings.value("export/engine", "playwright", type=str)
+
+    @pyqtSlot(str, result=str)
+    def print_preview_to_pdf(self, file_path: str) -> str:
+        """
+        Print the active tab's preview to PDF with QtWebEngine
+        The result is delivered later to FileModule.onNativePDFFinished
+
+        Args:
+            file_path: Path to save the PDF
+
+        Returns:
+            JSON string with {success, filepath, error} (success means printing started)
+        """
+        try:
+            started = self.main_window.print_active_tab_to_pdf(file_path)
+            return json.dumps({
+                "success": started,
+                "filepath": "",
+                "error": "" if started else "No preview to print"
+            })
+
+        except Exception as e:
+            logger.error(f"Error in print_preview_to_pdf: {e}")
+            return json.dumps({"success": False, "filepath": "", "error": str(e)})
+
+    @pyqtSlot(str, result=str)
+    def get_cached_diagrams(self, diagrams_json: str) -> str:
+        """
+        Look up rasterized diagrams for the PDF export
+
+        Args:
+            diagrams_json: JSON list of {source, theme, scale}, one per diagram
+
+        Returns:
+            JSON string with {success, diagrams, error}; diagrams holds one
+            {key, data_url} per requested diagram, data_url is null on a miss
+        """
+        try:
+            cache = self.diagram_cache
+            diagrams = []
+            for diagram in json.loads(diagrams_json):
+                key = cache.diagram_key(diagram["source"], diagram["theme"], diagram["scale"])
+                diagrams.append({"key": key, "data_url": cache.get_data_url(key)})
+
+            hits = sum(1 for diagram in diagrams if diagram["data_url"])
+            logger.info(f"Diagram cache: {hits}/{len(diagrams)} hits")
+            return json.dumps({"success": True, "diagrams": diagrams, "error": ""})
+
+        except Exception as e:
+            logger.error(f"Error in get_cached_diagrams: {e}")
+            return json.dumps({"success": False, "diagrams": [], "error": str(e)})
+
+    @pyqtSlot(str, result=str)
+    def store_diagrams(self, diagrams_json: str) -> str:
+        """
+        Store diagrams rasterized by the PDF export
+
+        Args:
+            diagrams_json: JSON list of {key, data_url} with keys from get_cached_diagrams
+
+        Returns:
+            JSON string with {success, stored, error}
+        """
+        try:
+            cache = self.diagram_cache
+            stored = 0
+            for diagram in json.loads(diagrams_json):
+                # Keys come from the page; only ones get_cached_diagrams handed out are accepted
+                if not cache.is_valid_key(diagram["key"]):
+                    logger.warning(f"Rejected diagram cache key: {diagram['key']!r}")
+                    continue
+                if cache.put_data_url(diagram["key"], diagram["data_url"]):
+                    stored += 1
+            cache.trim()
+            return json.dumps({"success": True, "stored": stored, "error": ""})
+
+        except Exception as e:
+            logger.error(f"Error in store_diagrams: {e}")
+            return json.dumps({"success": False, "stored": 0, "error": str(e)})
+
     @pyqtSlot(str, str, result=str)
     def export_to_pdf_html(self, rendered_html: str, title: str) -> str:
         """
@@ -616,13 +765,17 @@ class BackendAPI(QObject):
 
             success, error = self.converter.html_to_pdf(rendered_html, file_path, title)
 
+            optimizing = False
             if success:
                 logger.info(f"PDF exported from HTML: {file_path}")
+                # Shrinks the file in the background (if enabled); the export is already usable
+                optimizing = self.main_window.optimize_exported_pdf(file_path)
 
             return json.dumps({
                 "success": success,
                 "filepath": file_path if success else "",
-                "error": error
+                "error": error,
+                "optimizing": optimizing
             })
 
         except Exception as e:
@@ -633,16 +786,18 @@ class BackendAPI(QObject):
     def import_from_pdf(self) -> str:
         """
         Import PDF and convert to markdown with enhanced extraction
-        Prompts user to save the markdown file and opens it in a new tab
+        Prompts for the PDF and the markdown save location, then converts
+        in the background while the result streams into a new tab
 
         Features:
         - Text extraction with heading/formatting detection
         - Table extraction
         - Image extraction (saved to {pdf_name}_images folder)
-        - Saves to user-selected location and opens in new tab
+        - Saves to user-selected location once conversion is complete
 
         Returns:
             JSON string with {success, filepath, images_dir, error}
+            (success means the import was started)
         """
         try:
             # Step 1: Select PDF file to import
@@ -666,29 +821,9 @@ class BackendAPI(QObject):
                     "error": "Cancelled"
                 })
 
-            # Step 2: Convert PDF to markdown
-            pdf_path = Path(pdf_file_path)
-            images_dir = pdf_path.parent / f"{pdf_path.stem}_images"
-
-            success, content, error = self.converter.pdf_to_markdown(
-                pdf_file_path,
-                output_dir=str(images_dir)
-            )
-
-            if not success:
-                return json.dumps({
-                    "success": False,
-                    "filepath": "",
-                    "images_dir": "",
-                    "error": error
-                })
-
-            logger.info(f"PDF converted to markdown: {pdf_file_path}")
-            if images_dir.exists():
-                logger.info(f"Images extracted to: {images_dir}")
-
-            # Step 3: Prompt user to save markdown file
+            # Step 2: Prompt user for the markdown file location
             # Default path is PDF directory with .md extension
+            pdf_path = Path(pdf_file_path)
             default_save_path = str(pdf_path.with_suffix('.md'))
 
             md_file_path, _ = QFileDialog.getSaveFileName(
@@ -706,30 +841,22 @@ class BackendAPI(QObject):
                     "error": "Save cancelled"
                 })
 
-            # Step 4: Save markdown file
-            save_success, final_content, save_error = FileManager.save_file(
-                content,
-                md_file_path,
-                None  # No old file path
-            )
-
-            if not save_success:
+            # Step 3: Convert in the background, streaming pages into a new tab
+            started = self.main_window.start_pdf_import(pdf_file_path, md_file_path)
+            if not started:
                 return json.dumps({
                     "success": False,
                     "filepath": "",
                     "images_dir": "",
-                    "error": f"Failed to save: {save_error}"
+                    "error": "Cancelled"
                 })
 
-            logger.info(f"Markdown file saved: {md_file_path}")
-
-            # Step 5: Open saved file in new tab
-            self.main_window.open_file_in_new_tab(md_file_path)
+            images_dir = Path(md_file_path).parent / f"{pdf_path.stem}_images"
 
             return json.dumps({
                 "success": True,
                 "filepath": md_file_path,
-                "images_dir": str(images_dir) if images_dir.exists() else "",
+                "images_dir": str(images_dir),
                 "error": ""
             })
 
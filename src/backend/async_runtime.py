@@ -0,0 +1,151 @@
+"""
+Async Runtime Module
+One background event loop for all converter coroutines
+"""
+
+import asyncio
+import threading
+import concurrent.futures
+from typing import Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class ConverterRuntime:
+    """
+    Event loop running on a background thread for the life of the process
+
+    Coroutines submitted from any thread run on this loop, so objects
+    bound to a loop (Playwright browsers, pages) can be kept between
+    calls and several coroutines can run concurrently. Qt code should not
+    block on the returned futures; wrap them in a FutureWatcher instead.
+
+    Usage:
+        runtime = get_runtime()
+        result = runtime.run(some_coroutine())          # blocking
+        future = runtime.submit(some_coroutine())       # concurrent.futures.Future
+        watcher = FutureWatcher(future, parent=self)    # Qt signals
+    """
+
+    def __init__(self, name: str = "converter-runtime"):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runtime's event loop, started on first use"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run_loop, name=self.name, daemon=True)
+                self._thread.start()
+                logger.info("Converter runtime started")
+            return self._loop
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def in_runtime(self) -> bool:
+        """True when called from the runtime's own thread"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the runtime loop"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the runtime loop and wait for its result"""
+        if self.in_runtime():
+            coro.close()
+            raise RuntimeError("ConverterRuntime.run() called from the runtime thread; await instead")
+        return self.submit(coro).result(timeout)
+
+    def shutdown(self, timeout: float = 10):
+        """Cancel what is still running and stop the loop"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+
+        async def cancel_pending():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_pending(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Converter runtime did not finish its tasks: {e}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+        logger.info("Converter runtime stopped")
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> ConverterRuntime:
+    """The process-wide converter runtime"""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = ConverterRuntime()
+        return _runtime
+
+
+def shutdown_runtime():
+    """Stop the process-wide runtime (on application exit)"""
+    global _runtime
+    with _runtime_lock:
+        runtime, _runtime = _runtime, None
+    if runtime is not None:
+        runtime.shutdown()
+
+
+class FutureWatcher(QObject):
+    """
+    Delivers the result of a runtime future to the Qt thread as signals
+
+    The future completes on the runtime thread; the signals are queued to
+    the thread the watcher lives in, so slots can touch widgets. Keep a
+    reference (or pass a parent) until one of the signals has fired.
+    """
+
+    finished = pyqtSignal(object)  # result
+    failed = pyqtSignal(str)  # error message
+
+    def __init__(self, future: concurrent.futures.Future, parent=None):
+        super().__init__(parent)
+        self.future = future
+        future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: concurrent.futures.Future):
+        if future.cancelled():
+            self.failed.emit("Cancelled")
+            return
+        error = future.exception()
+        if error is not None:
+            self.failed.emit(str(error))
+        else:
+            self.finished.emit(future.result())
+
+    def cancel(self) -> bool:
+        return self.future.cancel()
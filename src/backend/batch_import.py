@@ -0,0 +1,303 @@
+"""
+Batch Import Module
+Converts every PDF in a directory to Markdown on a worker pool
+"""
+
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from backend.fitz_lock import FITZ_LOCK
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+@dataclass
+class BatchFileResult:
+    """Outcome of converting one PDF"""
+    pdf_path: str
+    success: bool
+    pages: int = 0
+    seconds: float = 0.0
+    output_path: str = ""
+    error: str = ""
+    skipped: bool = False  # Already converted according to the manifest
+
+
+@dataclass
+class BatchImportReport:
+    """Aggregate result of a batch import"""
+    directory: str
+    results: List[BatchFileResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    cancelled: bool = False
+    error: str = ""  # Set if the batch itself could not run
+
+    @property
+    def converted(self) -> List[BatchFileResult]:
+        return [r for r in self.results if r.success and not r.skipped]
+
+    @property
+    def skipped(self) -> List[BatchFileResult]:
+        return [r for r in self.results if r.skipped]
+
+    @property
+    def failures(self) -> List[BatchFileResult]:
+        return [r for r in self.results if not r.success]
+
+    @property
+    def total_pages(self) -> int:
+        return sum(r.pages for r in self.converted)
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.total_pages / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """One-line summary for logs and dialogs"""
+        text = (f"{len(self.converted)} converted, {len(self.skipped)} skipped, "
+                f"{len(self.failures)} failed - {self.total_pages} pages in "
+                f"{self.elapsed:.1f}s ({self.pages_per_second:.1f} pages/s)")
+        if self.cancelled:
+            text += " [cancelled]"
+        return text
+
+
+def find_pdfs(directory, recursive: bool = False) -> List[Path]:
+    """PDF files in a directory, sorted by path"""
+    directory = Path(directory)
+    pattern = "**/*" if recursive else "*"
+    return sorted(p for p in directory.glob(pattern)
+                  if p.is_file() and p.suffix.lower() == ".pdf")
+
+
+def _convert_pdf_worker(pdf_path: str, options=None) -> BatchFileResult:
+    """
+    Process pool entry point for batch import.
+    Converts one PDF and writes {stem}.md and {stem}_images next to it.
+    """
+    from backend.converter import DocumentConverter
+
+    start = time.perf_counter()
+    pdf_path = Path(pdf_path)
+    md_path = pdf_path.with_suffix(".md")
+    images_dir = pdf_path.parent / f"{pdf_path.stem}_images"
+
+    try:
+        pages = 0
+        try:
+            import fitz  # PyMuPDF
+            with FITZ_LOCK, fitz.open(pdf_path) as doc:
+                pages = doc.page_count
+        except ImportError:
+            pass
+
+        # Files are already spread over the pool, so each one converts serially.
+        # Pages are streamed straight to the file so long documents stay cheap.
+        converter = DocumentConverter()
+        success, _, error = converter.pdf_to_markdown_file(
+            str(pdf_path), str(md_path), output_dir=str(images_dir), workers=1, options=options
+        )
+        if not success:
+            return BatchFileResult(str(pdf_path), False, pages, time.perf_counter() - start, error=error)
+
+        return BatchFileResult(str(pdf_path), True, pages, time.perf_counter() - start,
+                               output_path=str(md_path))
+
+    except Exception as e:
+        return BatchFileResult(str(pdf_path), False, seconds=time.perf_counter() - start, error=str(e))
+
+
+class BatchImporter:
+    """
+    Converts all PDFs of a directory, resuming interrupted runs.
+
+    Completed files are recorded in a JSON manifest in the directory,
+    together with the size and modification time of the source. A later
+    run skips every PDF whose manifest entry still matches and whose
+    Markdown output exists, so only new, changed or failed files are
+    converted again.
+
+    Usage:
+        importer = BatchImporter(directory, workers=4)
+        report = importer.run()
+        print(report.summary())
+    """
+
+    MANIFEST_NAME = ".saekim_import.json"
+    MANIFEST_VERSION = 1
+
+    def __init__(self, directory, workers: int = 0, recursive: bool = False, options=None):
+        """
+        Args:
+            directory: Folder containing the PDFs
+            workers: Processes converting files in parallel
+                     (1 = serial, 0 = one per CPU core)
+            recursive: Include PDFs in subfolders
+            options: PdfImportOptions passed to every conversion
+        """
+        self.directory = Path(directory)
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.recursive = recursive
+        self.options = options
+        self.manifest_path = self.directory / self.MANIFEST_NAME
+        self.manifest = self._load_manifest()
+
+    # ==================== Manifest ====================
+
+    def _load_manifest(self) -> dict:
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+                if manifest.get("version") == self.MANIFEST_VERSION:
+                    return manifest
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable batch import manifest: {e}")
+        return {"version": self.MANIFEST_VERSION, "files": {}}
+
+    def _save_manifest(self):
+        """Write the manifest atomically so an interrupted run never leaves it corrupt"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".saekim_import-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            logger.warning(f"Failed to save batch import manifest: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _manifest_key(self, pdf_path: Path) -> str:
+        return pdf_path.relative_to(self.directory).as_posix()
+
+    def is_done(self, pdf_path: Path) -> bool:
+        """True if the manifest says this exact file was already converted"""
+        entry = self.manifest["files"].get(self._manifest_key(pdf_path))
+        if not entry:
+            return False
+        stat = pdf_path.stat()
+        return (entry.get("size") == stat.st_size and
+                entry.get("mtime") == stat.st_mtime and
+                pdf_path.with_suffix(".md").exists())
+
+    def _record(self, result: BatchFileResult):
+        pdf_path = Path(result.pdf_path)
+        stat = pdf_path.stat()
+        self.manifest["files"][self._manifest_key(pdf_path)] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "pages": result.pages,
+            "output": Path(result.output_path).name,
+            "completed": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._save_manifest()
+
+    # ==================== Run ====================
+
+    def run(self, progress: Optional[Callable[[int, int, BatchFileResult], None]] = None,
+            cancel_event=None) -> BatchImportReport:
+        """
+        Convert all pending PDFs
+
+        Args:
+            progress: Called as progress(done, total, result) after each file
+            cancel_event: Optional threading.Event; once set, no new files
+                          are started and the ones already converting are
+                          waited for and recorded before returning
+
+        Returns:
+            BatchImportReport
+        """
+        start = time.perf_counter()
+        report = BatchImportReport(str(self.directory))
+
+        pdfs = find_pdfs(self.directory, self.recursive)
+        total = len(pdfs)
+        pending = []
+        for pdf_path in pdfs:
+            if self.is_done(pdf_path):
+                entry = self.manifest["files"][self._manifest_key(pdf_path)]
+                report.results.append(BatchFileResult(
+                    str(pdf_path), True, entry.get("pages", 0),
+                    output_path=str(pdf_path.with_suffix(".md")), skipped=True
+                ))
+            else:
+                pending.append(pdf_path)
+
+        logger.info(f"Batch PDF import: {total} PDFs in {self.directory}, "
+                    f"{len(pending)} to convert, {self.workers} workers")
+
+        def finish(result: BatchFileResult):
+            report.results.append(result)
+            if result.success:
+                self._record(result)
+            else:
+                logger.warning(f"Batch import failed for {result.pdf_path}: {result.error}")
+            if progress:
+                progress(len(report.results), total, result)
+
+        if progress:
+            for done, result in enumerate(report.results, 1):
+                progress(done, total, result)
+
+        remaining = self._run_pool(pending, finish, cancel_event) if self.workers > 1 and len(pending) > 1 \
+            else pending
+
+        # Serial path, also used to finish up if the process pool is unavailable
+        for pdf_path in remaining:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            finish(_convert_pdf_worker(str(pdf_path), self.options))
+
+        report.cancelled = cancel_event is not None and cancel_event.is_set()
+        report.elapsed = time.perf_counter() - start
+        logger.info(f"Batch PDF import finished: {report.summary()}")
+        return report
+
+    def _run_pool(self, pending: List[Path], finish, cancel_event) -> List[Path]:
+        """
+        Convert files on a process pool
+
+        Returns:
+            Files that still need converting (if the pool broke down)
+        """
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        from concurrent.futures.process import BrokenProcessPool
+
+        done = set()
+        pool = ProcessPoolExecutor(max_workers=min(self.workers, len(pending)))
+        try:
+            futures = {pool.submit(_convert_pdf_worker, str(pdf_path), self.options): pdf_path
+                       for pdf_path in pending}
+            for future in as_completed(futures):
+                finish(future.result())
+                done.add(futures[future])
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+
+            # On cancel, drop the queued files but let the running ones finish and
+            # record them, so no .md file or manifest entry is written after run() returns
+            unfinished = [future for future in futures
+                          if futures[future] not in done and not future.cancel()]
+            for future in unfinished:
+                finish(future.result())
+                done.add(futures[future])
+
+        except BrokenProcessPool as e:
+            # Process pools can be unavailable (restricted or frozen environments)
+            logger.warning(f"Batch import pool failed, continuing serially: {e}")
+            return [pdf_path for pdf_path in pending if pdf_path not in done]
+
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        return []
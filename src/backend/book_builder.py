@@ -0,0 +1,539 @@
+"""
+Book Builder Module
+Builds one PDF from a folder of Markdown chapters, re-rendering only changed chapters
+"""
+
+import asyncio
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional
+from urllib.parse import unquote, urlsplit
+from urllib.request import url2pathname
+
+from backend.fitz_lock import FITZ_LOCK
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+MANIFEST_NAME = "book.json"
+
+# Image references of a chapter: ![alt](path "title"), <img src="path">, [ref]: path
+_IMAGE_REF_RE = re.compile(
+    r'!\[[^\]]*\]\(\s*<?([^)\s>]+)'
+    r'|<img\b[^>]*?\bsrc\s*=\s*["\']([^"\']+)'
+    r'|^\s{0,3}\[[^\]]+\]:\s*<?(\S+?)>?(?:\s|$)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+@dataclass
+class BookChapter:
+    """One chapter of a book build"""
+    path: str
+    title: str = ""
+    key: str = ""  # Chapter cache key
+    pages: int = 0
+    start_page: int = 0  # First page in the book (1-based)
+    cached: bool = False  # Taken from the chapter cache, not rendered
+    seconds: float = 0.0
+    error: str = ""
+
+
+@dataclass
+class BookBuildReport:
+    """Result of a book build"""
+    output_path: str
+    chapters: List[BookChapter] = field(default_factory=list)
+    toc_pages: int = 0
+    elapsed: float = 0.0
+    cancelled: bool = False
+    error: str = ""
+
+    @property
+    def success(self) -> bool:
+        return not self.error and not self.cancelled
+
+    @property
+    def rendered(self) -> List[BookChapter]:
+        return [c for c in self.chapters if c.pages and not c.cached]
+
+    @property
+    def cached(self) -> List[BookChapter]:
+        return [c for c in self.chapters if c.cached]
+
+    @property
+    def total_pages(self) -> int:
+        return self.toc_pages + sum(c.pages for c in self.chapters)
+
+    def summary(self) -> str:
+        """One-line summary for logs and dialogs"""
+        text = (f"{len(self.chapters)} chapters ({len(self.rendered)} rendered, "
+                f"{len(self.cached)} cached), {self.total_pages} pages in {self.elapsed:.1f}s")
+        if self.cancelled:
+            text += " [cancelled]"
+        if self.error:
+            text += f" [failed: {self.error}]"
+        return text
+
+
+def find_chapters(directory) -> List[Path]:
+    """Markdown files of a folder in file name order (01-intro.md, 02-setup.md, ...)"""
+    directory = Path(directory)
+    return sorted(p for p in directory.iterdir()
+                  if p.is_file() and p.suffix.lower() in (".md", ".markdown"))
+
+
+def chapter_title(markdown: str, fallback: str) -> str:
+    """Text of the first level-1 heading, or fallback"""
+    for line in markdown.splitlines():
+        if line.startswith("# "):
+            return line[2:].strip().strip("#").strip() or fallback
+    return fallback
+
+
+def chapter_images(markdown: str, base_dir) -> List[Path]:
+    """
+    Local files a chapter's images refer to, resolved against base_dir
+
+    Remote and data: URLs are left out; files that do not exist (yet)
+    are included, so the chapter is rendered again once they appear.
+    """
+    base_dir = Path(base_dir)
+    images = []
+    for match in _IMAGE_REF_RE.finditer(markdown):
+        ref = next(group for group in match.groups() if group)
+        parts = urlsplit(ref)
+        if parts.scheme == "file":
+            path = Path(url2pathname(parts.path))
+        elif parts.scheme or ref.startswith("#"):
+            continue  # http(s), data: or an anchor
+        else:
+            path = base_dir / unquote(parts.path)
+        if path not in images:
+            images.append(path)
+    return images
+
+
+class ChapterCache:
+    """
+    Rendered chapter PDFs under ~/.saekim/cache/book/, keyed by content
+
+    Entries are touched on every hit, and trim() removes the least recently
+    used files until the cache fits its size cap.
+    """
+
+    DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_dir()
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def default_dir() -> Path:
+        return Path.home() / ".saekim" / "cache" / "book"
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pdf"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Path of a cached chapter PDF, or None on a miss"""
+        path = self.path(key)
+        try:
+            os.utime(path)  # Mark as recently used for LRU eviction
+        except OSError:
+            return None
+        return path
+
+    def temp_path(self, key: str) -> Path:
+        """Where to render a chapter before commit() moves it into place"""
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".pdf")
+        os.close(fd)
+        return Path(tmp_path)
+
+    def commit(self, key: str, tmp_path: Path) -> Path:
+        path = self.path(key)
+        os.replace(tmp_path, path)
+        return path
+
+    def trim(self) -> int:
+        """
+        Evict least recently used chapters until the cache fits max_bytes
+
+        Returns:
+            Number of bytes freed
+        """
+        entries = []
+        for path in self.cache_dir.glob("*/*.pdf"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+
+        total = sum(size for _path, size, _mtime in entries)
+        freed = 0
+        for path, size, _mtime in sorted(entries, key=lambda entry: entry[2]):
+            if total - freed <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                freed += size
+            except OSError:
+                pass
+
+        if freed:
+            logger.info(f"Book chapter cache trimmed: {freed / (1024 * 1024):.1f} MB freed")
+        return freed
+
+    def clear(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+class BookBuilder:
+    """
+    Builds one PDF from an ordered list of Markdown chapters
+
+    Every chapter is rendered to its own PDF by the export engine and kept
+    in a ChapterCache, keyed by a hash of its Markdown, its title, the
+    images it refers to and the export style (stylesheet and page setup).
+    Relative image paths resolve against the chapter's folder. A rebuild after editing one
+    chapter therefore prints only that chapter; the rest - and the table
+    of contents, if no page count changed - come from the cache. The
+    chapters are merged with PyMuPDF behind a generated table of contents
+    with links, get one bookmark each and continuous page numbers.
+
+    Chapters are rendered with the server-side Markdown converter, so
+    Mermaid diagrams and KaTeX math stay as source.
+
+    A folder may contain a manifest (book.json) fixing title, order and
+    output file; without one, all Markdown files are used in name order:
+
+        {"title": "User Manual", "output": "manual.pdf",
+         "chapters": ["intro.md", "install.md", "usage.md"]}
+
+    Usage:
+        builder = BookBuilder.from_directory("docs/manual")
+        report = builder.run()
+        print(report.summary())
+    """
+
+    # Bump whenever chapter rendering changes so stale cache entries are ignored
+    VERSION = 2
+
+    TOC_TITLE = "목차"
+
+    def __init__(self, chapters: List[Path], output_path, title: str = "Book",
+                 converter=None, cache: Optional[ChapterCache] = None, max_parallel: int = 2):
+        """
+        Args:
+            chapters: Markdown files in book order
+            output_path: PDF to write
+            title: Book title (PDF metadata)
+            converter: DocumentConverter whose export engine prints the chapters
+            cache: Chapter cache (default ~/.saekim/cache/book/)
+            max_parallel: Chapters printed at the same time
+        """
+        if converter is None:
+            from backend.converter import DocumentConverter
+            converter = DocumentConverter()
+
+        self.chapters = [Path(p) for p in chapters]
+        self.output_path = Path(output_path)
+        self.title = title
+        self.converter = converter
+        self.cache = cache or ChapterCache()
+        self.max_parallel = max(1, max_parallel)
+
+    @classmethod
+    def from_manifest(cls, manifest_path, **kwargs) -> "BookBuilder":
+        """Builder for a book.json manifest (paths relative to its folder)"""
+        manifest_path = Path(manifest_path)
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        directory = manifest_path.parent
+        chapters = [directory / name for name in manifest["chapters"]]
+        output = directory / manifest.get("output", f"{directory.name}.pdf")
+        return cls(chapters, output, title=manifest.get("title", directory.name), **kwargs)
+
+    @classmethod
+    def from_directory(cls, directory, **kwargs) -> "BookBuilder":
+        """Builder for a folder: its book.json if present, else all Markdown files by name"""
+        directory = Path(directory)
+        if (directory / MANIFEST_NAME).exists():
+            return cls.from_manifest(directory / MANIFEST_NAME, **kwargs)
+        return cls(find_chapters(directory), directory / f"{directory.name}.pdf",
+                   title=directory.name, **kwargs)
+
+    # ==================== Keys ====================
+
+    def _pdf_options(self) -> dict:
+        """Page setup of chapter PDFs; the footer is stamped after merging"""
+        from backend.chunked_export import ChunkedPdfExport
+        return ChunkedPdfExport.chunk_page_options(self.converter._pdf_page_options())
+
+    def style_digest(self) -> str:
+        """Hash of everything besides the Markdown that changes a rendered chapter"""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"v{self.VERSION}".encode())
+        h.update(self.converter._get_pdf_css().encode("utf-8"))
+        h.update(json.dumps(self._pdf_options(), sort_keys=True).encode("utf-8"))
+        return h.hexdigest()
+
+    def chapter_key(self, markdown: str, title: str, style: str, images: List[Path] = ()) -> str:
+        """
+        Hash of a chapter's Markdown, title and style, and of the contents
+        of the image files it refers to (an edited image changes the key)
+        """
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f"{style}|{title}|".encode("utf-8"))
+        h.update(markdown.encode("utf-8"))
+        for image in images:
+            # The reference itself is part of the Markdown; moving the book keeps its keys
+            h.update(b"|image|")
+            try:
+                with open(image, "rb") as f:
+                    for block in iter(lambda: f.read(1024 * 1024), b""):
+                        h.update(block)
+            except OSError:
+                h.update(b"missing")
+        return h.hexdigest()
+
+    # ==================== Build ====================
+
+    def run(self, progress: Optional[Callable[[int, int, BookChapter], None]] = None,
+            cancel_event=None) -> BookBuildReport:
+        """
+        Build the book, blocking until the PDF is written
+
+        Args:
+            progress: Called as progress(done, total, chapter) after each chapter
+            cancel_event: Optional threading.Event; once set, no new chapters are started
+
+        Returns:
+            BookBuildReport
+        """
+        from backend.async_runtime import get_runtime
+        return get_runtime().run(self.build_async(progress, cancel_event))
+
+    async def build_async(self, progress=None, cancel_event=None) -> BookBuildReport:
+        """Build the book (on the converter runtime loop)"""
+        start = time.perf_counter()
+        report = BookBuildReport(str(self.output_path))
+        style = self.style_digest()
+        engine = self.converter.export_engine
+        options = self._pdf_options()
+
+        sources = []
+        for path in self.chapters:
+            markdown = path.read_text(encoding="utf-8")
+            chapter = BookChapter(str(path), title=chapter_title(markdown, path.stem))
+            chapter.key = self.chapter_key(markdown, chapter.title, style,
+                                           chapter_images(markdown, path.parent))
+            report.chapters.append(chapter)
+            sources.append(markdown)
+
+        if not report.chapters:
+            report.error = "No chapters"
+            return report
+
+        total = len(report.chapters)
+        done = 0
+        semaphore = asyncio.Semaphore(self.max_parallel)
+
+        async def render(chapter: BookChapter, markdown: str):
+            nonlocal done
+            if self.cache.get(chapter.key) is not None:
+                chapter.cached = True
+            else:
+                async with semaphore:
+                    if cancel_event is not None and cancel_event.is_set():
+                        return
+                    started = time.perf_counter()
+                    document = self.converter._create_full_html_for_pdf(
+                        self.converter._markdown_to_body_html(markdown), chapter.title,
+                        base_dir=str(Path(chapter.path).parent))
+                    tmp_path = self.cache.temp_path(chapter.key)
+                    success, error = await engine.export_async(document, str(tmp_path), options)
+                    if not success:
+                        tmp_path.unlink(missing_ok=True)
+                        chapter.error = error
+                        return
+                    self.cache.commit(chapter.key, tmp_path)
+                    chapter.seconds = time.perf_counter() - started
+
+            done += 1
+            if progress:
+                progress(done, total, chapter)
+
+        await asyncio.gather(*(render(chapter, markdown)
+                               for chapter, markdown in zip(report.chapters, sources)))
+
+        failed = [chapter for chapter in report.chapters if chapter.error]
+        if failed:
+            report.error = f"{Path(failed[0].path).name}: {failed[0].error}"
+        elif cancel_event is not None and cancel_event.is_set():
+            report.cancelled = True
+        else:
+            try:
+                await self._assemble(report, engine, options, style)
+            except Exception as e:
+                report.error = str(e)
+
+        self.cache.trim()
+        report.elapsed = time.perf_counter() - start
+        logger.info(f"Book build {self.output_path}: {report.summary()}")
+        return report
+
+    # ==================== Table of contents and merge ====================
+
+    def _toc_html(self, chapters: List[BookChapter]) -> str:
+        rows = "\n".join(
+            f'<tr><td class="toc-title">{html.escape(chapter.title)}</td>'
+            f'<td class="toc-page">{chapter.start_page}</td></tr>'
+            for chapter in chapters
+        )
+        return (f"<h1>{self.TOC_TITLE}</h1>\n"
+                f'<table class="book-toc" style="width: 100%; border: none;">\n{rows}\n</table>\n'
+                "<style>.book-toc td { border: none; padding: 4pt 0; vertical-align: top; } "
+                ".book-toc .toc-page { text-align: right; width: 4em; }</style>")
+
+    @staticmethod
+    def _toc_rows(book, toc_pages: int) -> list:
+        """
+        (page index, clickable area, printed page number) of every table of
+        contents row, in order
+
+        A row is found by its page number cell - digits in the right half of
+        the page - and spans every title line from its top down to the next
+        row, so wrapped titles link on all their lines.
+        """
+        import fitz  # PyMuPDF
+
+        rows = []
+        for page_idx in range(toc_pages):
+            page = book[page_idx]
+            middle = page.rect.x0 + page.rect.width / 2
+            numbers, lines = [], []
+            for block in page.get_text("dict")["blocks"]:
+                for line in block.get("lines", []):
+                    text = "".join(span["text"] for span in line["spans"]).strip()
+                    bbox = fitz.Rect(line["bbox"])
+                    if text.isdigit() and bbox.x0 >= middle:
+                        numbers.append((bbox, int(text)))
+                    elif text:
+                        lines.append(bbox)
+
+            numbers.sort(key=lambda number: number[0].y0)
+            for idx, (bbox, number) in enumerate(numbers):
+                bottom = numbers[idx + 1][0].y0 if idx + 1 < len(numbers) else page.rect.y1
+                area = fitz.Rect(bbox)
+                for line in lines:
+                    if bbox.y0 - 1 <= line.y0 < bottom - 1:
+                        area |= line
+                rows.append((page_idx, area, number))
+        return rows
+
+    def _number_chapters(self, chapters: List[BookChapter], toc_pages: int):
+        page = toc_pages + 1
+        for chapter in chapters:
+            chapter.start_page = page
+            page += chapter.pages
+
+    async def _render_toc(self, report: BookBuildReport, engine, options: dict, style: str) -> Path:
+        """
+        Print the table of contents; its own length shifts every page number,
+        so it is printed again until the page count it assumed is right
+        """
+        import fitz  # PyMuPDF
+
+        toc_pages = 1
+        for _attempt in range(3):
+            self._number_chapters(report.chapters, toc_pages)
+            body = self._toc_html(report.chapters)
+            key = self.chapter_key(body, self.TOC_TITLE, style)
+
+            path = self.cache.get(key)
+            if path is None:
+                document = self.converter._create_full_html_for_pdf(body, self.TOC_TITLE)
+                tmp_path = self.cache.temp_path(key)
+                success, error = await engine.export_async(document, str(tmp_path), options)
+                if not success:
+                    tmp_path.unlink(missing_ok=True)
+                    raise RuntimeError(f"Table of contents: {error}")
+                path = self.cache.commit(key, tmp_path)
+
+            with FITZ_LOCK, fitz.open(path) as toc:
+                printed_pages = toc.page_count
+            if printed_pages == toc_pages:
+                break
+            toc_pages = printed_pages
+
+        report.toc_pages = toc_pages
+        return path
+
+    async def _assemble(self, report: BookBuildReport, engine, options: dict, style: str):
+        import fitz  # PyMuPDF
+
+        def count_pages():
+            for chapter in report.chapters:
+                with FITZ_LOCK, fitz.open(self.cache.path(chapter.key)) as doc:
+                    chapter.pages = doc.page_count
+
+        await asyncio.to_thread(count_pages)
+        toc_path = await self._render_toc(report, engine, options, style)
+        await asyncio.to_thread(self._merge, report, toc_path)
+
+    def _merge(self, report: BookBuildReport, toc_path: Path):
+        """Write the book: table of contents, chapters, bookmarks, links, page numbers"""
+        import fitz  # PyMuPDF
+        from backend.native_pdf import number_pages
+
+        with FITZ_LOCK, fitz.open() as book:
+            with fitz.open(toc_path) as toc:
+                book.insert_pdf(toc)
+            for chapter in report.chapters:
+                with fitz.open(self.cache.path(chapter.key)) as doc:
+                    book.insert_pdf(doc)
+
+            # One bookmark per chapter
+            outline = [[1, self.TOC_TITLE, 1]]
+            outline += [[1, chapter.title, chapter.start_page] for chapter in report.chapters]
+            book.set_toc(outline)
+
+            # Table of contents rows link to their chapter; rows are matched by
+            # position, so repeated or similar titles cannot link the wrong row
+            rows = self._toc_rows(book, report.toc_pages)
+            if [number for _page_idx, _area, number in rows] == \
+                    [chapter.start_page for chapter in report.chapters]:
+                for chapter, (page_idx, area, _number) in zip(report.chapters, rows):
+                    book[page_idx].insert_link({"kind": fitz.LINK_GOTO, "from": area,
+                                                "page": chapter.start_page - 1})
+            else:
+                logger.warning(f"Table of contents rows not recognized ({len(rows)} rows for "
+                               f"{len(report.chapters)} chapters), writing it without links")
+
+            number_pages(book)
+            book.set_metadata({"title": self.title})
+
+            # Written next to the target and swapped in, so a failed build keeps the old book
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.output_path.parent, prefix=".book-", suffix=".pdf")
+            os.close(fd)
+            try:
+                book.save(tmp_path, garbage=3, deflate=True)
+                os.replace(tmp_path, self.output_path)
+            except OSError:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
@@ -0,0 +1,217 @@
+"""
+Chunked Export Module
+Prints long documents in chapter-sized pieces and merges them into one PDF
+"""
+
+import asyncio
+import tempfile
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from backend.fitz_lock import FITZ_LOCK
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+# Elements without an end tag; they do not open a nesting level
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "source", "track", "wbr",
+})
+
+
+class _TopLevelTags(HTMLParser):
+    """Offsets of the start tags of one element type that are not nested in anything"""
+
+    def __init__(self, tag: str):
+        super().__init__(convert_charrefs=False)
+        self.tag = tag
+        self.depth = 0
+        self.positions = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == self.tag and self.depth == 0:
+            self.positions.append(self.getpos())
+        if tag not in VOID_ELEMENTS:
+            self.depth += 1
+
+    def handle_endtag(self, tag):
+        if tag not in VOID_ELEMENTS:
+            self.depth = max(self.depth - 1, 0)
+
+
+def split_at_top_level(html: str, tag: str) -> List[str]:
+    """
+    Split an HTML fragment before every top-level <tag>
+
+    Headings inside blockquotes, lists or tables stay where they are, so
+    every piece is well-formed on its own. Content before the first
+    heading becomes a piece of its own.
+    """
+    parser = _TopLevelTags(tag)
+    parser.feed(html)
+    parser.close()
+
+    # getpos() is (line, column) with lines counted at "\n" only; turn it into string offsets
+    line_starts = [0]
+    for line in html.split("\n"):
+        line_starts.append(line_starts[-1] + len(line) + 1)
+    offsets = [line_starts[line - 1] + column for line, column in parser.positions]
+
+    pieces = []
+    for start, end in zip([0] + offsets, offsets + [len(html)]):
+        if html[start:end].strip():
+            pieces.append(html[start:end])
+    return pieces
+
+
+def split_into_chunks(html: str, target_chars: int, max_chars: int) -> List[str]:
+    """
+    Group the top-level sections of a rendered document into print chunks
+
+    The document is cut at <h1>; a chapter longer than max_chars is cut
+    further at its <h2>. Neighbouring sections are then joined until a
+    chunk reaches target_chars, so short chapters do not each cost a
+    browser page of their own.
+
+    Args:
+        html: Rendered document body (the preview HTML)
+        target_chars: Size a chunk is filled up to
+        max_chars: Size above which a chapter is split at its sections
+    """
+    sections = []
+    for chapter in split_at_top_level(html, "h1"):
+        if len(chapter) > max_chars:
+            sections.extend(split_at_top_level(chapter, "h2"))
+        else:
+            sections.append(chapter)
+
+    chunks = []
+    current = ""
+    for section in sections:
+        if current and len(current) + len(section) > target_chars:
+            chunks.append(current)
+            current = ""
+        current += section
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def merge_pdfs(chunk_paths: List[Path], output_path: str) -> int:
+    """
+    Concatenate chunk PDFs into one file and number its pages continuously
+
+    Chunks are opened one at a time, so memory is bounded by the merged
+    document and the largest chunk, not by all chunks at once.
+
+    Returns:
+        Number of pages
+    """
+    import fitz  # PyMuPDF
+    from backend.native_pdf import number_pages
+
+    with FITZ_LOCK, fitz.open() as merged:
+        for chunk_path in chunk_paths:
+            with fitz.open(chunk_path) as chunk:
+                merged.insert_pdf(chunk)
+        pages = number_pages(merged)
+        merged.save(output_path, garbage=1, deflate=True)
+    return pages
+
+
+class ChunkedPdfExport:
+    """
+    Exports a long document as separately printed chunks
+
+    One Chromium page laying out and printing a whole book needs memory
+    in proportion to the book and may fail. Here the rendered document is
+    split at its chapters, each chunk is printed by the export engine in
+    its own browser context - at most max_parallel at a time, which bounds
+    the browser's memory - and the chunk PDFs are merged with PyMuPDF.
+
+    Chromium's footer template numbers the pages of each chunk from 1 and
+    cannot be given an offset, so chunks are printed without footer and the
+    merged file gets "page / total" stamped in the same place and style as
+    the QtWebEngine export. Every chunk starts on a new page.
+
+    Usage:
+        export = ChunkedPdfExport(engine, converter._create_full_html_for_pdf)
+        chunks = export.chunks(rendered_html)
+        success, error = await export.export_async(chunks, title, "out.pdf", options)
+    """
+
+    # Rendered HTML per chunk; roughly 40-60 printed pages of text
+    TARGET_CHUNK_CHARS = 200_000
+
+    # Chapters above this size are split at their <h2> sections
+    MAX_CHUNK_CHARS = 400_000
+
+    def __init__(self, engine, build_document: Callable[[str, str], str], max_parallel: int = 2):
+        """
+        Args:
+            engine: PdfExportEngine that prints the chunks
+            build_document: (rendered_html, title) -> complete HTML document
+            max_parallel: Chunks printed at the same time
+        """
+        self.engine = engine
+        self.build_document = build_document
+        self.max_parallel = max(1, max_parallel)
+
+    def chunks(self, rendered_html: str) -> List[str]:
+        return split_into_chunks(rendered_html, self.TARGET_CHUNK_CHARS, self.MAX_CHUNK_CHARS)
+
+    @staticmethod
+    def chunk_page_options(pdf_options: dict) -> dict:
+        """The export's page options without header and footer (added after merging)"""
+        options = dict(pdf_options)
+        options['display_header_footer'] = False
+        options.pop('header_template', None)
+        options.pop('footer_template', None)
+        return options
+
+    async def export_async(self, chunks: List[str], title: str, output_path: str,
+                           pdf_options: dict) -> Tuple[bool, str]:
+        """
+        Print the document in chunks and merge them (on the converter runtime loop)
+
+        Args:
+            chunks: The rendered document split by chunks()
+            title: Document title
+            output_path: Path to save the merged PDF
+            pdf_options: Keyword arguments for Playwright's page.pdf()
+
+        Returns:
+            Tuple of (success, error_message)
+        """
+        started = time.perf_counter()
+        options = self.chunk_page_options(pdf_options)
+        semaphore = asyncio.Semaphore(self.max_parallel)
+
+        with tempfile.TemporaryDirectory(prefix="saekim_chunks-") as chunk_dir:
+            chunk_paths = [Path(chunk_dir) / f"chunk_{idx:04d}.pdf" for idx in range(len(chunks))]
+
+            async def print_chunk(idx: int) -> Tuple[bool, str]:
+                async with semaphore:
+                    # Build each document only when its turn comes to keep few copies in memory
+                    document = self.build_document(chunks[idx], title)
+                    return await self.engine.export_async(document, str(chunk_paths[idx]), options)
+
+            results = await asyncio.gather(*(print_chunk(idx) for idx in range(len(chunks))))
+            for success, error in results:
+                if not success:
+                    return False, error
+
+            try:
+                pages = await asyncio.to_thread(merge_pdfs, chunk_paths, output_path)
+            except Exception as e:
+                error_msg = f"Merging PDF chunks failed: {str(e)}"
+                logger.error(error_msg)
+                return False, error_msg
+
+        elapsed = (time.perf_counter() - started) * 1000
+        logger.info(f"PDF exported in {len(chunks)} chunks in {elapsed:.0f} ms ({pages} pages): {output_path}")
+        return True, ""
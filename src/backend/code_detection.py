@@ -0,0 +1,616 @@
+"""
+Code Detection Module
+Classifies text lines extracted from PDFs as source code
+and guesses the language of extracted code blocks
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+# Lines starting like this are very likely code.
+# Every pattern is anchored at the start of the stripped line.
+_ANCHORED_PATTERNS = [
+    # Python specific
+    ('py_def', r'def\s+\w+\s*\([^)]*\)\s*(->\s*\w+)?:'),  # def func() -> Type:
+    ('py_class', r'class\s+\w+.*:'),  # class Foo:
+    ('py_import', r'(from|import)\s+\w+'),  # import/from
+    ('py_decorator', r'@\w+'),  # @decorator
+    ('py_if', r'\s*if\s+.+:$'),  # if condition:
+    ('py_elif', r'\s*elif\s+.+:$'),  # elif condition:
+    ('py_else', r'\s*else\s*:$'),  # else:
+    ('py_for', r'\s*for\s+\w+\s+in\s+.+:'),  # for x in ...:
+    ('py_while', r'\s*while\s+.+:'),  # while ...:
+    ('py_try', r'\s*try\s*:'),  # try:
+    ('py_except', r'\s*except.*:'),  # except:
+    ('py_finally', r'\s*finally\s*:'),  # finally:
+    ('py_with', r'\s*with\s+.+:'),  # with ...:
+    ('py_return', r'\s*return\s+'),  # return
+    ('py_yield', r'\s*yield\s+'),  # yield
+    ('py_raise', r'\s*raise\s+'),  # raise
+    ('py_pass', r'\s*pass\s*$'),  # pass
+    ('py_break', r'\s*break\s*$'),  # break
+    ('py_continue', r'\s*continue\s*$'),  # continue
+
+    # JavaScript/TypeScript
+    ('js_declaration', r'(const|let|var)\s+\w+\s*='),
+    ('js_function', r'function\s+\w+\s*\('),
+    ('js_arrow_body', r'\s*=>\s*\{'),
+
+    # Java/C#
+    ('java_member', r'(public|private|protected)\s+(static\s+)?(void|int|String|boolean)'),
+    ('java_class', r'(public|private|protected)\s+class\s+\w+'),
+
+    # C/C++
+    ('c_include', r'#include\s*[<"]'),
+    ('c_define', r'#define\s+\w+'),
+    ('c_main', r'int\s+main\s*\('),
+
+    # General
+    ('line_comment', r'\s*//.*$'),  # // comment
+    ('hash_comment', r'\s*#(?!#)\s*\w+'),  # # comment (but not ## heading)
+    ('block_comment_start', r'\s*/\*'),  # /* comment
+    ('block_comment_end', r'\s*\*/'),  # */ end comment
+]
+
+# Strong indicators that can appear anywhere in the line
+_UNANCHORED_PATTERNS = [
+    # Python specific
+    ('py_list_assign', r'\w+\s*=\s*\[.*\]'),  # list assignment
+    ('py_dict_assign', r'\w+\s*=\s*\{.*\}'),  # dict assignment
+    ('py_tuple_assign', r'\w+\s*=\s*\(.*\)'),  # tuple assignment
+    ('py_lambda', r'lambda\s+\w+\s*:'),  # lambda
+    ('py_map', r'map\s*\(.+\)'),  # map()
+    ('py_filter', r'filter\s*\(.+\)'),  # filter()
+    ('py_list', r'list\s*\(.+\)'),  # list()
+    ('py_dict', r'dict\s*\(.+\)'),  # dict()
+    ('py_range', r'range\s*\(.+\)'),  # range()
+    ('py_print', r'print\s*\(.+\)'),  # print()
+    ('py_input', r'input\s*\(.+\)'),  # input()
+    ('py_len', r'len\s*\(.+\)'),  # len()
+    ('py_split', r'\.split\s*\('),  # .split()
+    ('py_join', r'\.join\s*\('),  # .join()
+    ('py_append', r'\.append\s*\('),  # .append()
+    ('py_int', r'int\s*\(.+\)'),  # int()
+    ('py_str', r'str\s*\(.+\)'),  # str()
+    ('py_float', r'float\s*\(.+\)'),  # float()
+
+    # JavaScript/TypeScript
+    ('js_console', r'console\.(log|error|warn)\s*\('),
+
+    # C/C++
+    ('c_printf', r'printf\s*\('),
+    ('cpp_cout', r'cout\s*<<'),
+]
+
+# Every unanchored pattern needs one of these substrings to match,
+# so lines without them skip the search entirely
+_UNANCHORED_REQUIRED = ('(', '=', 'lambda', '<<')
+
+_BRACKET_CHARS = '{}[]()'
+
+
+def _combine(patterns) -> str:
+    """Join (name, pattern) pairs into one alternation with named groups"""
+    return '|'.join(f'(?P<{name}>{pattern})' for name, pattern in patterns)
+
+
+class CodeLineClassifier:
+    """
+    Decides whether a single line of text looks like source code.
+
+    Content-based fallback for PDFs whose code isn't set in a monospace
+    font. All patterns are compiled once: the strong patterns are merged
+    into one anchored and one unanchored alternation, followed by a
+    weighted score of weaker indicators.
+    """
+
+    # Score at which the weak indicators classify a line as code
+    INDICATOR_THRESHOLD = 3
+
+    def __init__(self):
+        self._anchored = re.compile(_combine(_ANCHORED_PATTERNS))
+        self._unanchored = re.compile(_combine(_UNANCHORED_PATTERNS))
+
+        self._indent = re.compile(r'^(\t|    +)')
+        self._operators = re.compile(r'[=!<>]=|&&|\|\||=>|->|\+\+|--|==|!=')
+        self._assignment = re.compile(r'\w+\s*=\s*\w+')
+        self._sigil = re.compile(r'[$@]\w+')  # $var, @decorator
+        self._snake_case = re.compile(r'\b[a-z]+_[a-z_]+\b')
+        self._string_literal = re.compile(r'["\'][^"\']+["\']')
+        self._hash_comment = re.compile(r'^\s*#\s+\S')
+        self._method_call = re.compile(r'\w+\.\w+\(')
+
+    def is_code(self, text: str) -> bool:
+        """
+        Detect if text looks like code based on content patterns.
+        This is a fallback when font detection doesn't work.
+        """
+        text_stripped = text.strip()
+        if not text_stripped:
+            return False
+
+        # Strong indicators - if any match, it's very likely code
+        match = self._anchored.match(text_stripped)
+        if match is None and any(token in text_stripped for token in _UNANCHORED_REQUIRED):
+            match = self._unanchored.search(text_stripped)
+
+        if match is not None:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Code pattern matched: {match.lastgroup} in '{text_stripped[:50]}...'")
+            return True
+
+        # Check for code-like characteristics
+        code_indicators = self._indicator_score(text, text_stripped)
+        if code_indicators >= self.INDICATOR_THRESHOLD:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Code indicators: {code_indicators} for '{text_stripped[:50]}...'")
+            return True
+
+        return False
+
+    def _indicator_score(self, text: str, text_stripped: str) -> int:
+        """Weighted count of code-like characteristics, stopping at the threshold"""
+        threshold = self.INDICATOR_THRESHOLD
+        code_indicators = 0
+
+        # Has significant indentation (4+ spaces or tab at start)
+        if self._indent.match(text):
+            code_indicators += 3
+            if code_indicators >= threshold:
+                return code_indicators
+
+        # Line ends with colon (Python)
+        if text_stripped.endswith(':') and not text_stripped.startswith('#'):
+            code_indicators += 2
+
+        # Contains brackets/braces
+        bracket_count = sum(text_stripped.count(char) for char in _BRACKET_CHARS)
+        if bracket_count >= 2:
+            code_indicators += 2
+        elif bracket_count >= 1:
+            code_indicators += 1
+        if code_indicators >= threshold:
+            return code_indicators
+
+        # Contains operators common in code
+        if self._operators.search(text_stripped):
+            code_indicators += 2
+
+        # Contains semicolon at end (C-style)
+        if text_stripped.endswith(';'):
+            code_indicators += 2
+        if code_indicators >= threshold:
+            return code_indicators
+
+        # Multiple assignment operators
+        if '=' in text_stripped and self._assignment.search(text_stripped):
+            code_indicators += 1
+
+        # Contains common code symbols
+        if self._sigil.search(text_stripped):
+            code_indicators += 2
+        if code_indicators >= threshold:
+            return code_indicators
+
+        # Has snake_case identifiers (common in Python)
+        if self._snake_case.search(text_stripped):
+            code_indicators += 1
+
+        # Contains string literals with quotes
+        if self._string_literal.search(text_stripped):
+            code_indicators += 1
+        if code_indicators >= threshold:
+            return code_indicators
+
+        # Line is a comment (# followed by space and text)
+        if self._hash_comment.match(text_stripped):
+            code_indicators += 2
+
+        # Contains method/function call pattern
+        if self._method_call.search(text_stripped):
+            code_indicators += 2
+
+        return code_indicators
+
+
+@dataclass(frozen=True)
+class Pattern:
+    """A regex searched in a code block (in its lowercased text if lower=True)"""
+    pattern: str
+    flags: int = 0
+    lower: bool = False
+
+
+@dataclass
+class LanguageRule:
+    """
+    One weighted piece of evidence for a language
+
+    The rule scores when pattern matches, every all_of pattern matches and
+    no none_of pattern matches. If keywords are given, at least one of them
+    must appear in the block as a whole word (case-insensitive); rules
+    without one of their keywords are skipped without running the regex.
+    Only list keywords the pattern cannot match without.
+    """
+    pattern: Union[str, Pattern]
+    weight: int
+    all_of: Tuple[Union[str, Pattern], ...] = ()
+    none_of: Tuple[Union[str, Pattern], ...] = ()
+    keywords: Tuple[str, ...] = ()
+
+
+@dataclass
+class LanguageProfile:
+    """
+    Scoring table for one language
+
+    inherits names a language whose raw score is added (divided by
+    inherit_divisor), e.g. C++ gets half of the C score. With
+    inherit_if_scored the parent score only counts once the language
+    has evidence of its own.
+    """
+    name: str
+    rules: List[LanguageRule] = field(default_factory=list)
+    inherits: Optional[str] = None
+    inherit_divisor: int = 2
+    inherit_if_scored: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LanguageProfile':
+        """Build a profile from its JSON form (flags given by name, e.g. "IGNORECASE")"""
+        def to_pattern(spec):
+            if isinstance(spec, str):
+                return spec
+            flags = 0
+            for flag_name in spec.get("flags", []):
+                flags |= getattr(re, flag_name)
+            return Pattern(spec["pattern"], flags, spec.get("lower", False))
+
+        rules = [
+            LanguageRule(
+                pattern=to_pattern(rule),
+                weight=int(rule["weight"]),
+                all_of=tuple(to_pattern(p) for p in rule.get("all_of", [])),
+                none_of=tuple(to_pattern(p) for p in rule.get("none_of", [])),
+                keywords=tuple(k.casefold() for k in rule.get("keywords", [])),
+            )
+            for rule in data.get("rules", [])
+        ]
+        return cls(
+            name=data["name"],
+            rules=rules,
+            inherits=data.get("inherits"),
+            inherit_divisor=int(data.get("inherit_divisor", 2)),
+            inherit_if_scored=bool(data.get("inherit_if_scored", False)),
+        )
+
+
+_I = re.IGNORECASE
+_M = re.MULTILINE
+
+# Built-in profiles. Order matters: on equal scores the earlier language wins.
+DEFAULT_LANGUAGE_PROFILES = [
+    LanguageProfile('python', [
+        LanguageRule(r'\bdef\s+\w+\s*\([^)]*\)\s*(->\s*\w+)?\s*:', 10, keywords=('def',)),  # def func() -> Type:
+        LanguageRule(r'\bclass\s+\w+.*:', 8, keywords=('class',)),
+        LanguageRule(r'self\.|self,', 10),  # Very Python-specific
+        LanguageRule(r'__init__|__name__|__main__', 10),
+        LanguageRule(Pattern(r'^\s*@\w+', _M), 5),  # Decorators
+        LanguageRule(r'\bif\s+.+:|\bfor\s+\w+\s+in\s+', 3, keywords=('if', 'for')),  # Colon-based control flow
+        LanguageRule(r'\belif\b', 8, keywords=('elif',)),  # elif is Python-only
+        LanguageRule(r'\bexcept\s+\w+.*:', 5, keywords=('except',)),
+        LanguageRule(Pattern('import ', lower=True), 3, none_of=(';',)),
+        LanguageRule(Pattern('from ', lower=True), 8, all_of=(Pattern(' import ', lower=True),)),  # from x import y
+        LanguageRule(r'\bprint\s*\(', 2, keywords=('print',)),
+        LanguageRule(r'\bNone\b', 3, keywords=('none',)),
+        LanguageRule(r'\bTrue\b|\bFalse\b', 2, keywords=('true', 'false')),
+        LanguageRule(r'\blambda\s+\w+\s*:', 5, keywords=('lambda',)),
+    ]),
+    LanguageProfile('javascript', [
+        LanguageRule(r'\bconst\s+\w+\s*=', 5, keywords=('const',)),
+        LanguageRule(r'\blet\s+\w+\s*=', 5, keywords=('let',)),
+        LanguageRule(r'\bvar\s+\w+\s*=', 3, keywords=('var',)),
+        LanguageRule(r'\bfunction\s+\w+\s*\(', 5, keywords=('function',)),
+        LanguageRule('=>', 5),  # Arrow function
+        LanguageRule(r'console\.log', 8),
+        LanguageRule(r'\bdocument\.|window\.', 8),
+        LanguageRule(r'require\s*\(', 5),
+        LanguageRule(r'\bnull\b', 3, all_of=(r'\bundefined\b',), keywords=('undefined',)),
+        LanguageRule(r'===|!==', 5),
+    ]),
+    LanguageProfile('typescript', [
+        LanguageRule(r':\s*(string|number|boolean|any|void)\b', 8),
+        LanguageRule(r'\binterface\s+\w+\s*\{', 10, keywords=('interface',)),
+        LanguageRule(r'\btype\s+\w+\s*=', 8, keywords=('type',)),
+        LanguageRule(r'<T[>,]', 3),
+    ], inherits='javascript', inherit_if_scored=True),  # TS inherits JS patterns
+    LanguageProfile('java', [
+        LanguageRule(r'\bpublic\s+class\s+\w+', 10, keywords=('public',)),
+        LanguageRule(r'\bpublic\s+static\s+void\s+main', 15, keywords=('public',)),
+        LanguageRule(r'\bSystem\.out\.print', 10, keywords=('system',)),
+        LanguageRule(r'\bprivate\s+(static\s+)?(final\s+)?\w+\s+\w+', 5, keywords=('private',)),
+        LanguageRule(r'\bnew\s+\w+\s*\(', 3, all_of=(';',), keywords=('new',)),
+        LanguageRule(r'@Override|@Autowired|@Component', 8),
+    ]),
+    LanguageProfile('c', [
+        LanguageRule(r'#include\s*<\w+\.h>', 10, keywords=('include',)),
+        LanguageRule(r'\bint\s+main\s*\(', 8, keywords=('main',)),
+        LanguageRule(r'\bprintf\s*\(', 8, keywords=('printf',)),
+        LanguageRule(r'\bscanf\s*\(', 8, keywords=('scanf',)),
+        LanguageRule(r'\bmalloc\s*\(|\bfree\s*\(', 5, keywords=('malloc', 'free')),
+        LanguageRule(r'\bstruct\s+\w+\s*\{', 3, keywords=('struct',)),
+    ]),
+    LanguageProfile('cpp', [
+        LanguageRule(r'#include\s*<\w+>', 5, none_of=(r'\.h>',), keywords=('include',)),  # Modern C++ headers without .h
+        LanguageRule('std::', 10),
+        LanguageRule(r'cout|cin', 8),
+        LanguageRule(r'\bclass\s+\w+\s*\{', 5, all_of=(';',), keywords=('class',)),
+        LanguageRule('::', 3),
+        LanguageRule(r'\bnamespace\s+\w+', 8, keywords=('namespace',)),
+        LanguageRule(r'\btemplate\s*<', 8, keywords=('template',)),
+    ], inherits='c'),  # C++ inherits C patterns
+    LanguageProfile('csharp', [
+        LanguageRule(r'\busing\s+System', 10, keywords=('using',)),
+        LanguageRule(r'\bnamespace\s+\w+', 5, all_of=('{',), keywords=('namespace',)),
+        LanguageRule(r'\bConsole\.(WriteLine|ReadLine)', 10, keywords=('console',)),
+        LanguageRule(r'\basync\s+Task', 8, keywords=('async',)),
+        LanguageRule(r'\bvar\s+\w+\s*=', 3, all_of=(';',), keywords=('var',)),
+    ]),
+    LanguageProfile('go', [
+        LanguageRule(r'\bpackage\s+\w+', 10, keywords=('package',)),
+        LanguageRule(r'\bfunc\s+\w+\s*\(', 8, keywords=('func',)),
+        LanguageRule(r'\bfmt\.(Print|Println|Printf)', 10, keywords=('fmt',)),
+        LanguageRule(':=', 8),  # Go's short declaration
+        LanguageRule(r'\bgo\s+\w+\(', 5, keywords=('go',)),  # Goroutine
+        LanguageRule(r'\bdefer\s+', 8, keywords=('defer',)),
+    ]),
+    LanguageProfile('rust', [
+        LanguageRule(r'\bfn\s+\w+\s*\(', 8, keywords=('fn',)),
+        LanguageRule(r'\blet\s+mut\s+', 10, keywords=('mut',)),  # Rust's mutable let
+        LanguageRule(r'\bimpl\s+\w+', 10, keywords=('impl',)),
+        LanguageRule(r'\bpub\s+fn\s+', 8, keywords=('pub',)),
+        LanguageRule(r'println!|vec!', 10),  # Rust macros
+        LanguageRule(r'->\s*\w+', 5, all_of=('::',)),
+    ]),
+    LanguageProfile('html', [
+        LanguageRule(Pattern(r'<(!DOCTYPE|html|head|body|div|span|p|a|img)\b', _I), 10),
+        LanguageRule(r'</\w+>', 5),
+        LanguageRule(r'<\w+\s+\w+="[^"]*"', 3),
+    ]),
+    LanguageProfile('css', [
+        LanguageRule(r'\{[^}]*:\s*[^;]+;[^}]*\}', 5),
+        LanguageRule(r'\b(margin|padding|font-size|color|background|display)\s*:', 8,
+                     keywords=('margin', 'padding', 'font', 'color', 'background', 'display')),
+        LanguageRule(r'\.([\w-]+)\s*\{', 5),  # Class selector
+        LanguageRule(r'#[\w-]+\s*\{', 5),  # ID selector
+    ]),
+    LanguageProfile('sql', [
+        LanguageRule(Pattern(r'\bSELECT\s+.+\s+FROM\b', _I), 15, keywords=('select',)),
+        LanguageRule(Pattern(r'\bINSERT\s+INTO\b', _I), 10, keywords=('insert',)),
+        LanguageRule(Pattern(r'\bCREATE\s+(TABLE|DATABASE|INDEX)\b', _I), 10, keywords=('create',)),
+        LanguageRule(Pattern(r'\bWHERE\s+', _I), 5, keywords=('where',)),
+        LanguageRule(Pattern(r'\bJOIN\s+', _I), 5, keywords=('join',)),
+    ]),
+    LanguageProfile('bash', [
+        LanguageRule(Pattern(r'^#!/bin/(bash|sh|zsh)', _M), 15, keywords=('bin',)),
+        LanguageRule(Pattern(r'^\$\s+\w+', _M), 5),
+        LanguageRule(r'\b(sudo|apt|yum|brew|npm|pip|git|docker|kubectl)\s+', 5,
+                     keywords=('sudo', 'apt', 'yum', 'brew', 'npm', 'pip', 'git', 'docker', 'kubectl')),
+        LanguageRule(r'\becho\s+', 3, keywords=('echo',)),
+        LanguageRule(r'\bexport\s+\w+=', 5, keywords=('export',)),
+        LanguageRule(r'\$\{\w+\}|\$\w+', 3),
+    ]),
+    LanguageProfile('json', [
+        # Whole block is an object or array with quoted keys
+        LanguageRule(r'\A\s*(\{[\s\S]*\}|\[[\s\S]*\])\s*\Z', 15, all_of=(r'"\w+"\s*:',)),
+    ]),
+    LanguageProfile('xml', [
+        LanguageRule(r'<\?xml\s+version=', 15, keywords=('xml',)),
+        LanguageRule(r'<\w+[^>]*>[^<]*</\w+>', 5, none_of=(Pattern('<html', lower=True),)),
+    ]),
+    LanguageProfile('yaml', [
+        LanguageRule(Pattern(r'^\w+:\s*$', _M), 5),
+        LanguageRule(Pattern(r'^\s*-\s+\w+:', _M), 8),
+        LanguageRule(Pattern(r'^\w+:\s+\w+', _M), 3, none_of=('{',)),
+    ]),
+    LanguageProfile('markdown'),
+]
+
+
+_REGEX_SYNTAX = set('.^$*+?{}[]\\|()')
+
+
+class _CompiledCondition:
+    """A Pattern compiled to the cheapest test: substring check or regex search"""
+
+    __slots__ = ('lower', 'literal', 'regex')
+
+    def __init__(self, spec: Union[str, Pattern]):
+        if isinstance(spec, str):
+            spec = Pattern(spec)
+        self.lower = spec.lower
+        # Patterns without regex syntax are plain substring checks
+        if not spec.flags and not any(char in _REGEX_SYNTAX for char in spec.pattern):
+            self.literal = spec.pattern
+            self.regex = None
+        else:
+            self.literal = None
+            self.regex = re.compile(spec.pattern, spec.flags)
+
+    def test(self, text: str, text_lower: str) -> bool:
+        target = text_lower if self.lower else text
+        if self.literal is not None:
+            return self.literal in target
+        return self.regex.search(target) is not None
+
+
+class _CompiledRule:
+    __slots__ = ('language', 'weight', 'keywords', 'conditions', 'exclusions')
+
+    def __init__(self, language: str, rule: LanguageRule):
+        self.language = language
+        self.weight = rule.weight
+        self.keywords = frozenset(k.casefold() for k in rule.keywords)
+        self.conditions = [_CompiledCondition(rule.pattern)]
+        self.conditions.extend(_CompiledCondition(p) for p in rule.all_of)
+        self.exclusions = [_CompiledCondition(p) for p in rule.none_of]
+
+    def matches(self, text: str, text_lower: str) -> bool:
+        return (all(c.test(text, text_lower) for c in self.conditions) and
+                not any(c.test(text, text_lower) for c in self.exclusions))
+
+
+class CodeLanguageDetector:
+    """
+    Guesses the language of a code block from weighted language profiles.
+
+    All rules are compiled once. Detection tokenizes the block once to skip
+    rules whose keywords are absent, evaluates the remaining rules from
+    the heaviest down and stops as soon as the leading language can no
+    longer be caught up by any other.
+    """
+
+    # Minimum score for a confident guess
+    MIN_SCORE = 5
+
+    _WORD = re.compile(r'\w+')
+
+    def __init__(self, profiles: Optional[List[LanguageProfile]] = None):
+        self._profiles: Dict[str, LanguageProfile] = {}
+        for profile in (DEFAULT_LANGUAGE_PROFILES if profiles is None else profiles):
+            self._profiles[profile.name] = profile
+        self._compile()
+
+    def register_profile(self, profile: LanguageProfile):
+        """Add a language profile, or replace the profile with the same name"""
+        self._profiles[profile.name] = profile
+        self._compile()
+
+    def load_profiles(self, json_path) -> int:
+        """
+        Register profiles from a JSON file holding a list of profiles
+
+        Returns:
+            Number of profiles loaded (0 if the file is missing or invalid)
+        """
+        path = Path(json_path)
+        if not path.exists():
+            return 0
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            profiles = [LanguageProfile.from_dict(item) for item in data]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError, re.error) as e:
+            logger.warning(f"Failed to load code language profiles from {path}: {e}")
+            return 0
+
+        for profile in profiles:
+            self._profiles[profile.name] = profile
+        self._compile()
+
+        logger.info(f"Loaded {len(profiles)} code language profiles from {path}")
+        return len(profiles)
+
+    @property
+    def languages(self) -> List[str]:
+        return list(self._profiles)
+
+    def _compile(self):
+        """Flatten all profiles into one rule list, heaviest rules first"""
+        rules = []
+        for name, profile in self._profiles.items():
+            rules.extend(_CompiledRule(name, rule) for rule in profile.rules)
+        rules.sort(key=lambda rule: -rule.weight)
+        self._rules = rules
+
+        # (language, parent, divisor, only_if_scored) for inherited scores
+        self._inheritance = [
+            (name, profile.inherits, max(1, profile.inherit_divisor), profile.inherit_if_scored)
+            for name, profile in self._profiles.items()
+            if profile.inherits in self._profiles
+        ]
+
+    def detect(self, code_lines: list) -> str:
+        """
+        Detect programming language from code content using scoring system.
+        Returns the language with highest confidence score, or "" if no
+        language reaches MIN_SCORE.
+        """
+        code_text = '\n'.join(code_lines)
+        code_lower = code_text.lower()
+        words = {word.casefold() for word in self._WORD.findall(code_text)}
+
+        # Rules that can't match without one of their keywords are dropped up front
+        rules = [rule for rule in self._rules
+                 if not rule.keywords or not rule.keywords.isdisjoint(words)]
+
+        scores = dict.fromkeys(self._profiles, 0)
+        remaining = dict.fromkeys(self._profiles, 0)
+        for rule in rules:
+            remaining[rule.language] += rule.weight
+
+        for i, rule in enumerate(rules):
+            remaining[rule.language] -= rule.weight
+            if rule.matches(code_text, code_lower):
+                scores[rule.language] += rule.weight
+
+            # Rules are sorted by weight; check for a decided race between weight tiers
+            if i + 1 < len(rules) and rules[i + 1].weight != rule.weight:
+                leader = self._decided_leader(scores, remaining)
+                if leader:
+                    return leader
+
+        final_scores = self._with_inheritance(scores)
+
+        # Find language with highest score
+        max_score = max(final_scores.values(), default=0)
+        if max_score < self.MIN_SCORE:
+            return ""  # Not confident enough
+
+        best_lang = max(final_scores, key=final_scores.get)
+
+        # Log for debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            top_scores = sorted(final_scores.items(), key=lambda x: -x[1])[:3]
+            logger.debug(f"Language detection scores: {top_scores}")
+
+        return best_lang
+
+    def _with_inheritance(self, scores: Dict[str, int]) -> Dict[str, int]:
+        final_scores = dict(scores)
+        for name, parent, divisor, only_if_scored in self._inheritance:
+            if not only_if_scored or scores[name] > 0:
+                final_scores[name] += scores[parent] // divisor
+        return final_scores
+
+    def _decided_leader(self, scores: Dict[str, int], remaining: Dict[str, int]) -> Optional[str]:
+        """
+        Return the language that wins no matter how the remaining rules turn
+        out, or None while the race is still open
+        """
+        lower = self._with_inheritance(scores)
+        upper = {name: scores[name] + remaining[name] for name in scores}
+        for name, parent, divisor, _only_if_scored in self._inheritance:
+            upper[name] += upper[parent] // divisor
+
+        leader = max(lower, key=lower.get)
+        leader_score = lower[leader]
+        if leader_score < self.MIN_SCORE:
+            return None
+
+        for name, bound in upper.items():
+            if name != leader and bound >= leader_score:
+                return None
+
+        logger.debug(f"Language detection decided early: {leader} ({leader_score})")
+        return leader
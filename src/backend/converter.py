@@ -4,59 +4,104 @@ Handles conversion between different document formats (MD, PDF, DOCX, HTML)
 """
 
 import os
-import asyncio
 import tempfile
 from pathlib import Path
 from typing import Tuple, Optional
 
+from backend.export_engine import BrowserProbe, PdfExportEngine, local_file_url
+from backend.fitz_lock import FITZ_LOCK
 from utils.logger import get_logger
 
 logger = get_logger()
 
 
-def _run_async(coro):
-    """Run async coroutine in sync context"""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is already running (e.g., in Qt), create a new one
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, coro)
-                return future.result()
-        else:
-            return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
+# DocumentConverter of a PDF import worker process, created once by _init_extract_worker
+_worker_converter = None
+
+
+def _init_extract_worker():
+    """Process pool initializer: one converter per worker, reused for all its chunks"""
+    global _worker_converter
+    if _worker_converter is None:
+        _worker_converter = DocumentConverter()
+
+
+def _extract_pages_worker(pdf_path: str, page_indices: list, options=None) -> list:
+    """
+    Process pool entry point for parallel PDF import.
+    Opens its own copy of the document and extracts the given pages.
+    """
+    from backend.pdf_import import PdfImportSession
+
+    _init_extract_worker()
+    converter = _worker_converter
+    page_cache = options.create_page_cache() if options else None
+    contents = []
+    with PdfImportSession(pdf_path, low_memory=bool(options and options.low_memory)) as session:
+        for page_idx in page_indices:
+            contents.append(converter._load_page_content(session, page_idx, page_cache, options))
+            session.release_page(page_idx)
+    return contents
 
 
 class DocumentConverter:
     """Converts documents between various formats"""
 
+    # Parallel PDF import only pays off once the pool start-up cost is amortized
+    PARALLEL_MIN_PAGES = 8
+
+    # Lines at least this large become Markdown headings in PDF import
+    HEADING_MIN_FONT_SIZE = 14
+
+    # Rendered HTML size from which PDF export prints in chapter chunks (roughly 150+ pages)
+    CHUNKED_EXPORT_MIN_CHARS = 600_000
+
+    # Same KaTeX build as the preview (ui/index.html)
+    KATEX_CSS_URL = "https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/katex.min.css"
+
     def __init__(self):
+        from backend.code_detection import CodeLineClassifier, CodeLanguageDetector
+
         self.temp_dir = Path(tempfile.gettempdir()) / 'saekim_temp'
         self.temp_dir.mkdir(exist_ok=True)
 
+        # Content-based code detection, compiled once per converter
+        self.code_classifier = CodeLineClassifier()
+        self.language_detector = CodeLanguageDetector()
+
+        # User-defined language profiles extend the built-in ones
+        self.language_detector.load_profiles(Path.home() / '.saekim' / 'code_languages.json')
+
+        # PdfImportStats of the most recent PyMuPDF import
+        self.last_import_stats = None
+
+        # Headless Chromium kept alive between PDF exports
+        self.export_engine = PdfExportEngine()
+        self.browser_probe = BrowserProbe()
+
     def check_playwright_browser(self) -> bool:
-        """Check if Playwright browsers are installed"""
-        try:
-            import sys
-            # If frozen, check if the bundled browser exists
-            if getattr(sys, 'frozen', False):
-                bundled_browser_path = Path(sys._MEIPASS) / 'ms-playwright' / 'chromium-1194' / 'chrome-win' / 'chrome.exe'
-                if bundled_browser_path.exists():
-                    return True
-
-            # Standard check
-            from playwright.sync_api import sync_playwright
-            with sync_playwright() as p:
-                try:
-                    p.chromium.launch(executable_path=None)
-                except Exception:
-                    return False
+        """Check if Playwright browsers are installed (cached, does not launch Chromium)"""
+        if self.export_engine.is_running:
             return True
-        except Exception:
-            return False
+        return self.browser_probe.check()
+
+    def prewarm_export_engine(self):
+        """
+        Start the export browser in the background if it is installed
+
+        Returns:
+            concurrent.futures.Future of the prewarm
+        """
+        from backend.async_runtime import get_runtime
+
+        async def prewarm():
+            try:
+                if await self.browser_probe.check_async():
+                    await self.export_engine.prewarm()
+            except Exception as e:
+                logger.warning(f"Export engine prewarm failed: {e}")
+
+        return get_runtime().submit(prewarm())
 
     def install_playwright_browser(self) -> Tuple[bool, str]:
         """Install Playwright browsers programmatically"""
@@ -75,6 +120,7 @@ class DocumentConverter:
                 text=True,
                 check=True
             )
+            self.browser_probe.invalidate()
             logger.info("Playwright browser installed successfully")
             return True, ""
             
@@ -88,7 +134,7 @@ class DocumentConverter:
             return False, error_msg
 
     def markdown_to_pdf(self, markdown_content: str, output_path: str,
-                        title: str = "Document") -> Tuple[bool, str]:
+                        title: str = "Document", base_dir: Optional[str] = None) -> Tuple[bool, str]:
         """
         Convert Markdown to PDF using Playwright
 
@@ -96,13 +142,14 @@ class DocumentConverter:
             markdown_content: Markdown text
             output_path: Path to save PDF
             title: Document title
+            base_dir: Directory relative image paths are resolved against
 
         Returns:
             Tuple of (success, error_message)
         """
         try:
             # Convert markdown to HTML first
-            html_content = self._markdown_to_html(markdown_content, title)
+            html_content = self._markdown_to_html(markdown_content, title, base_dir)
 
             # Use Playwright to generate PDF
             return self._generate_pdf_with_playwright(html_content, output_path)
@@ -114,7 +161,7 @@ class DocumentConverter:
             return False, error_msg
 
     def html_to_pdf(self, rendered_html: str, output_path: str,
-                    title: str = "Document") -> Tuple[bool, str]:
+                    title: str = "Document", chunked: Optional[bool] = None) -> Tuple[bool, str]:
         """
         Convert rendered HTML to PDF using Playwright
         This method preserves all formatting including Mermaid diagrams and KaTeX equations
@@ -123,11 +170,17 @@ class DocumentConverter:
             rendered_html: Fully rendered HTML from frontend
             output_path: Path to save PDF
             title: Document title
+            chunked: Print in chapter chunks and merge them; None decides by document size
 
         Returns:
             Tuple of (success, error_message)
         """
         try:
+            if chunked is None:
+                chunked = len(rendered_html) >= self.CHUNKED_EXPORT_MIN_CHARS
+            if chunked:
+                return self._generate_chunked_pdf(rendered_html, output_path, title)
+
             # Wrap the rendered HTML in a complete HTML document with all dependencies
             full_html = self._create_full_html_for_pdf(rendered_html, title)
 
@@ -139,14 +192,28 @@ class DocumentConverter:
             logger.error(error_msg)
             return False, error_msg
 
-    def _create_full_html_for_pdf(self, rendered_html: str, title: str) -> str:
-        """Create a complete HTML document for PDF generation with all necessary styles"""
+    def _create_full_html_for_pdf(self, rendered_html: str, title: str,
+                                  base_dir: Optional[str] = None) -> str:
+        """
+        Create a complete HTML document for PDF generation with all necessary styles
+
+        Relative image paths resolve against base_dir if given; the export
+        engine serves local files under its own origin.
+        """
+        # The export engine serves the KaTeX stylesheet and fonts from its local asset cache
+        katex_css = ""
+        if 'class="katex' in rendered_html:
+            katex_css = f'<link rel="stylesheet" href="{self.KATEX_CSS_URL}">'
+
+        base = f'<base href="{local_file_url(base_dir)}/">' if base_dir else ""
+
         return f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
     <title>{title}</title>
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/katex.min.css">
+    {base}
+    {katex_css}
     <style>
         {self._get_pdf_css()}
     </style>
@@ -159,108 +226,52 @@ class DocumentConverter:
 </html>"""
 
     def _generate_pdf_with_playwright(self, html_content: str, output_path: str) -> Tuple[bool, str]:
-        """Generate PDF from HTML using Playwright"""
-        return _run_async(self._async_generate_pdf(html_content, output_path))
-
-    async def _async_generate_pdf(self, html_content: str, output_path: str) -> Tuple[bool, str]:
-        """Async implementation of PDF generation using Playwright"""
-        try:
-            from playwright.async_api import async_playwright
-        except ImportError:
-            error_msg = (
-                "Playwright가 설치되지 않았습니다.\n\n"
-                "다음 명령어로 설치해주세요:\n"
-                "pip install playwright\n"
-                "playwright install chromium"
-            )
-            logger.error("Playwright not installed")
-            return False, error_msg
-
-        temp_html_path = None
-        try:
-            # Save HTML to temp file (Playwright needs a file or URL)
-            temp_html_path = self.temp_dir / f"temp_pdf_{os.getpid()}.html"
-            with open(temp_html_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-
-            import sys
-            async with async_playwright() as p:
-                launch_options = {'headless': True}
-                
-                # If frozen (exe), use bundled browser
-                if getattr(sys, 'frozen', False):
-                    # Path: _MEIPASS/ms-playwright/chromium-1194/chrome-win/chrome.exe
-                    bundled_browser_path = Path(sys._MEIPASS) / 'ms-playwright' / 'chromium-1194' / 'chrome-win' / 'chrome.exe'
-                    if bundled_browser_path.exists():
-                        launch_options['executable_path'] = str(bundled_browser_path)
-                        logger.info(f"Using bundled browser at: {bundled_browser_path}")
-                    else:
-                        logger.warning(f"Bundled browser not found at {bundled_browser_path}, trying default lookup")
-
-                # Launch browser
-                browser = await p.chromium.launch(**launch_options)
-                page = await browser.new_page()
-
-                # Load the HTML file
-                await page.goto(f'file:///{temp_html_path.as_posix()}', wait_until='networkidle')
-
-                # Wait for any dynamic content (KaTeX, Mermaid) to render
-                await page.wait_for_timeout(500)
-
-                # Generate PDF with A4 format
-                await page.pdf(
-                    path=output_path,
-                    format='A4',
-                    margin={
-                        'top': '2.5cm',
-                        'bottom': '2.5cm',
-                        'left': '2.5cm',
-                        'right': '2.5cm'
-                    },
-                    print_background=True,
-                    display_header_footer=True,
-                    header_template='<div></div>',
-                    footer_template='''
-                        <div style="font-size: 10px; text-align: center; width: 100%; color: #666;">
-                            <span class="pageNumber"></span> / <span class="totalPages"></span>
-                        </div>
-                    '''
-                )
-
-                await browser.close()
-
-            logger.info(f"PDF created successfully with Playwright: {output_path}")
-            return True, ""
+        """Generate PDF from HTML using the shared Playwright export engine"""
+        return self.export_engine.export(html_content, output_path, self._pdf_page_options())
+
+    def _generate_chunked_pdf(self, rendered_html: str, output_path: str, title: str) -> Tuple[bool, str]:
+        """Print a long document in chapter chunks with the export engine and merge them"""
+        from backend.async_runtime import get_runtime
+        from backend.chunked_export import ChunkedPdfExport
+
+        export = ChunkedPdfExport(self.export_engine, self._create_full_html_for_pdf)
+        chunks = export.chunks(rendered_html)
+        if len(chunks) < 2:
+            # Nothing to split at - a single print is cheaper than a merge
+            full_html = self._create_full_html_for_pdf(rendered_html, title)
+            return self._generate_pdf_with_playwright(full_html, output_path)
 
-        except Exception as e:
-            error_msg = f"Playwright PDF generation failed: {str(e)}"
-            logger.error(error_msg)
-            return False, error_msg
+        return get_runtime().run(export.export_async(chunks, title, output_path, self._pdf_page_options()))
 
-        finally:
-            # Clean up temp file
-            if temp_html_path and temp_html_path.exists():
-                try:
-                    temp_html_path.unlink()
-                except:
-                    pass
+    def _pdf_page_options(self) -> dict:
+        """Page format, margins and footer of exported PDFs (page.pdf() arguments)"""
+        return {
+            'format': 'A4',
+            'margin': {
+                'top': '2.5cm',
+                'bottom': '2.5cm',
+                'left': '2.5cm',
+                'right': '2.5cm'
+            },
+            'print_background': True,
+            'display_header_footer': True,
+            'header_template': '<div></div>',
+            'footer_template': '''
+                <div style="font-size: 10px; text-align: center; width: 100%; color: #666;">
+                    <span class="pageNumber"></span> / <span class="totalPages"></span>
+                </div>
+            '''
+        }
 
-    def _markdown_to_html(self, markdown: str, title: str) -> str:
+    def _markdown_to_html(self, markdown: str, title: str, base_dir: Optional[str] = None) -> str:
         """
         Convert Markdown to HTML for PDF generation
         Uses marked.js-like conversion (simplified server-side version)
         """
-        # For now, use a simple conversion
-        # In production, you'd use markdown library or call JS from Python
-        try:
-            import markdown as md_lib
-            html_body = md_lib.markdown(
-                markdown,
-                extensions=['extra', 'codehilite', 'tables', 'fenced_code']
-            )
-        except ImportError:
-            # Fallback: basic conversion
-            html_body = self._basic_markdown_to_html(markdown)
+        html_body = self._markdown_to_body_html(markdown)
+
+        # The export engine serves local files under its own origin
+        base = f'<base href="{local_file_url(base_dir)}/">' if base_dir else ""
 
         html = f"""
 <!DOCTYPE html>
@@ -268,6 +279,7 @@ class DocumentConverter:
 <head>
     <meta charset="UTF-8">
     <title>{title}</title>
+    {base}
 </head>
 <body>
     {html_body}
@@ -276,6 +288,20 @@ class DocumentConverter:
 """
         return html
 
+    def _markdown_to_body_html(self, markdown: str) -> str:
+        """Convert Markdown to an HTML fragment (server-side, without Mermaid and KaTeX)"""
+        # For now, use a simple conversion
+        # In production, you'd use markdown library or call JS from Python
+        try:
+            import markdown as md_lib
+            return md_lib.markdown(
+                markdown,
+                extensions=['extra', 'codehilite', 'tables', 'fenced_code']
+            )
+        except ImportError:
+            # Fallback: basic conversion
+            return self._basic_markdown_to_html(markdown)
+
     def _basic_markdown_to_html(self, markdown: str) -> str:
         """
         Basic markdown to HTML conversion (fallback)
@@ -644,7 +670,8 @@ svg tspan {
 }
 """
 
-    def pdf_to_markdown(self, pdf_path: str, output_dir: Optional[str] = None) -> Tuple[bool, str, str]:
+    def pdf_to_markdown(self, pdf_path: str, output_dir: Optional[str] = None,
+                        workers: int = 1, options=None) -> Tuple[bool, str, str]:
         """
         Convert PDF to Markdown with enhanced structure detection
 
@@ -658,13 +685,16 @@ svg tspan {
         Args:
             pdf_path: Path to PDF file
             output_dir: Directory to save extracted images (optional)
+            workers: Processes used for page extraction
+                     (1 = serial, 0 = one per CPU core)
+            options: PdfImportOptions (image handling), defaults if None
 
         Returns:
             Tuple of (success, markdown_content, error_message)
         """
         try:
             # Try PyMuPDF first for better extraction
-            return self._pdf_to_markdown_pymupdf(pdf_path, output_dir)
+            return self._pdf_to_markdown_pymupdf(pdf_path, output_dir, workers, options)
         except ImportError:
             # Fallback to pdfplumber
             return self._pdf_to_markdown_pdfplumber(pdf_path)
@@ -673,12 +703,111 @@ svg tspan {
             logger.error(error_msg)
             return False, "", error_msg
 
-    def _pdf_to_markdown_pymupdf(self, pdf_path: str, output_dir: Optional[str] = None) -> Tuple[bool, str, str]:
+    def iter_pdf_to_markdown(self, pdf_path: str, output_dir: Optional[str] = None,
+                             workers: int = 1, cancel_event=None, options=None):
+        """
+        Convert PDF to Markdown incrementally
+
+        Same output as pdf_to_markdown, but yields the markdown as soon as
+        each page is stitched so callers can show progress and partial
+        results. Concatenating all chunks gives the full document.
+
+        Args:
+            pdf_path: Path to PDF file
+            output_dir: Directory to save extracted images (optional)
+            workers: Processes used for page extraction
+                     (1 = serial, 0 = one per CPU core)
+            cancel_event: Optional threading.Event; once set, conversion
+                          stops after the current page
+            options: PdfImportOptions (image handling), defaults if None
+
+        Yields:
+            (page_num, total_pages, markdown_chunk)
+
+        Raises:
+            Exception: Conversion errors are propagated to the caller
+        """
+        try:
+            import fitz  # noqa: F401
+        except ImportError:
+            # pdfplumber fallback has no per-page pipeline; deliver it in one piece
+            success, content, error = self._pdf_to_markdown_pdfplumber(pdf_path)
+            if not success:
+                raise RuntimeError(error)
+            yield 1, 1, content
+            return
+
+        yield from self._iter_markdown_pymupdf(pdf_path, output_dir, workers, cancel_event, options)
+
+    def pdf_to_markdown_file(self, pdf_path: str, md_path: str, output_dir: Optional[str] = None,
+                             workers: int = 1, options=None) -> Tuple[bool, str, str]:
+        """
+        Convert PDF to a Markdown file without holding the document in memory
+
+        Each page is written to a temporary file next to md_path as soon as
+        it is converted, and the file replaces md_path once the conversion
+        is complete, so memory use does not grow with the document length
+        and a failed conversion never leaves a partial file behind.
+
+        Args:
+            pdf_path: Path to PDF file
+            md_path: Markdown file to create
+            output_dir: Directory to save extracted images (optional)
+            workers: Processes used for page extraction
+                     (1 = serial, 0 = one per CPU core)
+            options: PdfImportOptions (image handling), defaults if None
+
+        Returns:
+            Tuple of (success, md_path, error_message)
+        """
+        md_path = Path(md_path)
+        tmp_path = None
+        try:
+            md_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=md_path.parent, prefix=f".{md_path.stem}-", suffix=".md")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for _page_num, _total, chunk in self.iter_pdf_to_markdown(
+                        pdf_path, output_dir, workers, options=options):
+                    f.write(chunk)
+            os.replace(tmp_path, md_path)
+
+            logger.info(f"PDF converted to markdown file: {pdf_path} -> {md_path}")
+            return True, str(md_path), ""
+
+        except Exception as e:
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            error_msg = f"PDF to Markdown conversion failed: {str(e)}"
+            logger.error(error_msg)
+            return False, "", error_msg
+
+    def _pdf_to_markdown_pymupdf(self, pdf_path: str, output_dir: Optional[str] = None,
+                                 workers: int = 1, options=None) -> Tuple[bool, str, str]:
         """
         Convert PDF to Markdown using PyMuPDF (fitz)
-        Uses BBox-based header/footer filtering and cross-page code block detection.
+        Uses repeated header/footer removal and cross-page code block detection.
         """
-        import fitz  # PyMuPDF
+        chunks = [chunk for _page_num, _total, chunk
+                  in self._iter_markdown_pymupdf(pdf_path, output_dir, workers, options=options)]
+
+        logger.info(f"PDF converted to markdown with PyMuPDF: {pdf_path}")
+
+        return True, ''.join(chunks), ""
+
+    def _iter_markdown_pymupdf(self, pdf_path, output_dir: Optional[str] = None,
+                               workers: int = 1, cancel_event=None, options=None):
+        """
+        Stream the PyMuPDF conversion page by page
+
+        Pages are extracted independently (optionally on a process pool) and
+        then stitched together in page order by a single pass that owns the
+        cross-page state, so serial and parallel output are identical.
+
+        Yields:
+            (page_num, total_pages, markdown_chunk)
+        """
+        from backend.pdf_import import PdfImportSession, MarkdownStreamWriter, ImageWriter
+        from backend.pdf_layout import RunningTextIndex
 
         pdf_path = Path(pdf_path)
 
@@ -688,199 +817,445 @@ svg tspan {
         else:
             images_dir = pdf_path.parent / f"{pdf_path.stem}_images"
 
-        markdown_lines = []
-        extracted_images = []
+        # Collapses blank lines and trims the document while streaming
+        writer = MarkdownStreamWriter()
+
+        # Image files are written in the background while pages are processed
+        image_writer = ImageWriter(images_dir, options)
+
+        # Open fitz and pdfplumber once and share the page handles across stages
+        low_memory = bool(options and options.low_memory)
+        with PdfImportSession(pdf_path, low_memory=low_memory) as session:
+            total_pages = session.page_count
+
+            # First pass: index the header/footer region texts of a sample of
+            # pages, so running headers are recognized from the first page on
+            running = None
+            if total_pages > 2:
+                with FITZ_LOCK:
+                    running = RunningTextIndex.build(session.doc)
+
+            pages = self._iter_page_contents(session, workers, options)
+            stitched = self._stitch_pages(pages, total_pages, image_writer, pdf_path.stem, running)
+
+            try:
+                for page_num, pieces in stitched:
+                    yield page_num, total_pages, writer.feed(pieces)
+
+                    if cancel_event is not None and cancel_event.is_set():
+                        logger.info(f"PDF import cancelled after page {page_num}/{total_pages}")
+                        return
+            finally:
+                # Stops the extraction pipeline (and its process pool) before
+                # the session closes, also when the consumer stops early
+                stitched.close()
+                pages.close()
+                image_writer.close()
+
+        # Keep the page cache within its size cap
+        page_cache = options.create_page_cache() if options else None
+        if page_cache is not None:
+            page_cache.trim()
+
+    def _iter_page_contents(self, session, workers: int = 1, options=None):
+        """
+        Yield PageContent for every page in page order
+
+        Runs in-process by default. With more than one worker and a long
+        enough document, page ranges are extracted on a process pool where
+        each worker opens its own copy of the document. Pages found in the
+        page cache (if enabled in options) are not extracted again.
+        """
+        page_cache = options.create_page_cache() if options else None
+        total_pages = session.page_count
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        workers = min(workers, total_pages)
+
+        next_idx = 0
+        if workers > 1 and total_pages >= self.PARALLEL_MIN_PAGES:
+            from concurrent.futures import ProcessPoolExecutor
+            from concurrent.futures.process import BrokenProcessPool
+            from collections import deque
+
+            # Small contiguous ranges keep the pool busy while results stay in order.
+            # Ranges start at a single page and double up to chunk_size so the
+            # first results arrive quickly even for very large documents.
+            chunk_size = max(1, min(16, total_pages // (workers * 4)))
+            ranges = []
+            start, size = 1, 1
+            while start < total_pages:
+                ranges.append(list(range(start, min(start + size, total_pages))))
+                start += size
+                size = min(size * 2, chunk_size)
+            logger.info(f"Parallel PDF import: {total_pages} pages, {workers} workers, "
+                        f"{len(ranges)} chunks")
+
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_extract_worker)
+            try:
+                pending = deque()
+                ranges_iter = iter(ranges)
+
+                # Only keep a bounded window of chunks in flight so finished
+                # pages don't pile up in memory ahead of the stitching pass
+                for page_range in ranges_iter:
+                    pending.append(pool.submit(_extract_pages_worker, str(session.pdf_path), page_range, options))
+                    if len(pending) >= workers * 2:
+                        break
+
+                # The first page is extracted here while the workers start up
+                try:
+                    with FITZ_LOCK:
+                        content = self._load_page_content(session, 0, page_cache, options)
+                    yield content
+                finally:
+                    session.release_page(0)
+                next_idx = 1
+
+                while pending:
+                    contents = pending.popleft().result()
+                    for page_range in ranges_iter:
+                        pending.append(pool.submit(_extract_pages_worker, str(session.pdf_path), page_range, options))
+                        break
+
+                    for content in contents:
+                        next_idx = content.page_num
+                        yield content
+                return
+
+            except BrokenProcessPool as e:
+                # Process pools can be unavailable (restricted or frozen environments);
+                # finish the remaining pages in-process
+                logger.warning(f"Parallel PDF import failed, continuing serially: {e}")
+
+            finally:
+                # Don't wait for chunks nobody will read when the import stops early
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        for page_idx in range(next_idx, total_pages):
+            try:
+                # Held per page (never across the yield) so the PDF viewer can render in between
+                with FITZ_LOCK:
+                    content = self._load_page_content(session, page_idx, page_cache, options)
+                yield content
+            finally:
+                # Release this page's fitz/pdfplumber objects before moving on
+                session.release_page(page_idx)
+
+    def _load_page_content(self, session, page_idx: int, page_cache=None, options=None):
+        """Get a page's PageContent from the page cache, extracting it on a miss"""
+        if page_cache is None:
+            return self._extract_page_content(session, page_idx, options)
+
+        # Header/footer filtering and font collection depend on the position in the document
+        table_engine = options.table_engine if options else "pdfplumber"
+        columns = options.column_detection if options else True
+        figures = (options.figure_dpi if options.vector_figures else 0) if options else 150
+        precheck = options.table_precheck if options else True
+        settings = (f"filter={session.page_count > 2}|first={page_idx == 0}"
+                    f"|tables={table_engine}|precheck={precheck}|columns={columns}|figures={figures}")
+        key = page_cache.page_key(session.page(page_idx), settings)
+
+        content = page_cache.get(key, page_idx + 1)
+        if content is None:
+            content = self._extract_page_content(session, page_idx, options)
+            page_cache.put(key, content)
+        return content
+
+    def _extract_page_content(self, session, page_idx: int, options=None):
+        """
+        Extract a single page into a state-free PageContent
+
+        Runs text span extraction, code-line classification, image reading,
+        table detection and vector figure capture. Must not depend on any
+        other page.
+        """
+        import fitz  # PyMuPDF
+        from backend.pdf_import import (PageContent, TextBlockContent, ImageBlockContent,
+                                        image_digest, may_contain_tables)
+        from backend.pdf_layout import (order_blocks, in_edge_region, running_text_key,
+                                        image_block_key)
+        from backend.pdf_figures import find_figure_regions, render_figures, contains
+
+        page = session.page(page_idx)
+        total_pages = session.page_count
+
+        content = PageContent(page_num=page_idx + 1)
+
+        # Running headers/footers are only detected in multi-page documents,
+        # single page PDFs often don't have any
+        use_filtering = total_pages > 2
+
+        # Extract text blocks with font information.
+        # Image blocks (with their bytes) are only requested for pages that
+        # reference images, as decoding them is comparatively expensive.
+        flags = fitz.TEXT_PRESERVE_WHITESPACE
+        if page.get_images():
+            flags |= fitz.TEXT_PRESERVE_IMAGES
+        blocks = page.get_text("dict", flags=flags)["blocks"]
+
+        # Vector paths are shared by the table pre-check and figure capture
+        table_precheck = options is None or options.table_precheck
+        vector_figures = options is None or options.vector_figures
+        drawings = page.get_drawings() if table_precheck or vector_figures else None
+
+        # Table detection is by far the slowest stage, skip it on pages without ruling lines
+        table_regions = []
+        if table_precheck and not may_contain_tables(page, drawings=drawings):
+            content.table_pass_skipped = True
+        elif options is not None and options.table_engine == "fitz":
+            content.tables = self._extract_tables_fitz(page, table_regions)
+        else:
+            # Extract tables using pdfplumber for better table detection
+            content.tables = self._extract_tables_from_page(session.plumber_page(page_idx), table_regions)
+
+        # Diagrams drawn as vector paths become images; the text and images
+        # inside a figure are part of its rendering
+        if vector_figures and drawings:
+            text_boxes = [block["bbox"] for block in blocks if block["type"] == 0]
+            regions = find_figure_regions(drawings, page.rect, text_boxes, table_regions)
+            dpi = options.figure_dpi if options is not None else 150
+            for region, data, width, height in render_figures(page, regions, dpi):
+                blocks = [block for block in blocks if not contains(region, block["bbox"])]
+                # Placed before the first block below its top edge, in stream order
+                position = next((idx for idx, block in enumerate(blocks)
+                                 if block["bbox"][1] >= region[1]), len(blocks))
+                blocks.insert(position, {"type": 1, "bbox": region, "image": data, "ext": "png",
+                                         "width": width, "height": height})
+        del drawings
+
+        # Blocks come in PDF stream order, which interleaves multi-column layouts
+        if options is None or options.column_detection:
+            blocks = order_blocks(blocks, page.rect)
+
+        # Collect fonts on first page for debugging
+        if page_idx == 0:
+            all_fonts = set()
+            for block in blocks:
+                if block["type"] == 0:  # Text block
+                    for line in block.get("lines", []):
+                        for span in line.get("spans", []):
+                            font_name = span.get("font", "")
+                            if font_name:
+                                all_fonts.add(font_name)
+            content.fonts = sorted(all_fonts)
+
+        for block in blocks:
+            if block["type"] == 0:  # Text block
+                lines = self._extract_block_lines(block, session.fonts)
+
+                # Edge blocks are keyed by their normalized text; the stitching pass
+                # drops the ones that repeat across the document (outside of code blocks).
+                # Headings are content even when every page starts with one.
+                if use_filtering and in_edge_region(block["bbox"], page.rect) \
+                        and all(line.font_size < self.HEADING_MIN_FONT_SIZE for line in lines):
+                    key = running_text_key('\n'.join(line.text for line in lines))
+                    content.blocks.append(TextBlockContent(True, lines, key))
+                else:
+                    content.blocks.append(TextBlockContent(False, lines))
+
+            elif block["type"] == 1:  # Image block
+                data = block.get("image") or None
+                edge = use_filtering and in_edge_region(block["bbox"], page.rect)
+                content.blocks.append(ImageBlockContent(
+                    edge,
+                    image_digest(data) if data else "",
+                    data,
+                    block.get("ext", "png"),
+                    block.get("width", 0),
+                    block.get("height", 0),
+                    image_block_key(block["bbox"]) if edge else "",
+                ))
+
+        # Page dict is no longer needed once its blocks are consumed
+        del blocks
+
+        return content
+
+    def _stitch_pages(self, pages, total_pages: int, image_writer, doc_name: str, running=None):
+        """
+        Rebuild the document from PageContent in page order
 
-        doc = fitz.open(pdf_path)
+        Owns all cross-page state: the code block state machine, duplicate
+        image detection and image numbering. Edge blocks that the
+        RunningTextIndex knows as running headers/footers are dropped.
+        Import counters end up in self.last_import_stats.
 
-        # Collect all fonts used in the document for debugging
-        all_fonts = set()
+        Yields:
+            (page_num, markdown pieces) per page, then a final
+            (total_pages, pieces) with the flushed trailing code block
+        """
+        from backend.pdf_import import TextBlockContent, PdfImportStats
 
         # State for cross-page code block detection
         in_code_block = False
         code_buffer = []
 
-        # Track processed image xrefs to avoid duplicates (logos, watermarks, etc.)
-        processed_image_xrefs = set()
+        # Track image content hashes to avoid duplicates (logos, watermarks, etc.),
+        # also when the PDF stores the same picture under several xrefs
+        processed_image_digests = set()
+        stats = PdfImportStats(pages=total_pages)
+
+        for content in pages:
+            page_num = content.page_num
+            pieces = []
+            stats.cached_pages += content.from_cache
+            stats.table_pages_skipped += content.table_pass_skipped
+            stats.tables += len(content.tables)
+
+            # Log fonts on first page for debugging
+            if page_num == 1:
+                if content.fonts:
+                    logger.info(f"PDF fonts detected: {content.fonts}")
+                logger.info(f"PDF pages: {total_pages}, using header/footer filtering: {total_pages > 2}")
+
+            for block in content.blocks:
+                # Skip running headers/footers unless we're in a code block
+                if block.edge and not in_code_block and running is not None \
+                        and running.is_running(block.key):
+                    stats.running_blocks += 1
+                    continue
 
-        try:
-            total_pages = len(doc)
+                if isinstance(block, TextBlockContent):
+                    # Process block with code detection
+                    block_result = self._process_block_lines_with_state(
+                        block.lines, in_code_block, code_buffer
+                    )
 
-            for page_num, page in enumerate(doc, 1):
-                page_rect = page.rect
-                page_height = page_rect.height
+                    in_code_block = block_result['in_code_block']
+                    code_buffer = block_result['code_buffer']
 
-                # Define header/footer regions - only for multi-page documents
-                # Single page PDFs often don't have headers/footers
-                use_filtering = total_pages > 2
-                if use_filtering:
-                    # Use conservative thresholds (top 5%, bottom 5%)
-                    header_threshold = page_height * 0.05
-                    footer_threshold = page_height * 0.95
-                else:
-                    # No filtering for short documents
-                    header_threshold = 0
-                    footer_threshold = page_height
-
-                # Extract text blocks with font information
-                blocks = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)["blocks"]
-
-                # Log fonts on first page for debugging
-                if page_num == 1:
-                    for block in blocks:
-                        if block["type"] == 0:  # Text block
-                            for line in block.get("lines", []):
-                                for span in line.get("spans", []):
-                                    font_name = span.get("font", "")
-                                    if font_name:
-                                        all_fonts.add(font_name)
-
-                    if all_fonts:
-                        logger.info(f"PDF fonts detected: {sorted(all_fonts)}")
-                    logger.info(f"PDF pages: {total_pages}, using header/footer filtering: {use_filtering}")
-
-                for block in blocks:
-                    # Get block's vertical position (y0 = top, y1 = bottom)
-                    block_y0 = block.get("bbox", [0, 0, 0, 0])[1]
-                    block_y1 = block.get("bbox", [0, 0, 0, 0])[3]
-
-                    # Skip header/footer regions based on BBox (only if filtering is enabled)
-                    if use_filtering:
-                        if block_y0 < header_threshold:
-                            # Header region - skip unless we're in a code block
-                            if not in_code_block:
-                                continue
-                        if block_y1 > footer_threshold:
-                            # Footer region - skip unless we're in a code block
-                            if not in_code_block:
-                                continue
+                    if block_result['output']:
+                        pieces.append(block_result['output'])
+
+                else:  # Image block
+                    if not block.data:
+                        continue
+
+                    # Skip duplicate images (logos, watermarks that appear on every page)
+                    if block.digest in processed_image_digests:
+                        logger.debug(f"Skipping duplicate image: {block.digest}")
+                        continue
 
-                    if block["type"] == 0:  # Text block
-                        # Process block with code detection
-                        block_result = self._process_text_block_with_state(
-                            block, in_code_block, code_buffer
-                        )
-
-                        in_code_block = block_result['in_code_block']
-                        code_buffer = block_result['code_buffer']
-
-                        if block_result['output']:
-                            markdown_lines.append(block_result['output'])
-
-                    elif block["type"] == 1:  # Image block
-                        # Get image xref to check for duplicates
-                        img_xref = block.get("xref", 0)
-
-                        # Skip duplicate images (logos, watermarks that appear on every page)
-                        if img_xref != 0 and img_xref in processed_image_xrefs:
-                            logger.debug(f"Skipping duplicate image xref: {img_xref}")
-                            continue
-
-                        # Mark this xref as processed
-                        if img_xref != 0:
-                            processed_image_xrefs.add(img_xref)
-
-                        # Flush code buffer before image
-                        if in_code_block and code_buffer:
-                            markdown_lines.append(self._format_code_block(code_buffer))
-                            code_buffer = []
-                            in_code_block = False
-
-                        # Extract image
-                        img_result = self._extract_image_from_block(
-                            page, block, page_num, len(extracted_images) + 1,
-                            images_dir, pdf_path.stem
-                        )
-                        if img_result:
-                            extracted_images.append(img_result)
-                            markdown_lines.append(f"\n![Image {len(extracted_images)}]({img_result})\n")
-
-                # Extract tables using pdfplumber for better table detection
-                page_tables = self._extract_tables_from_page(pdf_path, page_num - 1)
-                if page_tables:
-                    # Flush code buffer before tables
+                    # Mark this image as processed
+                    processed_image_digests.add(block.digest)
+
+                    # Flush code buffer before image
                     if in_code_block and code_buffer:
-                        markdown_lines.append(self._format_code_block(code_buffer))
+                        pieces.append(self._format_code_block(code_buffer))
                         code_buffer = []
                         in_code_block = False
 
-                    for table_md in page_tables:
-                        markdown_lines.append(f"\n{table_md}\n")
+                    # Queue image for writing; the link is known right away
+                    stats.images += 1
+                    image_filename = image_writer.save(
+                        block.data, block.ext, block.width, block.height,
+                        f"{doc_name}_p{page_num}_img{stats.images}"
+                    )
+                    image_path = f"./{image_writer.images_dir.name}/{image_filename}"
+                    pieces.append(f"\n![Image {stats.images}]({image_path})\n")
+
+            if content.tables:
+                # Flush code buffer before tables
+                if in_code_block and code_buffer:
+                    pieces.append(self._format_code_block(code_buffer))
+                    code_buffer = []
+                    in_code_block = False
 
-                # Add page separator (but not if we're in a code block that continues)
-                if page_num < total_pages and not in_code_block:
-                    markdown_lines.append("\n---\n")
+                for table_md in content.tables:
+                    pieces.append(f"\n{table_md}\n")
 
-            # Flush remaining code buffer at end of document
-            if code_buffer:
-                markdown_lines.append(self._format_code_block(code_buffer))
+            # Add page separator (but not if we're in a code block that continues)
+            if page_num < total_pages and not in_code_block:
+                pieces.append("\n---\n")
 
-            markdown_content = '\n'.join(markdown_lines)
+            yield page_num, pieces
 
-            # Clean up excessive newlines
-            import re
-            markdown_content = re.sub(r'\n{3,}', '\n\n', markdown_content)
+        # Flush remaining code buffer at end of document
+        final_pieces = []
+        if code_buffer:
+            final_pieces.append(self._format_code_block(code_buffer))
 
-            logger.info(f"PDF converted to markdown with PyMuPDF: {pdf_path}")
-            if extracted_images:
-                logger.info(f"Extracted {len(extracted_images)} images")
+        if stats.images:
+            logger.info(f"Extracted {stats.images} images")
+        if stats.cached_pages:
+            logger.info(f"PDF page cache: {stats.cached_pages}/{total_pages} pages reused")
+        logger.info(f"PDF import stats: {stats.summary()}")
+        self.last_import_stats = stats
 
-            return True, markdown_content.strip(), ""
+        yield total_pages, final_pieces
 
-        finally:
-            doc.close()
-
-    def _process_text_block_with_state(self, block: dict, in_code_block: bool,
-                                        code_buffer: list) -> dict:
+    def _extract_block_lines(self, block: dict, fonts=None) -> list:
         """
-        Process a text block with stateful code block detection.
-        Maintains code block state across blocks and pages.
+        Convert a fitz text block into LineContent entries.
+        Classifies each line (heading size, bold/italic, code) without any state.
 
-        Returns:
-            dict with 'output', 'in_code_block', 'code_buffer'
+        Args:
+            block: Text block of page.get_text("dict")
+            fonts: FontTable of the document (a fresh one if None)
         """
-        output_lines = []
-        current_in_code = in_code_block
-        current_buffer = code_buffer.copy()
+        from backend.pdf_import import LineContent, FontTable
+
+        if fonts is None:
+            fonts = FontTable()
+        get_font = fonts.get
+
+        lines = []
 
         for line in block.get("lines", []):
-            line_text = ""
-            is_monospace = False
+            spans = line.get("spans", [])
             max_font_size = 0
+            is_monospace = False
             is_bold = False
             is_italic = False
 
-            for span in line.get("spans", []):
-                text = span.get("text", "")
+            for span in spans:
                 font_size = span.get("size", 12)
-                font_name = span.get("font", "").lower()
+                if font_size > max_font_size:
+                    max_font_size = font_size
+
+                # Style flags are computed once per font name
+                font = get_font(span.get("font", ""))
+                is_monospace = is_monospace or font.is_monospace
+                is_bold = is_bold or font.is_bold
+                is_italic = is_italic or font.is_italic
 
-                max_font_size = max(max_font_size, font_size)
+            line_text = ''.join([span.get("text", "") for span in spans])
 
-                # Detect monospace font
-                if self._is_monospace_font(font_name):
-                    is_monospace = True
+            # Also check content pattern if font detection fails
+            if not is_monospace and line_text.strip():
+                is_monospace = self._looks_like_code(line_text)
 
-                # Detect bold/italic
-                if "bold" in font_name or "black" in font_name:
-                    is_bold = True
-                if "italic" in font_name or "oblique" in font_name:
-                    is_italic = True
+            lines.append(LineContent(line_text, max_font_size, is_bold, is_italic, is_monospace))
 
-                line_text += text
+        return lines
 
+    def _process_block_lines_with_state(self, lines: list, in_code_block: bool,
+                                        code_buffer: list) -> dict:
+        """
+        Process the lines of a text block with stateful code block detection.
+        Maintains code block state across blocks and pages.
+
+        code_buffer is extended in place; continue with the returned buffer,
+        which is a new list once a code block has been flushed.
+
+        Returns:
+            dict with 'output', 'in_code_block', 'code_buffer'
+        """
+        output_lines = []
+        current_in_code = in_code_block
+        current_buffer = code_buffer
+
+        for line in lines:
+            line_text = line.text
             line_text_stripped = line_text.strip()
             if not line_text_stripped:
                 if current_in_code:
                     current_buffer.append("")
                 continue
 
-            # Also check content pattern if font detection fails
-            if not is_monospace:
-                is_monospace = self._looks_like_code(line_text)
-
             # State machine for code blocks
-            if is_monospace:
+            if line.is_code:
                 if not current_in_code:
                     # Starting new code block
                     current_in_code = True
@@ -897,19 +1272,19 @@ svg tspan {
                 formatted_line = line_text_stripped
 
                 # Apply heading formatting based on font size
-                if max_font_size >= 24:
+                if line.font_size >= 24:
                     formatted_line = f"# {formatted_line}"
-                elif max_font_size >= 18:
+                elif line.font_size >= 18:
                     formatted_line = f"## {formatted_line}"
-                elif max_font_size >= 14:
+                elif line.font_size >= self.HEADING_MIN_FONT_SIZE:
                     formatted_line = f"### {formatted_line}"
                 else:
                     # Apply bold/italic
-                    if is_bold and is_italic:
+                    if line.is_bold and line.is_italic:
                         formatted_line = f"***{formatted_line}***"
-                    elif is_bold:
+                    elif line.is_bold:
                         formatted_line = f"**{formatted_line}**"
-                    elif is_italic:
+                    elif line.is_italic:
                         formatted_line = f"*{formatted_line}*"
 
                     # Detect list items
@@ -934,89 +1309,13 @@ svg tspan {
         - Lists
         - Code blocks (monospace fonts)
         """
-        lines = []
-        code_lines = []  # Buffer for consecutive code lines
-        in_code_block = False
-
-        for line in block.get("lines", []):
-            line_text = ""
-            max_font_size = 0
-            is_bold = False
-            is_italic = False
-            is_code = False
-
-            for span in line.get("spans", []):
-                text = span.get("text", "")
-                font_size = span.get("size", 12)
-                font_name = span.get("font", "").lower()
-
-                max_font_size = max(max_font_size, font_size)
-
-                # Detect bold
-                if "bold" in font_name or "black" in font_name:
-                    is_bold = True
-
-                # Detect italic
-                if "italic" in font_name or "oblique" in font_name:
-                    is_italic = True
-
-                # Detect monospace/code fonts
-                if self._is_monospace_font(font_name):
-                    is_code = True
-
-                line_text += text
-
-            # Also detect code by content pattern if not detected by font
-            if not is_code and self._looks_like_code(line_text):
-                is_code = True
-
-            line_text_stripped = line_text.strip()
+        result = self._process_block_lines_with_state(self._extract_block_lines(block), False, [])
 
-            if not line_text_stripped:
-                # Empty line - if we're in code block, add empty line to code
-                if in_code_block:
-                    code_lines.append("")
-                continue
-
-            # Handle code blocks
-            if is_code:
-                if not in_code_block:
-                    # Starting a new code block - flush any previous content
-                    in_code_block = True
-                # Preserve original indentation for code
-                code_lines.append(line_text.rstrip())
-                continue
-            else:
-                # Not code - flush any accumulated code lines
-                if in_code_block and code_lines:
-                    lines.append(self._format_code_block(code_lines))
-                    code_lines = []
-                    in_code_block = False
-
-            # Apply markdown formatting based on font size (typical heading sizes)
-            if max_font_size >= 24:
-                line_text_stripped = f"# {line_text_stripped}"
-            elif max_font_size >= 18:
-                line_text_stripped = f"## {line_text_stripped}"
-            elif max_font_size >= 14:
-                line_text_stripped = f"### {line_text_stripped}"
-            else:
-                # Apply bold/italic formatting
-                if is_bold and is_italic:
-                    line_text_stripped = f"***{line_text_stripped}***"
-                elif is_bold:
-                    line_text_stripped = f"**{line_text_stripped}**"
-                elif is_italic:
-                    line_text_stripped = f"*{line_text_stripped}*"
-
-                # Detect list items
-                line_text_stripped = self._detect_list_item(line_text_stripped)
-
-            lines.append(line_text_stripped)
+        lines = [result['output']] if result['output'] else []
 
         # Flush remaining code lines at end of block
-        if code_lines:
-            lines.append(self._format_code_block(code_lines))
+        if result['code_buffer']:
+            lines.append(self._format_code_block(result['code_buffer']))
 
         return '\n'.join(lines)
 
@@ -1025,166 +1324,12 @@ svg tspan {
         Detect if text looks like code based on content patterns.
         This is a fallback when font detection doesn't work.
         """
-        import re
-
-        text_stripped = text.strip()
-        if not text_stripped:
-            return False
-
-        # Strong indicators - if any match, it's very likely code
-        strong_patterns = [
-            # Python specific
-            r'^def\s+\w+\s*\([^)]*\)\s*(->\s*\w+)?:',  # def func() -> Type:
-            r'^class\s+\w+.*:',  # class Foo:
-            r'^(from|import)\s+\w+',  # import/from
-            r'^@\w+',  # @decorator
-            r'^\s*if\s+.+:$',  # if condition:
-            r'^\s*elif\s+.+:$',  # elif condition:
-            r'^\s*else\s*:$',  # else:
-            r'^\s*for\s+\w+\s+in\s+.+:',  # for x in ...:
-            r'^\s*while\s+.+:',  # while ...:
-            r'^\s*try\s*:',  # try:
-            r'^\s*except.*:',  # except:
-            r'^\s*finally\s*:',  # finally:
-            r'^\s*with\s+.+:',  # with ...:
-            r'^\s*return\s+',  # return
-            r'^\s*yield\s+',  # yield
-            r'^\s*raise\s+',  # raise
-            r'^\s*pass\s*$',  # pass
-            r'^\s*break\s*$',  # break
-            r'^\s*continue\s*$',  # continue
-            r'\w+\s*=\s*\[.*\]',  # list assignment
-            r'\w+\s*=\s*\{.*\}',  # dict assignment
-            r'\w+\s*=\s*\(.*\)',  # tuple assignment
-            r'lambda\s+\w+\s*:',  # lambda
-            r'map\s*\(.+\)',  # map()
-            r'filter\s*\(.+\)',  # filter()
-            r'list\s*\(.+\)',  # list()
-            r'dict\s*\(.+\)',  # dict()
-            r'range\s*\(.+\)',  # range()
-            r'print\s*\(.+\)',  # print()
-            r'input\s*\(.+\)',  # input()
-            r'len\s*\(.+\)',  # len()
-            r'\.split\s*\(',  # .split()
-            r'\.join\s*\(',  # .join()
-            r'\.append\s*\(',  # .append()
-            r'int\s*\(.+\)',  # int()
-            r'str\s*\(.+\)',  # str()
-            r'float\s*\(.+\)',  # float()
-
-            # JavaScript/TypeScript
-            r'^(const|let|var)\s+\w+\s*=',
-            r'^function\s+\w+\s*\(',
-            r'^\s*=>\s*\{',
-            r'console\.(log|error|warn)\s*\(',
-
-            # Java/C#
-            r'^(public|private|protected)\s+(static\s+)?(void|int|String|boolean)',
-            r'^(public|private|protected)\s+class\s+\w+',
-
-            # C/C++
-            r'^#include\s*[<"]',
-            r'^#define\s+\w+',
-            r'^int\s+main\s*\(',
-            r'printf\s*\(',
-            r'cout\s*<<',
-
-            # General
-            r'^\s*//.*$',  # // comment
-            r'^\s*#(?!#)\s*\w+',  # # comment (but not ## heading)
-            r'^\s*/\*',  # /* comment
-            r'^\s*\*/',  # */ end comment
-        ]
-
-        for pattern in strong_patterns:
-            if re.search(pattern, text_stripped):
-                logger.debug(f"Code pattern matched: {pattern} in '{text_stripped[:50]}...'")
-                return True
-
-        # Check for code-like characteristics
-        code_indicators = 0
-
-        # Has significant indentation (4+ spaces or tab at start)
-        if re.match(r'^(\t|    +)', text):
-            code_indicators += 3
-
-        # Line ends with colon (Python)
-        if text_stripped.endswith(':') and not text_stripped.startswith('#'):
-            code_indicators += 2
-
-        # Contains brackets/braces
-        bracket_count = len(re.findall(r'[\{\}\[\]\(\)]', text_stripped))
-        if bracket_count >= 2:
-            code_indicators += 2
-        elif bracket_count >= 1:
-            code_indicators += 1
-
-        # Contains operators common in code
-        if re.search(r'[=!<>]=|&&|\|\||=>|->|\+\+|--|==|!=', text_stripped):
-            code_indicators += 2
-
-        # Contains semicolon at end (C-style)
-        if text_stripped.endswith(';'):
-            code_indicators += 2
-
-        # Multiple assignment operators
-        if text_stripped.count('=') >= 1 and re.search(r'\w+\s*=\s*\w+', text_stripped):
-            code_indicators += 1
-
-        # Contains common code symbols
-        if re.search(r'[$@]\w+', text_stripped):  # $var, @decorator
-            code_indicators += 2
-
-        # Has snake_case identifiers (common in Python)
-        if re.search(r'\b[a-z]+_[a-z_]+\b', text_stripped):
-            code_indicators += 1
-
-        # Contains string literals with quotes
-        if re.search(r'["\'][^"\']+["\']', text_stripped):
-            code_indicators += 1
-
-        # Line is a comment (# followed by space and text)
-        if re.match(r'^\s*#\s+\S', text_stripped):
-            code_indicators += 2
-
-        # Contains method/function call pattern
-        if re.search(r'\w+\.\w+\(', text_stripped):
-            code_indicators += 2
-
-        # Threshold for considering it code
-        if code_indicators >= 3:
-            logger.debug(f"Code indicators: {code_indicators} for '{text_stripped[:50]}...'")
-            return True
-
-        return False
+        return self.code_classifier.is_code(text)
 
     def _is_monospace_font(self, font_name: str) -> bool:
         """Check if font is a monospace/code font"""
-        monospace_fonts = [
-            # Common code fonts
-            'courier', 'consolas', 'monaco', 'menlo', 'inconsolata',
-            'source code', 'sourcecodepro', 'fira code', 'firacode',
-            'fira mono', 'firamono', 'dejavu mono', 'dejavumono',
-            'liberation mono', 'liberationmono', 'droid mono', 'droidmono',
-            'ubuntu mono', 'ubuntumono', 'roboto mono', 'robotomono',
-            'jetbrains mono', 'jetbrainsmono', 'cascadia', 'hack',
-            'mono', 'fixed', 'terminal', 'andale',
-            # Korean fonts
-            'd2coding', 'd2 coding', 'nanum gothic coding', 'nanumgothiccoding',
-            '나눔고딕코딩', 'malgun gothic coding',
-            # PDF embedded fonts often have weird names
-            'cour', 'cmtt', 'cmsy', 'lmtt',  # TeX/LaTeX fonts
-            'nixie', 'ocr', 'typewriter',
-        ]
-        font_lower = font_name.lower().replace(' ', '').replace('-', '').replace('_', '')
-
-        # Log font for debugging
-        logger.debug(f"Checking font: {font_name} -> {font_lower}")
-
-        result = any(mono.replace(' ', '') in font_lower for mono in monospace_fonts)
-        if result:
-            logger.debug(f"  -> Detected as monospace!")
-        return result
+        from backend.pdf_import import is_monospace_font
+        return is_monospace_font(font_name)
 
     def _format_code_block(self, code_lines: list) -> str:
         """Format accumulated code lines as a markdown code block"""
@@ -1216,258 +1361,7 @@ svg tspan {
         Detect programming language from code content using scoring system.
         Returns the language with highest confidence score.
         """
-        import re
-
-        code_text = '\n'.join(code_lines)
-        code_lower = code_text.lower()
-
-        # Score-based detection
-        scores = {
-            'python': 0,
-            'javascript': 0,
-            'typescript': 0,
-            'java': 0,
-            'c': 0,
-            'cpp': 0,
-            'csharp': 0,
-            'go': 0,
-            'rust': 0,
-            'html': 0,
-            'css': 0,
-            'sql': 0,
-            'bash': 0,
-            'json': 0,
-            'xml': 0,
-            'yaml': 0,
-            'markdown': 0,
-        }
-
-        # === Python (very specific patterns) ===
-        if re.search(r'\bdef\s+\w+\s*\([^)]*\)\s*(->\s*\w+)?\s*:', code_text):
-            scores['python'] += 10  # def func(): or def func() -> Type:
-        if re.search(r'\bclass\s+\w+.*:', code_text):
-            scores['python'] += 8
-        if 'self.' in code_text or 'self,' in code_text:
-            scores['python'] += 10  # Very Python-specific
-        if '__init__' in code_text or '__name__' in code_text or '__main__' in code_text:
-            scores['python'] += 10
-        if re.search(r'^\s*@\w+', code_text, re.MULTILINE):  # Decorators
-            scores['python'] += 5
-        if re.search(r'\bif\s+.+:', code_text) or re.search(r'\bfor\s+\w+\s+in\s+', code_text):
-            scores['python'] += 3  # Colon-based control flow
-        if re.search(r'\belif\b', code_text):
-            scores['python'] += 8  # elif is Python-only
-        if re.search(r'\bexcept\s+\w+.*:', code_text):
-            scores['python'] += 5
-        if 'import ' in code_lower and ';' not in code_text:
-            scores['python'] += 3
-        if 'from ' in code_lower and ' import ' in code_lower:
-            scores['python'] += 8  # from x import y
-        if re.search(r'\bprint\s*\(', code_text):
-            scores['python'] += 2
-        if re.search(r'\bNone\b', code_text):
-            scores['python'] += 3
-        if re.search(r'\bTrue\b|\bFalse\b', code_text):
-            scores['python'] += 2
-        if re.search(r'\blambda\s+\w+\s*:', code_text):
-            scores['python'] += 5
-
-        # === JavaScript ===
-        if re.search(r'\bconst\s+\w+\s*=', code_text):
-            scores['javascript'] += 5
-        if re.search(r'\blet\s+\w+\s*=', code_text):
-            scores['javascript'] += 5
-        if re.search(r'\bvar\s+\w+\s*=', code_text):
-            scores['javascript'] += 3
-        if re.search(r'\bfunction\s+\w+\s*\(', code_text):
-            scores['javascript'] += 5
-        if '=>' in code_text:
-            scores['javascript'] += 5  # Arrow function
-        if 'console.log' in code_text:
-            scores['javascript'] += 8
-        if re.search(r'\bdocument\.|window\.', code_text):
-            scores['javascript'] += 8
-        if re.search(r'require\s*\(', code_text):
-            scores['javascript'] += 5
-        if re.search(r'\bnull\b', code_text) and re.search(r'\bundefined\b', code_text):
-            scores['javascript'] += 3
-        if '===' in code_text or '!==' in code_text:
-            scores['javascript'] += 5
-
-        # === TypeScript ===
-        if re.search(r':\s*(string|number|boolean|any|void)\b', code_text):
-            scores['typescript'] += 8
-        if re.search(r'\binterface\s+\w+\s*\{', code_text):
-            scores['typescript'] += 10
-        if re.search(r'\btype\s+\w+\s*=', code_text):
-            scores['typescript'] += 8
-        if '<T>' in code_text or '<T,' in code_text:
-            scores['typescript'] += 3
-        if scores['typescript'] > 0:
-            scores['typescript'] += scores['javascript'] // 2  # TS inherits JS patterns
-
-        # === Java ===
-        if re.search(r'\bpublic\s+class\s+\w+', code_text):
-            scores['java'] += 10
-        if re.search(r'\bpublic\s+static\s+void\s+main', code_text):
-            scores['java'] += 15
-        if re.search(r'\bSystem\.out\.print', code_text):
-            scores['java'] += 10
-        if re.search(r'\bprivate\s+(static\s+)?(final\s+)?\w+\s+\w+', code_text):
-            scores['java'] += 5
-        if re.search(r'\bnew\s+\w+\s*\(', code_text) and ';' in code_text:
-            scores['java'] += 3
-        if re.search(r'@Override|@Autowired|@Component', code_text):
-            scores['java'] += 8
-
-        # === C ===
-        if re.search(r'#include\s*<\w+\.h>', code_text):
-            scores['c'] += 10
-        if re.search(r'\bint\s+main\s*\(', code_text):
-            scores['c'] += 8
-        if re.search(r'\bprintf\s*\(', code_text):
-            scores['c'] += 8
-        if re.search(r'\bscanf\s*\(', code_text):
-            scores['c'] += 8
-        if re.search(r'\bmalloc\s*\(|\bfree\s*\(', code_text):
-            scores['c'] += 5
-        if re.search(r'\bstruct\s+\w+\s*\{', code_text):
-            scores['c'] += 3
-
-        # === C++ ===
-        if re.search(r'#include\s*<\w+>', code_text) and not re.search(r'\.h>', code_text):
-            scores['cpp'] += 5  # Modern C++ headers without .h
-        if 'std::' in code_text:
-            scores['cpp'] += 10
-        if 'cout' in code_text or 'cin' in code_text:
-            scores['cpp'] += 8
-        if re.search(r'\bclass\s+\w+\s*\{', code_text) and ';' in code_text:
-            scores['cpp'] += 5
-        if '::' in code_text:
-            scores['cpp'] += 3
-        if re.search(r'\bnamespace\s+\w+', code_text):
-            scores['cpp'] += 8
-        if re.search(r'\btemplate\s*<', code_text):
-            scores['cpp'] += 8
-        scores['cpp'] += scores['c'] // 2  # C++ inherits C patterns
-
-        # === C# ===
-        if re.search(r'\busing\s+System', code_text):
-            scores['csharp'] += 10
-        if re.search(r'\bnamespace\s+\w+', code_text) and '{' in code_text:
-            scores['csharp'] += 5
-        if re.search(r'\bConsole\.(WriteLine|ReadLine)', code_text):
-            scores['csharp'] += 10
-        if re.search(r'\basync\s+Task', code_text):
-            scores['csharp'] += 8
-        if re.search(r'\bvar\s+\w+\s*=', code_text) and ';' in code_text:
-            scores['csharp'] += 3
-
-        # === Go ===
-        if re.search(r'\bpackage\s+\w+', code_text):
-            scores['go'] += 10
-        if re.search(r'\bfunc\s+\w+\s*\(', code_text):
-            scores['go'] += 8
-        if re.search(r'\bfmt\.(Print|Println|Printf)', code_text):
-            scores['go'] += 10
-        if ':=' in code_text:
-            scores['go'] += 8  # Go's short declaration
-        if re.search(r'\bgo\s+\w+\(', code_text):
-            scores['go'] += 5  # Goroutine
-        if re.search(r'\bdefer\s+', code_text):
-            scores['go'] += 8
-
-        # === Rust ===
-        if re.search(r'\bfn\s+\w+\s*\(', code_text):
-            scores['rust'] += 8
-        if re.search(r'\blet\s+mut\s+', code_text):
-            scores['rust'] += 10  # Rust's mutable let
-        if re.search(r'\bimpl\s+\w+', code_text):
-            scores['rust'] += 10
-        if re.search(r'\bpub\s+fn\s+', code_text):
-            scores['rust'] += 8
-        if 'println!' in code_text or 'vec!' in code_text:
-            scores['rust'] += 10  # Rust macros
-        if re.search(r'->\s*\w+', code_text) and '::' in code_text:
-            scores['rust'] += 5
-
-        # === HTML ===
-        if re.search(r'<(!DOCTYPE|html|head|body|div|span|p|a|img)\b', code_text, re.IGNORECASE):
-            scores['html'] += 10
-        if re.search(r'</\w+>', code_text):
-            scores['html'] += 5
-        if re.search(r'<\w+\s+\w+="[^"]*"', code_text):
-            scores['html'] += 3
-
-        # === CSS ===
-        if re.search(r'\{[^}]*:\s*[^;]+;[^}]*\}', code_text):
-            scores['css'] += 5
-        if re.search(r'\b(margin|padding|font-size|color|background|display)\s*:', code_text):
-            scores['css'] += 8
-        if re.search(r'\.([\w-]+)\s*\{', code_text):
-            scores['css'] += 5  # Class selector
-        if re.search(r'#[\w-]+\s*\{', code_text):
-            scores['css'] += 5  # ID selector
-
-        # === SQL ===
-        if re.search(r'\bSELECT\s+.+\s+FROM\b', code_text, re.IGNORECASE):
-            scores['sql'] += 15
-        if re.search(r'\bINSERT\s+INTO\b', code_text, re.IGNORECASE):
-            scores['sql'] += 10
-        if re.search(r'\bCREATE\s+(TABLE|DATABASE|INDEX)\b', code_text, re.IGNORECASE):
-            scores['sql'] += 10
-        if re.search(r'\bWHERE\s+', code_text, re.IGNORECASE):
-            scores['sql'] += 5
-        if re.search(r'\bJOIN\s+', code_text, re.IGNORECASE):
-            scores['sql'] += 5
-
-        # === Bash/Shell ===
-        if re.search(r'^#!/bin/(bash|sh|zsh)', code_text, re.MULTILINE):
-            scores['bash'] += 15
-        if re.search(r'^\$\s+\w+', code_text, re.MULTILINE):
-            scores['bash'] += 5
-        if re.search(r'\b(sudo|apt|yum|brew|npm|pip|git|docker|kubectl)\s+', code_text):
-            scores['bash'] += 5
-        if re.search(r'\becho\s+', code_text):
-            scores['bash'] += 3
-        if re.search(r'\bexport\s+\w+=', code_text):
-            scores['bash'] += 5
-        if re.search(r'\$\{\w+\}|\$\w+', code_text):
-            scores['bash'] += 3
-
-        # === JSON ===
-        stripped = code_text.strip()
-        if (stripped.startswith('{') and stripped.endswith('}')) or \
-           (stripped.startswith('[') and stripped.endswith(']')):
-            if re.search(r'"\w+"\s*:', code_text):
-                scores['json'] += 15
-
-        # === XML ===
-        if re.search(r'<\?xml\s+version=', code_text):
-            scores['xml'] += 15
-        if re.search(r'<\w+[^>]*>[^<]*</\w+>', code_text) and '<html' not in code_lower:
-            scores['xml'] += 5
-
-        # === YAML ===
-        if re.search(r'^\w+:\s*$', code_text, re.MULTILINE):
-            scores['yaml'] += 5
-        if re.search(r'^\s*-\s+\w+:', code_text, re.MULTILINE):
-            scores['yaml'] += 8
-        if re.search(r'^\w+:\s+\w+', code_text, re.MULTILINE) and '{' not in code_text:
-            scores['yaml'] += 3
-
-        # Find language with highest score
-        max_score = max(scores.values())
-        if max_score < 5:
-            return ""  # Not confident enough
-
-        best_lang = max(scores, key=scores.get)
-
-        # Log for debugging
-        top_scores = sorted(scores.items(), key=lambda x: -x[1])[:3]
-        logger.debug(f"Language detection scores: {top_scores}")
-
-        return best_lang
+        return self.language_detector.detect(code_lines)
 
     def _detect_list_item(self, text: str) -> str:
         """Detect and convert list items to markdown format"""
@@ -1487,67 +1381,57 @@ svg tspan {
 
         return text
 
-    def _extract_image_from_block(self, page, block: dict, page_num: int,
-                                   img_num: int, images_dir: Path,
-                                   doc_name: str) -> Optional[str]:
-        """Extract image from PDF block and save to file"""
-        try:
-            import fitz
-
-            # Create images directory if needed
-            images_dir.mkdir(parents=True, exist_ok=True)
-
-            # Get image from page
-            xref = block.get("xref", 0)
-            if xref == 0:
-                return None
-
-            # Extract image
-            base_image = page.parent.extract_image(xref)
-            if not base_image:
-                return None
-
-            image_bytes = base_image["image"]
-            image_ext = base_image.get("ext", "png")
+    def _extract_tables_from_page(self, plumber_page, regions: Optional[list] = None) -> list:
+        """
+        Extract tables from a page using pdfplumber
 
-            # Save image
-            image_filename = f"{doc_name}_p{page_num}_img{img_num}.{image_ext}"
-            image_path = images_dir / image_filename
+        Args:
+            plumber_page: pdfplumber Page from the import session (None if unavailable)
+            regions: If given, the bbox of every converted table is appended
+        """
+        if plumber_page is None:
+            return []
 
-            with open(image_path, "wb") as f:
-                f.write(image_bytes)
+        try:
+            tables_md = []
 
-            logger.info(f"Extracted image: {image_path}")
+            for found in plumber_page.find_tables():
+                table = found.extract()
+                if table and len(table) > 0:
+                    md_table = self._table_to_markdown(table)
+                    if md_table:
+                        tables_md.append(md_table)
+                        if regions is not None:
+                            regions.append(tuple(found.bbox))
 
-            # Return relative path for markdown
-            return f"./{images_dir.name}/{image_filename}"
+            return tables_md
 
         except Exception as e:
-            logger.warning(f"Failed to extract image: {e}")
-            return None
+            logger.warning(f"Table extraction failed: {e}")
+            return []
 
-    def _extract_tables_from_page(self, pdf_path: str, page_idx: int) -> list:
-        """Extract tables from a specific page using pdfplumber"""
-        try:
-            import pdfplumber
+    def _extract_tables_fitz(self, page, regions: Optional[list] = None) -> list:
+        """
+        Extract tables from a page using PyMuPDF's table finder
 
+        Args:
+            page: fitz.Page from the import session
+            regions: If given, the bbox of every converted table is appended
+        """
+        try:
             tables_md = []
 
-            with pdfplumber.open(pdf_path) as pdf:
-                if page_idx < len(pdf.pages):
-                    page = pdf.pages[page_idx]
-                    tables = page.extract_tables()
-
-                    for table in tables:
-                        if table and len(table) > 0:
-                            md_table = self._table_to_markdown(table)
-                            if md_table:
-                                tables_md.append(md_table)
+            for table in page.find_tables().tables:
+                rows = table.extract()
+                if rows:
+                    md_table = self._table_to_markdown(rows)
+                    if md_table:
+                        tables_md.append(md_table)
+                        if regions is not None:
+                            regions.append(tuple(table.bbox))
 
             return tables_md
 
-        except ImportError:
-            return []
         except Exception as e:
             logger.warning(f"Table extraction failed: {e}")
             return []
@@ -1645,65 +1529,30 @@ svg tspan {
         Returns:
             dict with 'headers' and 'footers' sets of repeated text patterns
         """
-        import re
+        from collections import Counter
+        from backend.pdf_layout import normalize_running_text
 
         if len(pages_content) < 2:
-            return {'headers': set(), 'footers': set(), 'page_numbers': set()}
+            return {'headers': set(), 'footers': set()}
 
         # Collect first N and last N lines from each page
         NUM_LINES_TO_CHECK = 3
 
-        page_headers = []  # List of sets of header lines per page
-        page_footers = []  # List of sets of footer lines per page
+        header_counts = Counter()
+        footer_counts = Counter()
 
         for page_lines in pages_content:
-            if not page_lines:
-                page_headers.append(set())
-                page_footers.append(set())
-                continue
+            lines = [line for line in page_lines if line.strip()]
 
-            # Get first few non-empty lines (potential headers)
-            headers = set()
-            count = 0
-            for line in page_lines:
-                if line.strip():
-                    # Normalize the line (remove page numbers)
-                    normalized = self._normalize_for_comparison(line)
-                    if normalized:
-                        headers.add(normalized)
-                    count += 1
-                    if count >= NUM_LINES_TO_CHECK:
-                        break
-            page_headers.append(headers)
-
-            # Get last few non-empty lines (potential footers)
-            footers = set()
-            count = 0
-            for line in reversed(page_lines):
-                if line.strip():
-                    normalized = self._normalize_for_comparison(line)
-                    if normalized:
-                        footers.add(normalized)
-                    count += 1
-                    if count >= NUM_LINES_TO_CHECK:
-                        break
-            page_footers.append(footers)
+            # Normalized (page numbers removed), each counted once per page
+            headers = {normalize_running_text(line) for line in lines[:NUM_LINES_TO_CHECK]}
+            footers = {normalize_running_text(line) for line in lines[-NUM_LINES_TO_CHECK:]}
+            header_counts.update(headers - {""})
+            footer_counts.update(footers - {""})
 
         # Find lines that appear in most pages (threshold: 50%+)
         threshold = len(pages_content) // 2
 
-        # Count header occurrences
-        header_counts = {}
-        for headers in page_headers:
-            for h in headers:
-                header_counts[h] = header_counts.get(h, 0) + 1
-
-        # Count footer occurrences
-        footer_counts = {}
-        for footers in page_footers:
-            for f in footers:
-                footer_counts[f] = footer_counts.get(f, 0) + 1
-
         repeated_headers = {h for h, count in header_counts.items() if count > threshold}
         repeated_footers = {f for f, count in footer_counts.items() if count > threshold}
 
@@ -1720,62 +1569,13 @@ svg tspan {
         Normalize text for comparison, removing page numbers and dates.
         Returns empty string if the line is just a page number.
         """
-        import re
-
-        text = text.strip()
-
-        # Check if line is just a page number - remove entirely
-        page_number_patterns = [
-            r'^-?\s*\d+\s*-?$',  # Just number: "1", "- 1 -", "-1-"
-            r'^page\s*\d+$',  # "Page 1"
-            r'^\d+\s*/\s*\d+$',  # "1 / 10"
-            r'^p\.?\s*\d+$',  # "p.1", "p 1"
-            r'^\d+\s*페이지$',  # Korean: "1 페이지"
-            r'^제?\s*\d+\s*쪽$',  # Korean: "제 1 쪽"
-        ]
-
-        for pattern in page_number_patterns:
-            if re.match(pattern, text, re.IGNORECASE):
-                return ""  # This is just a page number, ignore it
-
-        # Remove page numbers from within text
-        text = re.sub(r'\s*-?\s*\d+\s*-?\s*$', '', text)  # Trailing page number
-        text = re.sub(r'^\s*-?\s*\d+\s*-?\s*', '', text)  # Leading page number
-        text = re.sub(r'\s*page\s*\d+\s*', ' ', text, flags=re.IGNORECASE)
-        text = re.sub(r'\s*\d+\s*/\s*\d+\s*', ' ', text)
-
-        # Remove dates
-        date_patterns = [
-            r'\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}',  # 2024-01-01
-            r'\d{1,2}[-/\.]\d{1,2}[-/\.]\d{4}',  # 01-01-2024
-            r'\d{4}년\s*\d{1,2}월\s*\d{1,2}일',  # Korean date
-        ]
-        for pattern in date_patterns:
-            text = re.sub(pattern, '', text)
-
-        return text.strip()
+        from backend.pdf_layout import normalize_running_text
+        return normalize_running_text(text)
 
     def _is_page_number_line(self, text: str) -> bool:
         """Check if a line is just a page number."""
-        import re
-
-        text = text.strip()
-        if not text:
-            return False
-
-        page_number_patterns = [
-            r'^-?\s*\d+\s*-?$',
-            r'^page\s*\d+$',
-            r'^\d+\s*/\s*\d+$',
-            r'^p\.?\s*\d+$',
-            r'^\d+\s*페이지$',
-            r'^제?\s*\d+\s*쪽$',
-        ]
-
-        for pattern in page_number_patterns:
-            if re.match(pattern, text, re.IGNORECASE):
-                return True
-        return False
+        from backend.pdf_layout import is_page_number
+        return bool(text.strip()) and is_page_number(text)
 
     def _filter_repeated_content(self, pages_content: list) -> list:
         """
@@ -1835,6 +1635,7 @@ svg tspan {
         """
         try:
             import pdfplumber
+            from backend.pdf_import import cluster_char_lines, FontTable
 
             markdown_lines = []
 
@@ -1842,6 +1643,9 @@ svg tspan {
             in_code_block = False
             code_buffer = []
 
+            # Font flags are classified once per font for the whole document
+            fonts = FontTable()
+
             with pdfplumber.open(pdf_path) as pdf:
                 total_pages = len(pdf.pages)
 
@@ -1877,35 +1681,21 @@ svg tspan {
                     # Extract text with position info using chars
                     chars = page.chars
                     if chars:
-                        # Group chars into lines by y-position
-                        lines_by_y = {}
-                        for char in chars:
-                            y = round(char['top'], 1)  # Round to group nearby chars
-                            if y not in lines_by_y:
-                                lines_by_y[y] = []
-                            lines_by_y[y].append(char)
-
-                        # Sort by y position and process each line
-                        for y in sorted(lines_by_y.keys()):
+                        for line in cluster_char_lines(chars):
                             # Skip header/footer regions (only if filtering enabled)
-                            if use_filtering and y < header_threshold and not in_code_block:
+                            if use_filtering and line.top < header_threshold and not in_code_block:
                                 continue
-                            if use_filtering and y > footer_threshold and not in_code_block:
+                            if use_filtering and line.top > footer_threshold and not in_code_block:
                                 continue
 
-                            # Build line text from chars
-                            line_chars = sorted(lines_by_y[y], key=lambda c: c['x0'])
-                            line_text = ''.join(c['text'] for c in line_chars)
+                            line_text = line.text
 
                             # Check if this line looks like code
                             is_code = self._looks_like_code(line_text)
 
                             # Check font (if available)
-                            fonts = set(c.get('fontname', '') for c in line_chars)
-                            for font in fonts:
-                                if self._is_monospace_font(font.lower()):
-                                    is_code = True
-                                    break
+                            if not is_code:
+                                is_code = any(fonts.get(font).is_monospace for font in line.fonts)
 
                             if is_code:
                                 if not in_code_block:
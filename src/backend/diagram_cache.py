@@ -0,0 +1,198 @@
+"""
+Diagram Cache Module
+Persistent cache of rasterized Mermaid diagrams for PDF export
+"""
+
+import base64
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class DiagramCache:
+    """
+    Content-addressed cache of diagram PNGs under ~/.saekim/cache/diagrams/
+
+    The PDF export rasterizes every Mermaid SVG of the preview to PNG. A
+    diagram is keyed by its source, the Mermaid theme and the raster scale,
+    so a diagram that did not change since the last export is taken from
+    here instead of being drawn to a canvas again - wherever it moved to in
+    the document and in whichever document it appears.
+
+    Layout:
+        <key[:2]>/<key>.png
+
+    Entries are touched on every hit, and trim() removes the least recently
+    used files until the cache fits its size cap.
+    """
+
+    # Bump whenever the rasterization in file.js changes so stale entries are ignored
+    VERSION = 1
+
+    DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+    DATA_URL_PREFIX = "data:image/png;base64,"
+
+    # diagram_key() output: 20 bytes of blake2b as lowercase hex
+    KEY_RE = re.compile(r"[0-9a-f]{40}")
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_dir()
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def default_dir() -> Path:
+        return Path.home() / ".saekim" / "cache" / "diagrams"
+
+    # ==================== Keys ====================
+
+    def diagram_key(self, source: str, theme: str, scale: float) -> str:
+        """
+        Hash of everything the rasterized diagram depends on
+
+        Args:
+            source: Mermaid diagram source
+            theme: Mermaid theme the SVG was rendered with
+            scale: Canvas scale factor used for the PNG
+        """
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f"v{self.VERSION}|{theme}|{float(scale)}|".encode())
+        h.update(source.strip().encode("utf-8"))
+        return h.hexdigest()
+
+    @classmethod
+    def is_valid_key(cls, key) -> bool:
+        """True for keys diagram_key() can produce; anything else must not become a path"""
+        return isinstance(key, str) and cls.KEY_RE.fullmatch(key) is not None
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.png"
+
+    # ==================== Lookup ====================
+
+    def get(self, key: str) -> Optional[bytes]:
+        """PNG bytes of a cached diagram, or None on a miss"""
+        path = self._path(key)
+        try:
+            png = path.read_bytes()
+        except OSError:
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return png
+
+    def get_data_url(self, key: str) -> Optional[str]:
+        """Cached diagram as a data: URL the export page can use directly"""
+        png = self.get(key)
+        if png is None:
+            return None
+        return self.DATA_URL_PREFIX + base64.b64encode(png).decode("ascii")
+
+    def put(self, key: str, png: bytes):
+        """Store a rasterized diagram"""
+        try:
+            self._write_atomic(self._path(key), png)
+        except OSError as e:
+            # A full or read-only disk must not break the export
+            logger.warning(f"Failed to write diagram cache entry: {e}")
+
+    def put_data_url(self, key: str, data_url: str) -> bool:
+        """
+        Store a diagram given as a PNG data: URL (as produced by canvas.toDataURL)
+
+        Returns:
+            False if the URL is not a PNG data URL
+        """
+        if not data_url.startswith(self.DATA_URL_PREFIX):
+            return False
+        try:
+            png = base64.b64decode(data_url[len(self.DATA_URL_PREFIX):], validate=True)
+        except ValueError:
+            return False
+        self.put(key, png)
+        return True
+
+    def _write_atomic(self, path: Path, payload: bytes):
+        """Write via a temp file so concurrent exports never read partial files"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(Path(tmp_path))
+            raise
+
+    @staticmethod
+    def _remove(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    # ==================== Maintenance ====================
+
+    def _entries(self):
+        """(path, size, mtime) of all cache files"""
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for dirpath, _dirnames, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def trim(self) -> int:
+        """
+        Evict least recently used diagrams until the cache fits max_bytes
+
+        Returns:
+            Number of bytes freed
+        """
+        entries = self._entries()
+        total = sum(size for _path, size, _mtime in entries)
+        if total <= self.max_bytes:
+            return 0
+
+        freed = 0
+        for path, size, _mtime in sorted(entries, key=lambda entry: entry[2]):
+            if total - freed <= self.max_bytes:
+                break
+            self._remove(path)
+            freed += size
+
+        logger.info(f"Diagram cache trimmed: {freed / (1024 * 1024):.1f} MB freed")
+        return freed
+
+    def stats(self) -> dict:
+        """Summary of the cache contents"""
+        entries = self._entries()
+        return {
+            "path": str(self.cache_dir),
+            "diagrams": len(entries),
+            "size_bytes": sum(size for _path, size, _mtime in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self):
+        """Delete all cached diagrams"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        logger.info(f"Diagram cache cleared: {self.cache_dir}")
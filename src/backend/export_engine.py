@@ -0,0 +1,540 @@
+"""
+Export Engine Module
+Keeps a headless Chromium alive between PDF exports
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import asyncio
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import quote, unquote, urlsplit
+from urllib.request import url2pathname
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+# Chromium bundled into the frozen Windows build
+BUNDLED_BROWSER = Path('ms-playwright') / 'chromium-1194' / 'chrome-win' / 'chrome.exe'
+
+
+def browser_launch_options() -> dict:
+    """Chromium launch options, using the bundled browser in the frozen build"""
+    launch_options = {'headless': True}
+
+    if getattr(sys, 'frozen', False):
+        bundled_browser_path = Path(sys._MEIPASS) / BUNDLED_BROWSER
+        if bundled_browser_path.exists():
+            launch_options['executable_path'] = str(bundled_browser_path)
+            logger.info(f"Using bundled browser at: {bundled_browser_path}")
+        else:
+            logger.warning(f"Bundled browser not found at {bundled_browser_path}, trying default lookup")
+
+    return launch_options
+
+
+def playwright_version() -> Optional[str]:
+    """Installed Playwright version, or None if Playwright is missing"""
+    try:
+        from playwright._repo_version import version
+        return version
+    except ImportError:
+        pass
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+        return version("playwright")
+    except (ImportError, PackageNotFoundError):
+        return None
+
+
+class BrowserProbe:
+    """
+    Finds out whether Chromium for PDF export is installed, without launching it
+
+    Asks the Playwright driver where its Chromium executable should be and
+    checks that the file exists. The result is kept in memory, and a found
+    browser also in ~/.saekim/cache/playwright_probe.json, so later checks,
+    also in later sessions, cost a stat() of the executable. A different
+    Playwright version expects a different browser build and invalidates
+    the result; installing browsers calls invalidate().
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        self.cache_file = Path(cache_file) if cache_file else Path.home() / ".saekim" / "cache" / "playwright_probe.json"
+        self._result = None  # last probe result dict
+
+    def _is_valid(self, result: Optional[dict]) -> bool:
+        """A cached result holds while the Playwright version and the executable are unchanged"""
+        if not result or result.get("playwright") != playwright_version():
+            return False
+        if not result.get("installed"):
+            return True
+        executable = result.get("executable")
+        return bool(executable) and Path(executable).exists()
+
+    def _load(self) -> Optional[dict]:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, result: dict):
+        self._result = result
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2)
+        except OSError as e:
+            logger.debug(f"Could not store browser probe result: {e}")
+
+    def cached(self) -> Optional[bool]:
+        """Result of a still valid earlier probe, None if a probe is needed"""
+        if self._is_valid(self._result):
+            return self._result["installed"]
+        result = self._load()
+        if self._is_valid(result) and result.get("installed"):
+            self._result = result
+            return True
+        return None
+
+    async def _locate_async(self) -> Optional[str]:
+        """Chromium executable Playwright would launch (starts only the driver)"""
+        executable = browser_launch_options().get('executable_path')
+        if executable:
+            return executable
+
+        from playwright.async_api import async_playwright
+        async with async_playwright() as p:
+            return p.chromium.executable_path
+
+    async def check_async(self, refresh: bool = False) -> bool:
+        """Probe on the converter runtime loop; see check()"""
+        if not refresh:
+            cached = self.cached()
+            if cached is not None:
+                return cached
+
+        version = playwright_version()
+        if version is None:
+            return False
+
+        try:
+            executable = await self._locate_async()
+        except Exception as e:
+            logger.warning(f"Playwright browser probe failed: {e}")
+            return False
+
+        installed = bool(executable) and Path(executable).exists()
+        result = {"playwright": version, "executable": executable, "installed": installed}
+        if installed:
+            self._store(result)
+        else:
+            # A missing browser is only remembered for this session
+            self._result = result
+        logger.info(f"Playwright browser {'found' if installed else 'missing'}: {executable}")
+        return installed
+
+    def check(self, refresh: bool = False) -> bool:
+        """
+        True if Chromium for PDF export is installed
+
+        Args:
+            refresh: Ignore cached results and ask the driver again
+        """
+        if not refresh:
+            cached = self.cached()
+            if cached is not None:
+                return cached
+        from backend.async_runtime import get_runtime
+        return get_runtime().run(self.check_async(refresh))
+
+    def invalidate(self):
+        """Forget the cached result (after installing or removing browsers)"""
+        self._result = None
+        try:
+            self.cache_file.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+# Export documents are served from this origin by the engine's request handler
+EXPORT_ORIGIN = "https://saekim.export"
+EXPORT_DOCUMENT_URL = EXPORT_ORIGIN + "/document.html"
+
+# Local files the document refers to (images next to the Markdown file) are
+# served from disk under this path; a page on an https origin may not load
+# file:// URLs
+LOCAL_FILES_URL = EXPORT_ORIGIN + "/local/"
+
+_FILE_URL_RE = re.compile(r'''(\b(?:src|href)\s*=\s*["'])(file:[^"']*)''', re.IGNORECASE)
+
+# Remote stylesheets and fonts export pages may use; kept in ExportAssets
+CACHEABLE_ASSET_PREFIXES = (
+    "https://cdn.jsdelivr.net/npm/katex@",
+)
+
+# Set on every export page: window.__saekimReady turns true once fonts are
+# loaded, images are decoded and two frames have been laid out after load.
+# Pages may set it to false themselves and back to true when their own
+# rendering (diagrams, math) is done.
+READY_SCRIPT = """
+window.__saekimReady = false;
+window.addEventListener('load', async () => {
+    try {
+        if (document.fonts) await document.fonts.ready;
+    } catch (e) {}
+    await Promise.all(Array.from(document.images, (img) =>
+        img.decode ? img.decode().catch(() => {}) : Promise.resolve()));
+    await new Promise((resolve) => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+    window.__saekimReady = true;
+});
+"""
+
+# Longest wait for the ready signal before printing anyway (ms)
+READY_TIMEOUT = 15000
+
+# Timeout for fetching a not yet cached asset (ms); offline exports fail fast
+ASSET_FETCH_TIMEOUT = 5000
+
+
+def local_file_url(path) -> str:
+    """URL the export page loads a local file from"""
+    return LOCAL_FILES_URL + quote(Path(os.path.abspath(path)).as_posix().lstrip("/"))
+
+
+def local_file_path(url: str) -> Optional[Path]:
+    """Local file behind a LOCAL_FILES_URL address, or None for other URLs"""
+    if not url.startswith(LOCAL_FILES_URL):
+        return None
+    relative = unquote(urlsplit(url).path[len(urlsplit(LOCAL_FILES_URL).path):])
+    # Windows paths keep their drive letter ("C:/..."), POSIX paths get their root back
+    return Path(relative) if os.name == "nt" else Path("/" + relative)
+
+
+def rewrite_file_urls(html: str) -> str:
+    """Point the file:// src and href attributes of a document at LOCAL_FILES_URL"""
+    def to_local_url(match):
+        path = url2pathname(urlsplit(match.group(2)).path)
+        return match.group(1) + local_file_url(path)
+
+    return _FILE_URL_RE.sub(to_local_url, html)
+
+
+class ExportAssets:
+    """
+    Local copies of the remote stylesheets and fonts used by export pages
+
+    The first export that needs, say, the KaTeX stylesheet fetches it once;
+    every later export is served from ~/.saekim/cache/export_assets/ and
+    never waits on the network. Without network and without a cached copy
+    the request fails at once instead of stalling the export.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".saekim" / "cache" / "export_assets"
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / key, self.cache_dir / f"{key}.type"
+
+    def get(self, url: str) -> Optional[Tuple[bytes, str]]:
+        """(body, content type) of a cached asset"""
+        body_path, type_path = self._paths(url)
+        try:
+            return body_path.read_bytes(), type_path.read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def put(self, url: str, body: bytes, content_type: str):
+        body_path, type_path = self._paths(url)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = body_path.with_suffix(".tmp")
+            tmp_path.write_bytes(body)
+            type_path.write_text(content_type, encoding='utf-8')
+            os.replace(tmp_path, body_path)
+        except OSError as e:
+            logger.debug(f"Could not cache export asset {url}: {e}")
+
+    async def fulfill(self, route):
+        """Answer a page request for an asset from the cache, fetching it once on a miss"""
+        url = route.request.url
+        cached = self.get(url)
+        if cached is not None:
+            body, content_type = cached
+            await route.fulfill(status=200, body=body, content_type=content_type,
+                                headers={"Access-Control-Allow-Origin": "*"})
+            return
+
+        try:
+            response = await route.fetch(timeout=ASSET_FETCH_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Export asset unavailable, continuing without it: {url} ({e})")
+            await route.abort()
+            return
+
+        if response.ok:
+            body = await response.body()
+            self.put(url, body, response.headers.get("content-type", "application/octet-stream"))
+        await route.fulfill(response=response)
+
+
+class PdfExportEngine:
+    """
+    Long-lived headless Chromium for PDF export
+
+    Starting Playwright and Chromium takes most of the time of a small
+    export, so the browser is launched on the first export and kept.
+    Every export gets a fresh browser context, so no state leaks from one
+    document into the next. The browser is replaced after max_jobs exports
+    or once its processes grew by more than max_memory_growth_mb (needs
+    psutil), and shut down by close().
+
+    Playwright objects belong to the event loop they were created on, so
+    the engine lives on the converter runtime's loop; export() can be
+    called from any thread but the runtime's and blocks until the PDF is
+    written, export_async() is the coroutine for code already on the loop.
+
+    Usage:
+        engine = PdfExportEngine()
+        success, error = engine.export(html, "out.pdf", {'format': 'A4'})
+        engine.close()
+    """
+
+    def __init__(self, max_jobs: int = 50, max_memory_growth_mb: int = 512):
+        """
+        Args:
+            max_jobs: Exports before the browser is replaced
+            max_memory_growth_mb: Browser memory growth that triggers a replacement
+        """
+        self.max_jobs = max_jobs
+        self.max_memory_growth_mb = max_memory_growth_mb
+
+        self.assets = ExportAssets()
+
+        # Owned by the runtime loop
+        self._launch_lock = None
+        self._playwright = None
+        self._browser = None
+        self._browser_jobs = 0
+        self._baseline_memory_mb = None
+        self._active_jobs = 0
+        self._recycle_pending = False
+
+        self.stats = {"launches": 0, "exports": 0, "recycles": 0}
+
+    @staticmethod
+    def _runtime():
+        from backend.async_runtime import get_runtime
+        return get_runtime()
+
+    # ==================== Browser lifecycle ====================
+
+    @property
+    def is_running(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def _ensure_browser(self):
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+
+        async with self._launch_lock:
+            if self.is_running:
+                return self._browser
+
+            # A browser that crashed or was closed under us is replaced
+            await self._close_browser()
+
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+
+            self._browser = await self._playwright.chromium.launch(**browser_launch_options())
+            self._browser_jobs = 0
+            self._recycle_pending = False
+            self._baseline_memory_mb = await self._browser_memory_mb()
+            self.stats["launches"] += 1
+            logger.info("Export browser launched")
+            return self._browser
+
+    async def _close_browser(self):
+        browser, self._browser = self._browser, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.debug(f"Closing export browser failed: {e}")
+
+    async def _browser_memory_mb(self) -> Optional[float]:
+        """Resident memory of all browser processes, or None without psutil"""
+        try:
+            import psutil
+        except ImportError:
+            return None
+
+        try:
+            session = await self._browser.new_browser_cdp_session()
+            info = await session.send("SystemInfo.getProcessInfo")
+            await session.detach()
+        except Exception as e:
+            logger.debug(f"Browser process info unavailable: {e}")
+            return None
+
+        total = 0
+        for process in info.get("processInfo", []):
+            try:
+                total += psutil.Process(process["id"]).memory_info().rss
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+
+    async def _check_recycle(self):
+        """Replace the browser once it did max_jobs exports or grew too much"""
+        if not self._recycle_pending:
+            if self._browser_jobs >= self.max_jobs:
+                self._recycle_pending = True
+            elif self._baseline_memory_mb is not None:
+                memory_mb = await self._browser_memory_mb()
+                if memory_mb is not None and memory_mb - self._baseline_memory_mb > self.max_memory_growth_mb:
+                    logger.info(f"Export browser grew to {memory_mb:.0f} MB, replacing it")
+                    self._recycle_pending = True
+
+        # Exports still running keep the old browser until they are done
+        if self._recycle_pending and self._active_jobs == 0:
+            await self._close_browser()
+            self._recycle_pending = False
+            self.stats["recycles"] += 1
+
+    async def prewarm(self):
+        """Launch the browser ahead of the first export"""
+        started = time.perf_counter()
+        await self._ensure_browser()
+        logger.info(f"Export browser prewarmed in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    # ==================== Export ====================
+
+    async def _route(self, route, html_content: str):
+        """
+        Serve the export document from memory, local files from disk and
+        remote assets from the local cache
+        """
+        url = route.request.url
+        if url == EXPORT_DOCUMENT_URL:
+            await route.fulfill(status=200, body=html_content, content_type="text/html; charset=utf-8")
+        elif url.startswith(LOCAL_FILES_URL):
+            await self._fulfill_local(route)
+        elif url.startswith(CACHEABLE_ASSET_PREFIXES):
+            await self.assets.fulfill(route)
+        elif url.startswith(EXPORT_ORIGIN + "/"):
+            # Nothing else lives on the export origin; don't let it reach DNS
+            logger.debug(f"Export page requested an unknown URL: {url}")
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _fulfill_local(self, route):
+        """Answer a request under LOCAL_FILES_URL with the file from disk"""
+        path = local_file_path(route.request.url)
+        if path is None or not path.is_file():
+            logger.warning(f"Export page refers to a missing local file: {path}")
+            await route.abort()
+            return
+        await route.fulfill(path=str(path))
+
+    async def _export(self, html_content: str, output_path: str, pdf_options: dict):
+        browser = await self._ensure_browser()
+
+        self._active_jobs += 1
+        try:
+            # Local images may come in as file:// URLs, which the page cannot load
+            html_content = rewrite_file_urls(html_content)
+
+            context = await browser.new_context()
+            try:
+                await context.add_init_script(READY_SCRIPT)
+                await context.route("**/*", lambda route: self._route(route, html_content))
+
+                page = await context.new_page()
+                await page.goto(EXPORT_DOCUMENT_URL, wait_until='load')
+
+                # Print as soon as the page reports fonts, images and layout settled
+                try:
+                    await page.wait_for_function("window.__saekimReady !== false", timeout=READY_TIMEOUT)
+                except Exception as e:
+                    logger.warning(f"Export page not ready after {READY_TIMEOUT} ms, printing anyway: {e}")
+
+                await page.pdf(path=output_path, **pdf_options)
+            finally:
+                await context.close()
+        finally:
+            self._active_jobs -= 1
+            self._browser_jobs += 1
+            self.stats["exports"] += 1
+
+        await self._check_recycle()
+
+    async def export_async(self, html_content: str, output_path: str, pdf_options: dict) -> Tuple[bool, str]:
+        """
+        Print an HTML document to PDF (on the converter runtime loop)
+
+        Args:
+            html_content: Complete HTML document
+            output_path: Path to save PDF
+            pdf_options: Keyword arguments for Playwright's page.pdf()
+
+        Returns:
+            Tuple of (success, error_message)
+        """
+        try:
+            import playwright  # noqa: F401
+        except ImportError:
+            error_msg = (
+                "Playwright is not installed. Please install it:\n"
+                "pip install playwright\n"
+                "playwright install chromium"
+            )
+            logger.error("Playwright not installed")
+            return False, error_msg
+
+        try:
+            await self._export(html_content, output_path, pdf_options)
+            logger.info(f"PDF created successfully with Playwright: {output_path}")
+            return True, ""
+        except Exception as e:
+            error_msg = f"Playwright PDF generation failed: {str(e)}"
+            logger.error(error_msg)
+            return False, error_msg
+
+    def export(self, html_content: str, output_path: str, pdf_options: dict) -> Tuple[bool, str]:
+        """Print an HTML document to PDF, blocking until it is written"""
+        return self._runtime().run(self.export_async(html_content, output_path, pdf_options))
+
+    # ==================== Shutdown ====================
+
+    async def _shutdown(self):
+        await self._close_browser()
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception as e:
+                logger.debug(f"Stopping Playwright failed: {e}")
+            self._playwright = None
+
+    def close(self):
+        """Close the browser and stop Playwright (a later export starts them again)"""
+        if self._playwright is None and self._browser is None:
+            return
+
+        try:
+            self._runtime().run(self._shutdown(), timeout=10)
+        except Exception as e:
+            logger.warning(f"Export engine shutdown failed: {e}")
+        self._launch_lock = None
+        logger.info("Export engine closed")
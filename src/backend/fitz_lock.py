@@ -0,0 +1,15 @@
+"""
+PyMuPDF Lock Module
+Serializes PyMuPDF use across the threads of the app process
+"""
+
+import threading
+
+# MuPDF is not thread-safe and PyMuPDF shares one context - the resource
+# store, the font cache - between all open documents. Every thread that
+# uses fitz (the PDF import, the source viewer's tile renderer, exports
+# that merge, stamp or optimize PDFs) holds this lock while it does, and
+# drops its fitz objects before letting go. Reentrant, so helpers that
+# lock can be called by code that already holds it. Worker processes have
+# their own copy of MuPDF; taking the lock there is harmless.
+FITZ_LOCK = threading.RLock()
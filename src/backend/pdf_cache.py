@@ -0,0 +1,242 @@
+"""
+PDF Page Cache Module
+Persistent cache of extracted PDF pages for re-importing updated documents
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class PdfPageCache:
+    """
+    Content-addressed cache of PageContent under ~/.saekim/cache/pdf/
+
+    A page is keyed by a hash of everything its extraction depends on: the
+    page content stream, the streams of its form and image XObjects, its
+    fonts and geometry, plus the extraction settings. An unchanged page of
+    a new PDF revision therefore hits the cache no matter where it moved
+    to in the document.
+
+    Layout:
+        pages/<key[:2]>/<key>.json   text lines, tables, image references
+        images/<digest>.<ext>        image bytes, shared between pages
+
+    Entries are touched on every hit, and trim() removes the least recently
+    used files until the cache fits its size cap.
+    """
+
+    # Bump whenever page extraction output changes so stale entries are ignored
+    VERSION = 4
+
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_dir()
+        self.max_bytes = max_bytes
+        self.pages_dir = self.cache_dir / "pages"
+        self.images_dir = self.cache_dir / "images"
+
+    @staticmethod
+    def default_dir() -> Path:
+        return Path.home() / ".saekim" / "cache" / "pdf"
+
+    # ==================== Keys ====================
+
+    def page_key(self, page, settings: str = "") -> str:
+        """
+        Hash of a fitz page's content
+
+        Args:
+            page: fitz.Page
+            settings: Extraction settings that change the output for the same page
+        """
+        doc = page.parent
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f"v{self.VERSION}|{settings}|{tuple(page.rect)}|{page.rotation}".encode())
+        h.update(page.read_contents())
+
+        # Text inside form XObjects and the images themselves live in their own streams
+        for xobject in page.get_xobjects():
+            h.update(doc.xref_stream_raw(xobject[0]) or b"")
+        for image in page.get_images():
+            h.update(doc.xref_stream_raw(image[0]) or b"")
+
+        # Font names decide bold/italic/monospace detection
+        for font in page.get_fonts():
+            h.update(repr(font[1:]).encode())
+
+        return h.hexdigest()
+
+    def _page_path(self, key: str) -> Path:
+        return self.pages_dir / key[:2] / f"{key}.json"
+
+    def _image_path(self, digest: str, ext: str) -> Path:
+        return self.images_dir / f"{digest}.{ext}"
+
+    # ==================== Lookup ====================
+
+    def get(self, key: str, page_num: int):
+        """
+        Load a cached page
+
+        Returns:
+            PageContent, or None on a miss (or an unreadable entry)
+        """
+        from backend.pdf_import import PageContent, LineContent, TextBlockContent, ImageBlockContent
+
+        page_path = self._page_path(key)
+        if not page_path.exists():
+            return None
+
+        try:
+            with open(page_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            content = PageContent(page_num=page_num, tables=data["tables"], fonts=data["fonts"])
+            touched = [page_path]
+
+            for block in data["blocks"]:
+                if "lines" in block:
+                    lines = [LineContent(*line) for line in block["lines"]]
+                    content.blocks.append(TextBlockContent(block["edge"], lines, block["key"]))
+                else:
+                    image_path = self._image_path(block["digest"], block["ext"])
+                    with open(image_path, "rb") as f:
+                        image_bytes = f.read()
+                    touched.append(image_path)
+                    content.blocks.append(ImageBlockContent(
+                        block["edge"], block["digest"], image_bytes, block["ext"],
+                        block["width"], block["height"], block["key"]
+                    ))
+
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # Partially evicted or corrupt entry - extract the page again
+            logger.debug(f"PDF page cache entry {key} unusable: {e}")
+            self._remove(page_path)
+            return None
+
+        # Mark as recently used for LRU eviction
+        for path in touched:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+        content.from_cache = True
+        return content
+
+    def put(self, key: str, content):
+        """Store an extracted page"""
+        from backend.pdf_import import TextBlockContent
+
+        try:
+            blocks = []
+            for block in content.blocks:
+                if isinstance(block, TextBlockContent):
+                    blocks.append({"edge": block.edge, "key": block.key,
+                                   "lines": [list(line) for line in block.lines]})
+                    continue
+
+                if not block.data:
+                    continue
+                image_path = self._image_path(block.digest, block.ext)
+                if not image_path.exists():
+                    self._write_atomic(image_path, block.data)
+                blocks.append({
+                    "edge": block.edge, "key": block.key, "digest": block.digest,
+                    "ext": block.ext, "width": block.width, "height": block.height,
+                })
+
+            data = {"blocks": blocks, "tables": content.tables, "fonts": content.fonts}
+            payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            self._write_atomic(self._page_path(key), payload)
+
+        except OSError as e:
+            # A full or read-only disk must not break the import
+            logger.warning(f"Failed to write PDF page cache entry: {e}")
+
+    def _write_atomic(self, path: Path, payload: bytes):
+        """Write via a temp file so readers (other import processes) never see partial files"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(Path(tmp_path))
+            raise
+
+    @staticmethod
+    def _remove(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    # ==================== Maintenance ====================
+
+    def _entries(self):
+        """(path, size, mtime) of all cache files"""
+        entries = []
+        for root in (self.pages_dir, self.images_dir):
+            if not root.exists():
+                continue
+            for dirpath, _dirnames, filenames in os.walk(root):
+                for filename in filenames:
+                    path = Path(dirpath) / filename
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def trim(self) -> int:
+        """
+        Evict least recently used files until the cache fits max_bytes
+
+        Returns:
+            Number of bytes freed
+        """
+        entries = self._entries()
+        total = sum(size for _path, size, _mtime in entries)
+        if total <= self.max_bytes:
+            return 0
+
+        freed = 0
+        for path, size, _mtime in sorted(entries, key=lambda entry: entry[2]):
+            if total - freed <= self.max_bytes:
+                break
+            self._remove(path)
+            freed += size
+
+        logger.info(f"PDF page cache trimmed: {freed / (1024 * 1024):.1f} MB freed")
+        return freed
+
+    def stats(self) -> dict:
+        """Summary of the cache contents"""
+        entries = self._entries()
+        pages = sum(1 for path, _size, _mtime in entries if path.suffix == ".json")
+        return {
+            "path": str(self.cache_dir),
+            "pages": pages,
+            "images": len(entries) - pages,
+            "size_bytes": sum(size for _path, size, _mtime in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self):
+        """Delete all cached pages and images"""
+        for root in (self.pages_dir, self.images_dir):
+            shutil.rmtree(root, ignore_errors=True)
+        logger.info(f"PDF page cache cleared: {self.cache_dir}")
@@ -0,0 +1,205 @@
+"""
+PDF Figures Module
+Finds diagrams drawn as vector paths and rasterizes them for PDF import
+"""
+
+from typing import List, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+Box = Tuple[float, float, float, float]
+
+
+# Paths closer than this (points) belong to the same figure
+FIGURE_GAP = 6.0
+
+# A figure is at least this wide and tall (points) and made of at least
+# this many drawing operations; smaller clusters are rules, underlines,
+# bullets or frames
+MIN_FIGURE_SIZE = 36.0
+MIN_FIGURE_ITEMS = 6
+
+# Paths covering more than this share of the page are backgrounds or page frames
+MAX_PATH_PAGE_SHARE = 0.5
+
+# Clusters mostly covered by text are boxed paragraphs (notes, code listings),
+# clusters mostly covered by a detected table are the table's grid
+MAX_FIGURE_TEXT_SHARE = 0.5
+MAX_FIGURE_TABLE_SHARE = 0.5
+
+# Margin added around a figure so strokes and labels at its border are kept
+FIGURE_PADDING = 4.0
+
+_WHITE = (1.0, 1.0, 1.0)
+
+
+def _overlap(a: Box, b: Box) -> float:
+    """Area of the intersection of two boxes"""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    return width * height if width > 0 and height > 0 else 0.0
+
+
+def _area(box: Box) -> float:
+    return max(box[2] - box[0], 0.0) * max(box[3] - box[1], 0.0)
+
+
+def _touches(a: Box, b: Box, gap: float) -> bool:
+    return (a[0] - gap <= b[2] and b[0] - gap <= a[2] and
+            a[1] - gap <= b[3] and b[1] - gap <= a[3])
+
+
+def _union(a: Box, b: Box) -> Box:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def cluster_boxes(boxes: List[Tuple[Box, int]], gap: float = FIGURE_GAP) -> List[Tuple[Box, int]]:
+    """
+    Group boxes that overlap or lie within gap of each other
+
+    Sweeps the boxes top to bottom and only compares each box with the
+    clusters still open at its top edge, then merges clusters that grew
+    into each other until no two overlap.
+
+    Args:
+        boxes: (box, weight) pairs, box as (x0, y0, x1, y1)
+
+    Returns:
+        (bounding box, summed weight) per cluster
+    """
+    active = []  # [box, weight] of clusters that can still grow downwards
+    closed = []
+
+    for box, weight in sorted(boxes, key=lambda item: item[0][1]):
+        still_open = []
+        for cluster in active:
+            if cluster[0][3] + gap < box[1]:
+                closed.append(cluster)
+            else:
+                still_open.append(cluster)
+        active = still_open
+
+        merged = [box, weight]
+        remaining = []
+        for cluster in active:
+            if _touches(cluster[0], merged[0], gap):
+                merged = [_union(cluster[0], merged[0]), cluster[1] + merged[1]]
+            else:
+                remaining.append(cluster)
+        remaining.append(merged)
+        active = remaining
+
+    clusters = closed + active
+
+    # Clusters that grew sideways can overlap clusters they never met in the sweep
+    changed = True
+    while changed:
+        changed = False
+        result = []
+        for box, weight in clusters:
+            for cluster in result:
+                if _touches(cluster[0], box, gap):
+                    cluster[0] = _union(cluster[0], box)
+                    cluster[1] += weight
+                    changed = True
+                    break
+            else:
+                result.append([box, weight])
+        clusters = result
+
+    return [(tuple(box), weight) for box, weight in clusters]
+
+
+def find_figure_regions(drawings: list, page_rect, text_boxes: List[Box] = (),
+                        table_boxes: List[Box] = ()) -> List[Box]:
+    """
+    Find the regions of a page that hold vector figures
+
+    Args:
+        drawings: Paths of page.get_drawings()
+        page_rect: fitz.Rect of the page
+        text_boxes: Bboxes of the page's text blocks
+        table_boxes: Bboxes of tables already converted to Markdown
+
+    Returns:
+        Figure regions as (x0, y0, x1, y1), top to bottom, not overlapping
+    """
+    page_area = page_rect.width * page_rect.height
+    if not drawings or page_area <= 0:
+        return []
+
+    paths = []
+    for path in drawings:
+        rect = path["rect"]
+        box = (rect.x0, rect.y0, rect.x1, rect.y1)
+        if _area(box) > page_area * MAX_PATH_PAGE_SHARE:
+            continue
+        # White fills without a stroke only erase what is below them
+        if path.get("fill") == _WHITE and not path.get("color"):
+            continue
+        paths.append((box, len(path["items"])))
+
+    regions = []
+    for box, items in cluster_boxes(paths):
+        if items < MIN_FIGURE_ITEMS:
+            continue
+        if box[2] - box[0] < MIN_FIGURE_SIZE or box[3] - box[1] < MIN_FIGURE_SIZE:
+            continue
+
+        area = _area(box)
+        if sum(_overlap(box, text) for text in text_boxes) > area * MAX_FIGURE_TEXT_SHARE:
+            continue
+        if sum(_overlap(box, table) for table in table_boxes) > area * MAX_FIGURE_TABLE_SHARE:
+            continue
+
+        regions.append((max(box[0] - FIGURE_PADDING, page_rect.x0),
+                        max(box[1] - FIGURE_PADDING, page_rect.y0),
+                        min(box[2] + FIGURE_PADDING, page_rect.x1),
+                        min(box[3] + FIGURE_PADDING, page_rect.y1)))
+
+    # Padding can make neighbouring figures overlap again
+    regions = [box for box, _weight in cluster_boxes([(box, 0) for box in regions], gap=0)]
+    return sorted(regions, key=lambda box: (box[1], box[0]))
+
+
+def render_figures(page, regions: List[Box], dpi: int) -> List[Tuple[Box, bytes, int, int]]:
+    """
+    Rasterize the figure regions of a page
+
+    The page content is interpreted once into a display list and every
+    region is rendered from it with a clipped pixmap, so the cost per page
+    is one content pass plus pixels proportional to the figure area.
+
+    Returns:
+        (region, PNG bytes, width, height) per region that could be rendered
+    """
+    import fitz  # PyMuPDF
+
+    if not regions:
+        return []
+
+    try:
+        display_list = page.get_displaylist()
+    except Exception as e:
+        logger.warning(f"Could not render figures of page {page.number + 1}: {e}")
+        return []
+
+    matrix = fitz.Matrix(dpi / 72, dpi / 72)
+
+    figures = []
+    for region in regions:
+        try:
+            pixmap = display_list.get_pixmap(matrix=matrix, clip=fitz.Rect(region), alpha=False)
+            figures.append((region, pixmap.tobytes("png"), pixmap.width, pixmap.height))
+        except Exception as e:
+            logger.warning(f"Could not render figure {region} of page {page.number + 1}: {e}")
+
+    return figures
+
+
+def contains(outer: Box, inner: Box, tolerance: float = 1.0) -> bool:
+    """True if inner lies within outer"""
+    return (inner[0] >= outer[0] - tolerance and inner[1] >= outer[1] - tolerance and
+            inner[2] <= outer[2] + tolerance and inner[3] <= outer[3] + tolerance)
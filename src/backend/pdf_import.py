@@ -0,0 +1,591 @@
+"""
+PDF Import Module
+Shared document handles for PDF → Markdown conversion
+"""
+
+import hashlib
+import re
+import threading
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Union
+
+from backend.fitz_lock import FITZ_LOCK
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class LineContent(NamedTuple):
+    """One text line of a block with its formatting already classified"""
+    text: str
+    font_size: float
+    is_bold: bool
+    is_italic: bool
+    is_code: bool  # Monospace font or code-like content
+
+
+class FontInfo(NamedTuple):
+    """Style flags of a font, derived from its name"""
+    name: str
+    is_monospace: bool
+    is_bold: bool
+    is_italic: bool
+
+
+# Name fragments of monospace/code fonts (compared without spaces, dashes, underscores)
+MONOSPACE_FONT_MARKERS = (
+    # Common code fonts
+    'courier', 'consolas', 'monaco', 'menlo', 'inconsolata',
+    'sourcecode', 'sourcecodepro', 'firacode',
+    'firamono', 'dejavumono', 'liberationmono', 'droidmono',
+    'ubuntumono', 'robotomono', 'jetbrainsmono', 'cascadia', 'hack',
+    'mono', 'fixed', 'terminal', 'andale',
+    # Korean fonts
+    'd2coding', 'nanumgothiccoding', '나눔고딕코딩', 'malgungothiccoding',
+    # PDF embedded fonts often have weird names
+    'cour', 'cmtt', 'cmsy', 'lmtt',  # TeX/LaTeX fonts
+    'nixie', 'ocr', 'typewriter',
+)
+
+
+def is_monospace_font(font_name: str) -> bool:
+    """Check if font is a monospace/code font"""
+    font_key = font_name.lower().replace(' ', '').replace('-', '').replace('_', '')
+    return any(marker in font_key for marker in MONOSPACE_FONT_MARKERS)
+
+
+class FontTable:
+    """
+    Fonts of a document, interned by name
+
+    Style flags are derived from the font name the first time a font is
+    seen, so the span loop only does a dict lookup per span instead of
+    lowercasing and pattern matching every font name again.
+    """
+
+    def __init__(self):
+        self._fonts = {}  # font name -> FontInfo
+
+    def __len__(self) -> int:
+        return len(self._fonts)
+
+    def get(self, font_name: str) -> FontInfo:
+        """FontInfo for a font name, classified on first use"""
+        font = self._fonts.get(font_name)
+        if font is None:
+            name_lower = font_name.lower()
+            font = FontInfo(
+                font_name,
+                is_monospace_font(name_lower),
+                "bold" in name_lower or "black" in name_lower,
+                "italic" in name_lower or "oblique" in name_lower,
+            )
+            self._fonts[font_name] = font
+            logger.debug(f"Font: {font_name} -> monospace={font.is_monospace}, "
+                         f"bold={font.is_bold}, italic={font.is_italic}")
+        return font
+
+
+class CharLine(NamedTuple):
+    """A text line rebuilt from pdfplumber chars"""
+    top: float  # Top of the first glyph of the line
+    text: str
+    fonts: frozenset  # Font names used in the line
+
+
+@dataclass
+class TextBlockContent:
+    """A text block; edge=True if it lies in the header/footer region"""
+    edge: bool
+    lines: List[LineContent]
+    key: str = ""  # running_text_key of edge blocks, for header/footer removal
+
+
+@dataclass
+class ImageBlockContent:
+    """An image block with its encoded image bytes (None if unreadable)"""
+    edge: bool
+    digest: str  # Content hash of data, identical images share it
+    data: Optional[bytes] = None
+    ext: str = "png"
+    width: int = 0
+    height: int = 0
+    key: str = ""  # image_block_key of edge images, for header/footer removal
+
+
+@dataclass
+class PageContent:
+    """
+    State-free extraction result of a single page
+
+    Everything that depends on the previous pages (code blocks continuing
+    across pages, duplicate images, image numbering) is resolved later by
+    the stitching pass, so pages can be extracted in any order or process.
+    """
+    page_num: int
+    blocks: List[Union[TextBlockContent, ImageBlockContent]] = field(default_factory=list)
+    tables: List[str] = field(default_factory=list)
+    fonts: List[str] = field(default_factory=list)  # Only collected for the first page
+    from_cache: bool = False  # Loaded from the persistent page cache
+    table_pass_skipped: bool = False  # No ruling lines, so table detection was not run
+
+
+@dataclass
+class PdfImportOptions:
+    """User-tunable settings of a PDF import"""
+    # Bitmaps whose longest side exceeds this many pixels are downscaled and
+    # re-encoded to image_format; 0 keeps every image as stored in the PDF
+    image_max_dimension: int = 0
+    image_format: str = "jpeg"  # "jpeg", "png" or "webp"
+    image_quality: int = 85  # For lossy formats
+    image_writer_threads: int = 2  # Background threads writing image files
+    # Reuse unchanged pages from the persistent page cache (~/.saekim/cache/pdf)
+    page_cache: bool = False
+    page_cache_max_mb: int = 512
+    # Table detection: "pdfplumber" or "fitz" (PyMuPDF's find_tables)
+    table_engine: str = "pdfplumber"
+    # Skip table detection on pages without horizontal and vertical rules
+    table_precheck: bool = True
+    # Read multi-column pages column by column instead of in PDF stream order
+    column_detection: bool = True
+    # Rasterize diagrams drawn as vector paths into images at figure_dpi
+    vector_figures: bool = True
+    figure_dpi: int = 150
+    # Release parser caches after every page to bound memory on very large
+    # documents, at the cost of re-reading shared resources such as fonts
+    low_memory: bool = False
+
+    def create_page_cache(self):
+        """PdfPageCache for these options, or None if caching is off"""
+        if not self.page_cache:
+            return None
+        from backend.pdf_cache import PdfPageCache
+        return PdfPageCache(max_bytes=self.page_cache_max_mb * 1024 * 1024)
+
+
+def image_digest(data: bytes) -> str:
+    """Content hash used to detect identical images"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@dataclass
+class PdfImportStats:
+    """Counters of a single PDF import"""
+    pages: int = 0
+    cached_pages: int = 0  # Reused from the page cache
+    table_pages_skipped: int = 0  # Extracted pages that skipped table detection
+    tables: int = 0
+    images: int = 0
+    running_blocks: int = 0  # Dropped running headers, footers and page numbers
+
+    def summary(self) -> str:
+        extracted = self.pages - self.cached_pages
+        return (f"{self.pages} pages ({self.cached_pages} cached), table detection skipped on "
+                f"{self.table_pages_skipped}/{extracted} extracted pages, "
+                f"{self.tables} tables, {self.images} images, "
+                f"{self.running_blocks} header/footer blocks removed")
+
+
+# Key functions for sorting pdfplumber char dicts
+_char_top = itemgetter('top')
+_char_x0 = itemgetter('x0')
+_char_text = itemgetter('text')
+
+
+def cluster_char_lines(chars: list, tolerance: float = 3.0) -> List[CharLine]:
+    """
+    Group pdfplumber chars into lines, top to bottom
+
+    The chars are sorted by their top edge once, and a single sweep starts
+    a new line whenever a char lies more than tolerance points below the
+    first char of the current line. This keeps glyphs with slightly
+    different baselines (mixed font sizes, rounding in the PDF) on the
+    same line. Each line is then ordered by x and joined in one go.
+
+    Args:
+        chars: pdfplumber page.chars
+        tolerance: Max vertical distance in points within a line
+                   (the same default as pdfplumber's y_tolerance)
+    """
+    if not chars:
+        return []
+
+    ordered = sorted(chars, key=_char_top)
+    tops = list(map(_char_top, ordered))
+    count = len(ordered)
+
+    lines = []
+    start = 0
+    anchor = tops[0]
+    for pos in range(1, count + 1):
+        if pos < count and tops[pos] - anchor <= tolerance:
+            continue
+
+        members = ordered[start:pos]
+        members.sort(key=_char_x0)
+        lines.append(CharLine(
+            anchor,
+            ''.join(map(_char_text, members)),
+            frozenset([char.get('fontname', '') for char in members]),
+        ))
+
+        if pos < count:
+            start = pos
+            anchor = tops[pos]
+
+    return lines
+
+
+def may_contain_tables(page, tolerance: float = 1.0, drawings: Optional[list] = None) -> bool:
+    """
+    Cheap check whether ruled table detection can find anything on a page
+
+    Both pdfplumber and PyMuPDF find tables from ruling lines, and a single
+    cell needs at least two horizontal and two vertical edges. Counts the
+    horizontal and vertical segments of the page's vector drawings, so a
+    page of plain prose (or one with only underlines) returns False.
+
+    Args:
+        page: fitz.Page
+        tolerance: Max deviation in points for a segment to count as straight
+        drawings: page.get_drawings() if already loaded
+    """
+    if drawings is None:
+        drawings = page.get_drawings()
+
+    horizontal = vertical = 0
+    for path in drawings:
+        for item in path["items"]:
+            op = item[0]
+            if op == "re":
+                horizontal += 2
+                vertical += 2
+            else:
+                if op == "l":
+                    points = [item[1], item[2]]
+                elif op == "c":
+                    points = list(item[1:5])
+                elif op == "qu":
+                    quad = item[1]
+                    points = [quad.ul, quad.ur, quad.lr, quad.ll, quad.ul]
+                else:
+                    continue
+                for a, b in zip(points, points[1:]):
+                    if abs(a.y - b.y) <= tolerance:
+                        horizontal += 1
+                    elif abs(a.x - b.x) <= tolerance:
+                        vertical += 1
+
+            if horizontal >= 2 and vertical >= 2:
+                return True
+
+    return False
+
+
+class PdfImportSession:
+    """
+    Holds the open documents for a single PDF import.
+
+    The PyMuPDF document is opened once up front and the pdfplumber document
+    is opened lazily the first time a stage asks for it, so every extraction
+    stage shares the same parsed document instead of re-opening the file.
+    Call release_page() once a page is finished to drop its cached objects.
+    With low_memory the document-wide parser caches of both libraries are
+    emptied as well, so memory stays flat no matter how long the PDF is.
+    Opening, releasing and closing hold FITZ_LOCK; callers hold it while
+    they work on the pages.
+
+    Usage:
+        with PdfImportSession(pdf_path) as session:
+            for page_idx in range(session.page_count):
+                page = session.page(page_idx)
+                plumber_page = session.plumber_page(page_idx)
+                ...
+                session.release_page(page_idx)
+    """
+
+    def __init__(self, pdf_path, low_memory: bool = False):
+        import fitz  # PyMuPDF - ImportError lets the caller fall back to pdfplumber
+
+        self.pdf_path = Path(pdf_path)
+        with FITZ_LOCK:
+            self.doc = fitz.open(self.pdf_path)
+            self._page_count = len(self.doc)
+        self.low_memory = low_memory
+        self.fonts = FontTable()
+
+        self._plumber_pdf = None
+        self._plumber_unavailable = False
+        self._pages = {}  # page_idx -> fitz.Page
+        self._plumber_pages = {}  # page_idx -> pdfplumber.page.Page
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages in the document"""
+        return self._page_count
+
+    def page(self, page_idx: int):
+        """Get the PyMuPDF page (loaded once per page)"""
+        page = self._pages.get(page_idx)
+        if page is None:
+            page = self.doc.load_page(page_idx)
+            self._pages[page_idx] = page
+        return page
+
+    def plumber_page(self, page_idx: int):
+        """
+        Get the pdfplumber page for the same page index
+
+        Returns:
+            pdfplumber Page, or None if pdfplumber is unavailable
+        """
+        page = self._plumber_pages.get(page_idx)
+        if page is not None:
+            return page
+
+        pdf = self._open_plumber()
+        if pdf is None or page_idx >= len(pdf.pages):
+            return None
+
+        page = pdf.pages[page_idx]
+        self._plumber_pages[page_idx] = page
+        return page
+
+    def release_page(self, page_idx: int):
+        """Drop the handles and per-page caches of a finished page"""
+        with FITZ_LOCK:
+            self._pages.pop(page_idx, None)
+
+        plumber_page = self._plumber_pages.pop(page_idx, None)
+        if plumber_page is not None:
+            try:
+                # Frees the cached chars/objects/layout of the page
+                plumber_page.close()
+            except Exception as e:
+                logger.debug(f"Failed to release pdfplumber page {page_idx}: {e}")
+
+        if self.low_memory:
+            self._release_document_caches()
+
+    def _release_document_caches(self):
+        """Empty the parser caches that otherwise grow with every page read"""
+        import fitz
+
+        # MuPDF keeps decoded fonts, images and content streams in a store shared
+        # by every open document, the PDF viewer's included
+        with FITZ_LOCK:
+            fitz.TOOLS.store_shrink(100)
+
+        # pdfminer caches every resolved object of the document
+        if self._plumber_pdf is not None:
+            document = getattr(self._plumber_pdf, "doc", None)
+            for cache_name in ("_cached_objs", "_parsed_objs"):
+                cache = getattr(document, cache_name, None)
+                if isinstance(cache, dict):
+                    cache.clear()
+
+    def close(self):
+        """Close both documents"""
+        for page_idx in list(self._plumber_pages):
+            self.release_page(page_idx)
+        with FITZ_LOCK:
+            self._pages.clear()
+
+        if self._plumber_pdf is not None:
+            try:
+                self._plumber_pdf.close()
+            except Exception:
+                pass
+            self._plumber_pdf = None
+
+        if self.doc is not None:
+            with FITZ_LOCK:
+                self.doc.close()
+                self.doc = None
+
+    def _open_plumber(self) -> Optional[object]:
+        """Open the pdfplumber document on first use"""
+        if self._plumber_pdf is not None:
+            return self._plumber_pdf
+        if self._plumber_unavailable:
+            return None
+
+        try:
+            import pdfplumber
+            self._plumber_pdf = pdfplumber.open(self.pdf_path)
+        except ImportError:
+            self._plumber_unavailable = True
+            return None
+        except Exception as e:
+            logger.warning(f"pdfplumber could not open {self.pdf_path}: {e}")
+            self._plumber_unavailable = True
+            return None
+
+        return self._plumber_pdf
+
+
+class MarkdownStreamWriter:
+    """
+    Streaming equivalent of '\\n'.join(pieces) followed by collapsing 3+
+    newlines and stripping the result.
+
+    Trailing whitespace is held back until more text arrives, so a run of
+    newlines split across pieces is still collapsed and the end of the
+    document is never padded. Concatenating every returned chunk gives
+    exactly the same text as the one-shot conversion; whitespace still held
+    back when the document ends is simply dropped.
+    """
+
+    _NEWLINE_RUN = re.compile(r'\n{3,}')
+
+    def __init__(self):
+        self._tail = ""        # Held back trailing whitespace
+        self._started = False  # Anything emitted yet (leading whitespace is dropped)
+        self._first_piece = True
+
+    def feed(self, pieces) -> str:
+        """Add markdown pieces and return the text that is final so far"""
+        if not pieces:
+            return ""
+
+        joined = '\n'.join(pieces)
+        if self._first_piece:
+            self._first_piece = False
+        else:
+            joined = '\n' + joined
+
+        text = self._tail + joined
+        body = text.rstrip()
+        self._tail = text[len(body):]
+
+        if not body:
+            return ""
+        if not self._started:
+            body = body.lstrip()
+            self._started = True
+
+        return self._NEWLINE_RUN.sub('\n\n', body)
+
+
+class ImageWriter:
+    """
+    Writes extracted images to disk on a small background thread pool.
+
+    The page loop only decides the file name and queues the bytes; file
+    I/O happens on the pool. Images above image_max_dimension are
+    re-encoded in save() itself, because the file name - already in the
+    Markdown once save() returns - must match the bytes written, and only
+    a finished re-encode tells whether they are the new format or the
+    original. At most a few writes per thread are queued at a time so a
+    burst of large images can't pile up in memory. close() waits for all
+    pending writes.
+    """
+
+    _PIL_FORMATS = {"jpeg": "JPEG", "png": "PNG", "webp": "WEBP"}
+    _EXTENSIONS = {"jpeg": "jpg", "png": "png", "webp": "webp"}
+
+    def __init__(self, images_dir: Path, options: Optional[PdfImportOptions] = None):
+        self.images_dir = Path(images_dir)
+        self.options = options or PdfImportOptions()
+
+        threads = max(1, self.options.image_writer_threads)
+        self._slots = threading.BoundedSemaphore(threads * 4)
+        self._executor = None
+        self._threads = threads
+        self._failed = 0
+        self._lock = threading.Lock()
+
+    def _needs_reencode(self, width: int, height: int) -> bool:
+        max_dimension = self.options.image_max_dimension
+        return max_dimension > 0 and max(width, height) > max_dimension
+
+    def save(self, data: bytes, ext: str, width: int, height: int, stem: str) -> str:
+        """
+        Queue an image for writing
+
+        Args:
+            data: Encoded image bytes
+            ext: Extension of data
+            width, height: Pixel size, used to decide on re-encoding
+            stem: File name without extension
+
+        Returns:
+            File name the image will be written to
+        """
+        if self._needs_reencode(width, height):
+            try:
+                data = self._reencode(data)
+                ext = self._EXTENSIONS.get(self.options.image_format, "jpg")
+            except Exception as e:
+                # Unsupported by Pillow (or Pillow missing) - keep the original and its extension
+                logger.warning(f"Could not re-encode {stem}.{ext}, keeping original: {e}")
+        filename = f"{stem}.{ext}"
+
+        if self._executor is None:
+            self.images_dir.mkdir(parents=True, exist_ok=True)
+            self._executor = ThreadPoolExecutor(max_workers=self._threads,
+                                                thread_name_prefix="pdf-image-writer")
+
+        # Blocks only if the writers are far behind
+        self._slots.acquire()
+        try:
+            self._executor.submit(self._write, data, self.images_dir / filename)
+        except Exception:
+            self._slots.release()
+            raise
+
+        return filename
+
+    def _write(self, data: bytes, image_path: Path):
+        try:
+            with open(image_path, "wb") as f:
+                f.write(data)
+
+            logger.info(f"Extracted image: {image_path}")
+
+        except Exception as e:
+            with self._lock:
+                self._failed += 1
+            logger.warning(f"Failed to save image {image_path}: {e}")
+
+        finally:
+            self._slots.release()
+
+    def _reencode(self, data: bytes) -> bytes:
+        """Downscale to image_max_dimension and encode as image_format"""
+        import io
+        from PIL import Image  # Installed with pdfplumber
+
+        max_dimension = self.options.image_max_dimension
+        pil_format = self._PIL_FORMATS.get(self.options.image_format, "JPEG")
+
+        with Image.open(io.BytesIO(data)) as image:
+            image.thumbnail((max_dimension, max_dimension))
+
+            if pil_format == "JPEG" and image.mode not in ("RGB", "L"):
+                # JPEG has no alpha channel; flatten onto white
+                rgba = image.convert("RGBA")
+                image = Image.new("RGB", rgba.size, "white")
+                image.paste(rgba, mask=rgba.getchannel("A"))
+
+            output = io.BytesIO()
+            image.save(output, pil_format, quality=self.options.image_quality)
+            return output.getvalue()
+
+    def close(self):
+        """Wait for all queued images to be written"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            if self._failed:
+                logger.warning(f"{self._failed} images could not be saved")
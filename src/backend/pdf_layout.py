@@ -0,0 +1,346 @@
+"""
+PDF Layout Module
+Column detection, reading order and running header/footer detection for PDF import
+"""
+
+import hashlib
+import math
+import re
+from bisect import bisect_right
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+# A gap between columns must be at least this wide (points)
+MIN_GUTTER_WIDTH = 8.0
+
+# Blocks wider than this share of the page span several columns
+# and don't take part in column detection
+MAX_COLUMN_BLOCK_SHARE = 0.55
+
+# Every column must be at least this wide and tall (shares of the page
+# width and of the height covered by text), otherwise it is a side note,
+# a label column or a stray page element rather than a column of text
+MIN_COLUMN_WIDTH_SHARE = 0.2
+MIN_COLUMN_HEIGHT_SHARE = 0.3
+
+
+def find_gutters(boxes: List[Tuple[float, float, float, float]],
+                 page_x0: float, page_x1: float) -> List[Tuple[float, float]]:
+    """
+    Find the vertical gaps that separate text columns
+
+    The x-extents of all narrow blocks are added to a 1pt coverage grid
+    across the page; runs of empty cells between the leftmost and the
+    rightmost block are gutter candidates. Candidates whose columns are
+    too narrow or too short are dropped again. Linear in the number of
+    blocks plus the page width.
+
+    Args:
+        boxes: Block bboxes as (x0, y0, x1, y1)
+        page_x0, page_x1: Horizontal extent of the page
+
+    Returns:
+        Gutters as (x0, x1), left to right; empty for single-column pages
+    """
+    page_width = page_x1 - page_x0
+    if page_width <= 0:
+        return []
+
+    narrow = [box for box in boxes if box[2] - box[0] < page_width * MAX_COLUMN_BLOCK_SHARE]
+    if len(narrow) < 2:
+        return []
+
+    # Difference array over 1pt cells, prefix-summed into coverage counts
+    cells = int(page_width) + 2
+    coverage = [0] * (cells + 1)
+    for x0, _y0, x1, _y1 in narrow:
+        start = min(max(int(x0 - page_x0), 0), cells)
+        end = min(max(int(x1 - page_x0) + 1, start), cells)
+        coverage[start] += 1
+        coverage[end] -= 1
+
+    # Only gaps between the leftmost and the rightmost block count
+    first = max(min(int(box[0] - page_x0) for box in narrow), 0)
+    last = min(max(int(box[2] - page_x0) + 1 for box in narrow), cells)
+
+    gutters = []
+    covered = 0
+    gap_start = None
+    for cell in range(last):
+        covered += coverage[cell]
+        if cell < first:
+            continue
+        if covered <= 0:
+            if gap_start is None:
+                gap_start = cell
+        elif gap_start is not None:
+            if cell - gap_start >= MIN_GUTTER_WIDTH:
+                gutters.append((page_x0 + gap_start, page_x0 + cell))
+            gap_start = None
+
+    return _validate_gutters(gutters, narrow, page_width)
+
+
+def _validate_gutters(gutters, boxes, page_width) -> list:
+    """Drop gutters until every column they form is a real column of text"""
+    if not gutters:
+        return gutters
+
+    top = min(box[1] for box in boxes)
+    bottom = max(box[3] for box in boxes)
+    min_height = (bottom - top) * MIN_COLUMN_HEIGHT_SHARE
+    min_width = page_width * MIN_COLUMN_WIDTH_SHARE
+
+    while gutters:
+        columns = _column_extents(gutters, boxes)
+        weak = next((idx for idx, (x0, y0, x1, y1) in enumerate(columns)
+                     if x1 - x0 < min_width or y1 - y0 < min_height), None)
+        if weak is None:
+            return gutters
+
+        # Merge the weak column into its neighbour across the narrower gutter
+        neighbours = [idx for idx in (weak - 1, weak) if 0 <= idx < len(gutters)]
+        merge = min(neighbours, key=lambda idx: gutters[idx][1] - gutters[idx][0])
+        gutters = gutters[:merge] + gutters[merge + 1:]
+
+    return gutters
+
+
+def _column_extents(gutters, boxes) -> list:
+    """Bounding box of the blocks in each column between the gutters"""
+    starts = [gutter[0] for gutter in gutters]
+    extents = [None] * (len(gutters) + 1)
+    for box in boxes:
+        column = bisect_right(starts, (box[0] + box[2]) / 2)
+        extent = extents[column]
+        if extent is None:
+            extents[column] = list(box)
+        else:
+            extent[0] = min(extent[0], box[0])
+            extent[1] = min(extent[1], box[1])
+            extent[2] = max(extent[2], box[2])
+            extent[3] = max(extent[3], box[3])
+    return [extent or (0, 0, 0, 0) for extent in extents]
+
+
+def order_blocks(blocks: list, page_rect) -> list:
+    """
+    Put the blocks of a page into reading order
+
+    Single-column pages are returned unchanged. On multi-column pages,
+    blocks that span a gutter (titles, wide figures, centered page
+    numbers) split the page into horizontal bands; inside each band the
+    blocks are read column by column, each column top to bottom.
+
+    Args:
+        blocks: Blocks of page.get_text("dict"), each with a "bbox"
+        page_rect: fitz.Rect of the page
+
+    Returns:
+        The same blocks, reordered
+    """
+    if len(blocks) < 2:
+        return blocks
+
+    boxes = [tuple(block["bbox"]) for block in blocks]
+    gutters = find_gutters(boxes, page_rect.x0, page_rect.x1)
+    if not gutters:
+        return blocks
+
+    starts = [gutter[0] for gutter in gutters]
+    ends = [gutter[1] for gutter in gutters]
+
+    def column_of(box) -> int:
+        """Column index, or -1 if the block reaches into a gutter"""
+        column = bisect_right(starts, box[0])
+        if column < len(gutters) and box[2] > starts[column]:
+            return -1
+        if column > 0 and box[0] < ends[column - 1]:
+            return -1
+        return column
+
+    ordered = []
+    band = []
+    for idx in sorted(range(len(blocks)), key=lambda i: boxes[i][1]):
+        column = column_of(boxes[idx])
+        if column < 0:
+            ordered.extend(blocks[i] for _col, _y, i in sorted(band))
+            band = []
+            ordered.append(blocks[idx])
+        else:
+            band.append((column, boxes[idx][1], idx))
+    ordered.extend(blocks[i] for _col, _y, i in sorted(band))
+
+    return ordered
+
+
+# ==================== Running headers and footers ====================
+
+# Running headers and footers are looked for in this share of the page
+# height at the top and at the bottom of every page
+EDGE_REGION_SHARE = 0.12
+
+# An edge text must repeat on at least this share of the pages to count as
+# a running header or footer. Below one half, so that books alternating
+# left and right page headers are covered as well.
+RUNNING_TEXT_SHARE = 0.4
+
+# Pages the running text index looks at. Longer documents are sampled at
+# evenly spaced pairs of facing pages; a text on RUNNING_TEXT_SHARE of all
+# pages shows up on about that share of the sample as well, and the first
+# page is not held back by a pass over the whole book.
+RUNNING_TEXT_SAMPLE_PAGES = 48
+
+# Key of edge texts that are nothing but a page number
+PAGE_NUMBER_KEY = "#"
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_PAGE_NUMBER_RE = re.compile(
+    r'^(?:-?\s*\d+\s*-?'     # Just number: "1", "- 1 -", "-1-"
+    r'|page\s*\d+'           # "Page 1"
+    r'|\d+\s*/\s*\d+'        # "1 / 10"
+    r'|p\.?\s*\d+'           # "p.1", "p 1"
+    r'|\d+\s*페이지'          # Korean: "1 페이지"
+    r'|제?\s*\d+\s*쪽)$',      # Korean: "제 1 쪽"
+    re.IGNORECASE
+)
+_TRAILING_NUMBER_RE = re.compile(r'\s*-?\s*\d+\s*-?\s*$')
+_LEADING_NUMBER_RE = re.compile(r'^\s*-?\s*\d+\s*-?\s*')
+_PAGE_LABEL_RE = re.compile(r'\s*page\s*\d+\s*', re.IGNORECASE)
+_PAGE_OF_RE = re.compile(r'\s*\d+\s*/\s*\d+\s*')
+_DATE_RE = re.compile(
+    r'\d{4}[-/.]\d{1,2}[-/.]\d{1,2}'    # 2024-01-01
+    r'|\d{1,2}[-/.]\d{1,2}[-/.]\d{4}'   # 01-01-2024
+    r'|\d{4}년\s*\d{1,2}월\s*\d{1,2}일'  # Korean date
+)
+
+
+def is_page_number(text: str) -> bool:
+    """Check if a text is just a page number"""
+    return _PAGE_NUMBER_RE.match(text.strip()) is not None
+
+
+def normalize_running_text(text: str) -> str:
+    """
+    Normalize text for comparison across pages, removing page numbers and dates.
+    Returns an empty string if the text is just a page number.
+    """
+    text = _WHITESPACE_RE.sub(' ', text).strip()
+    if _PAGE_NUMBER_RE.match(text):
+        return ""
+
+    text = _TRAILING_NUMBER_RE.sub('', text)
+    text = _LEADING_NUMBER_RE.sub('', text)
+    text = _PAGE_LABEL_RE.sub(' ', text)
+    text = _PAGE_OF_RE.sub(' ', text)
+    text = _DATE_RE.sub('', text)
+
+    return text.strip()
+
+
+def running_text_key(text: str) -> str:
+    """
+    Short hash identifying an edge text across pages
+
+    Texts that only differ in their page number or date share a key.
+    Page numbers themselves get PAGE_NUMBER_KEY.
+    """
+    text = _WHITESPACE_RE.sub(' ', text).strip()
+    if _PAGE_NUMBER_RE.match(text):
+        return PAGE_NUMBER_KEY
+    normalized = normalize_running_text(text) or text
+    return hashlib.blake2b(normalized.lower().encode("utf-8"), digest_size=8).hexdigest()
+
+
+def image_block_key(bbox) -> str:
+    """Key of an edge image; logos repeat at the same position on every page"""
+    return "img:" + ",".join(str(round(value)) for value in bbox)
+
+
+def in_edge_region(bbox, page_rect) -> bool:
+    """True if a block lies entirely within the top or bottom edge region of the page"""
+    margin = page_rect.height * EDGE_REGION_SHARE
+    return bbox[3] <= page_rect.y0 + margin or bbox[1] >= page_rect.y1 - margin
+
+
+class RunningTextIndex:
+    """
+    Frequency index of the texts in the edge regions of a document
+
+    The first pass adds the edge text keys of a sample of pages; the second
+    pass asks is_running() for each edge block and drops the ones that
+    repeat on most pages. Edge content that does not repeat (a title on a cover
+    page, a footnote that runs low) is kept. Images are keyed by position.
+
+    Usage:
+        index = RunningTextIndex.build(doc)
+        if index.is_running(running_text_key(text)):
+            ...
+    """
+
+    def __init__(self, page_count: int):
+        self.page_count = page_count
+        self.counts = Counter()  # key -> number of pages it appears on
+
+    @classmethod
+    def build(cls, doc, max_pages: Optional[int] = RUNNING_TEXT_SAMPLE_PAGES) -> "RunningTextIndex":
+        """
+        Index the edge texts of a fitz document
+
+        Uses the plain "blocks" text output, which is much cheaper than the
+        full span extraction of the conversion itself. Documents longer than
+        max_pages are indexed from max_pages / 2 evenly spaced pairs of
+        facing pages, so the first pass costs the same for a 50 and a 1000
+        page book. Pairs rather than single pages, so that headers printed
+        only on left or only on right pages are sampled at their share
+        whatever the page count.
+
+        Args:
+            doc: Open fitz document
+            max_pages: Pages to index at most, None for all pages
+        """
+        import fitz  # PyMuPDF
+
+        page_count = len(doc)
+        if max_pages is None or page_count <= max_pages:
+            page_numbers = range(page_count)
+        else:
+            pairs = max(max_pages // 2, 1)
+            step = (page_count - 2) / max(pairs - 1, 1)
+            page_numbers = sorted({round(idx * step) + offset
+                                   for idx in range(pairs) for offset in (0, 1)})
+
+        flags = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_PRESERVE_IMAGES
+        index = cls(len(page_numbers))
+        for page_num in page_numbers:
+            page = doc[page_num]
+            rect = page.rect
+            index.add_page(
+                running_text_key(text) if block_type == 0 else image_block_key(bbox)
+                for *bbox, text, _no, block_type in page.get_text("blocks", flags=flags)
+                if in_edge_region(bbox, rect)
+            )
+        return index
+
+    @property
+    def min_pages(self) -> int:
+        """Pages a text must appear on to be a running header or footer"""
+        return max(2, math.ceil(self.page_count * RUNNING_TEXT_SHARE))
+
+    def add_page(self, keys: Iterable[str]):
+        """Count the edge text keys of one page (repeats on a page count once)"""
+        self.counts.update(set(keys))
+
+    def is_running(self, key: str) -> bool:
+        """True for page numbers and for texts repeated on most pages"""
+        return key == PAGE_NUMBER_KEY or self.counts[key] >= self.min_pages
+
+    def running_keys(self) -> set:
+        """Keys of all running headers and footers"""
+        min_pages = self.min_pages
+        return {key for key, count in self.counts.items() if count >= min_pages}
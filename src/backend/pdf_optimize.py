@@ -0,0 +1,155 @@
+"""
+PDF Optimize Module
+Shrinks exported PDFs with PyMuPDF after they are written
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from backend.fitz_lock import FITZ_LOCK
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+@dataclass
+class PdfOptimizeResult:
+    """Outcome of optimize_pdf()"""
+    size_before: int
+    size_after: int
+    images: int = 0
+    duplicate_images: int = 0  # Image streams identical to an earlier one, stored once now
+    recompressed: bool = False  # Images were re-encoded lossy
+    linearized: bool = False
+    elapsed_ms: float = 0.0
+
+    @property
+    def saved_percent(self) -> float:
+        if not self.size_before:
+            return 0.0
+        return (self.size_before - self.size_after) / self.size_before * 100
+
+    def summary(self) -> str:
+        return (f"{self.size_before / (1024 * 1024):.2f} MB → {self.size_after / (1024 * 1024):.2f} MB "
+                f"(-{self.saved_percent:.0f}%)")
+
+    def to_dict(self) -> dict:
+        return {
+            "size_before": self.size_before,
+            "size_after": self.size_after,
+            "images": self.images,
+            "duplicate_images": self.duplicate_images,
+            "recompressed": self.recompressed,
+            "linearized": self.linearized,
+            "saved_percent": round(self.saved_percent, 1),
+            "summary": self.summary(),
+        }
+
+
+def _count_duplicate_images(doc):
+    """(image streams, streams whose bytes equal an earlier one)"""
+    seen = set()
+    images = duplicates = 0
+    xrefs = {image[0] for page in doc for image in page.get_images(full=True)}
+    for xref in sorted(xrefs):
+        images += 1
+        digest = hashlib.blake2b(doc.xref_stream_raw(xref) or b"", digest_size=16).digest()
+        if digest in seen:
+            duplicates += 1
+        seen.add(digest)
+    return images, duplicates
+
+
+def optimize_pdf(pdf_path, image_quality: int = 0, image_dpi: int = 150,
+                 linearize: bool = True) -> PdfOptimizeResult:
+    """
+    Rewrite a PDF in place as small as PyMuPDF can make it
+
+    Unused objects are dropped and identical objects - the same diagram PNG
+    embedded on several pages - are stored once (garbage=4). Streams,
+    images and fonts are deflated and small objects go into object streams.
+    With image_quality > 0 images above image_dpi are also re-encoded as
+    JPEG of that quality, which is lossy and therefore off by default.
+
+    The file is linearized for fast first-page display where the installed
+    MuPDF still supports it (dropped in MuPDF 1.26). The original is only
+    replaced if the result is smaller.
+
+    Args:
+        pdf_path: PDF to optimize
+        image_quality: JPEG quality for re-encoding images (1-100), 0 keeps them lossless
+        image_dpi: Resolution images are reduced to when re-encoding
+        linearize: Try to linearize the output
+
+    Returns:
+        PdfOptimizeResult with the sizes before and after
+    """
+    import fitz  # PyMuPDF
+
+    started = time.perf_counter()
+    pdf_path = Path(pdf_path)
+    size_before = pdf_path.stat().st_size
+
+    fd, tmp_path = tempfile.mkstemp(dir=pdf_path.parent, prefix=".optimize-", suffix=".pdf")
+    os.close(fd)
+    tmp_path = Path(tmp_path)
+
+    try:
+        with FITZ_LOCK, fitz.open(pdf_path) as doc:
+            images, duplicates = _count_duplicate_images(doc)
+
+            recompressed = False
+            if image_quality > 0 and images:
+                doc.rewrite_images(dpi_threshold=image_dpi + 1, dpi_target=image_dpi,
+                                   quality=image_quality, lossless=True, lossy=True)
+                recompressed = True
+
+            save_options = dict(garbage=4, deflate=True, deflate_images=True, deflate_fonts=True)
+            linearized = False
+            if linearize:
+                try:
+                    doc.save(tmp_path, linear=True, **save_options)
+                    linearized = True
+                except Exception as e:
+                    logger.debug(f"PDF linearization unavailable: {e}")
+            if not linearized:
+                # Object streams cannot be combined with linearization
+                doc.save(tmp_path, use_objstms=True, **save_options)
+
+        size_after = tmp_path.stat().st_size
+        if size_after < size_before:
+            os.replace(tmp_path, pdf_path)
+        else:
+            size_after = size_before
+            linearized = recompressed = False
+    finally:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+    result = PdfOptimizeResult(
+        size_before=size_before, size_after=size_after, images=images,
+        duplicate_images=duplicates, recompressed=recompressed, linearized=linearized,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+    logger.info(f"PDF optimized in {result.elapsed_ms:.0f} ms: {result.summary()}, "
+                f"{duplicates}/{images} duplicate images: {pdf_path}")
+    return result
+
+
+def submit_optimize(pdf_path, **options):
+    """
+    Optimize a PDF on the converter runtime
+
+    Returns:
+        concurrent.futures.Future of the PdfOptimizeResult
+    """
+    import asyncio
+    from backend.async_runtime import get_runtime
+
+    return get_runtime().submit(asyncio.to_thread(optimize_pdf, pdf_path, **options))
@@ -0,0 +1,309 @@
+"""
+PDF Source Module
+Tile rendering, tile cache and page markers for the PDF source viewer
+"""
+
+import math
+import shutil
+import struct
+import tempfile
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+from backend.fitz_lock import FITZ_LOCK
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+# Pages are rendered in horizontal strips of this many device pixels
+TILE_HEIGHT = 256
+
+# Zoom factors are rounded to 1/ZOOM_STEPS so small resizes reuse tiles
+ZOOM_STEPS = 20
+
+# (page index, zoom in 1/ZOOM_STEPS, tile row)
+TileKey = Tuple[int, int, int]
+
+
+class Tile(NamedTuple):
+    """A rendered strip of a page as raw RGB samples"""
+    width: int
+    height: int
+    stride: int
+    samples: bytes
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.samples)
+
+
+def zoom_step(zoom: float) -> int:
+    """Zoom factor rounded to the tile cache's zoom grid"""
+    return max(1, round(zoom * ZOOM_STEPS))
+
+
+def tile_rows(page_height: float, step: int) -> int:
+    """Number of tile rows of a page (height in points) at a zoom step"""
+    return max(1, math.ceil(page_height * step / ZOOM_STEPS / TILE_HEIGHT))
+
+
+class TileCache:
+    """
+    LRU cache of rendered tiles, bounded by size
+
+    Tiles evicted from memory can be spilled to a temporary directory
+    (itself bounded) and are read back from there instead of being
+    rendered again. Not thread-safe; owned by the viewer's GUI thread.
+
+    Usage:
+        cache = TileCache(max_bytes=128 * 1024 * 1024, spill=True)
+        tile = cache.get(key)
+        if tile is None:
+            cache.put(key, renderer.render(key))
+    """
+
+    _HEADER = struct.Struct("<III")  # width, height, stride
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024, spill: bool = False,
+                 spill_max_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Memory budget for tile samples
+            spill: Write evicted tiles to a temporary directory
+            spill_max_bytes: Disk budget for spilled tiles
+        """
+        self.max_bytes = max_bytes
+        self.spill_max_bytes = spill_max_bytes
+        self._tiles = OrderedDict()  # key -> Tile, least recently used first
+        self._bytes = 0
+        self._spill_dir = Path(tempfile.mkdtemp(prefix="saekim-tiles-")) if spill else None
+        self._spilled = OrderedDict()  # key -> file size
+        self._spill_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def __contains__(self, key) -> bool:
+        return key in self._tiles or key in self._spilled
+
+    def get(self, key: TileKey) -> Optional[Tile]:
+        """Cached tile, or None if it must be rendered"""
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            return tile
+
+        if key in self._spilled:
+            tile = self._read_spilled(key)
+            if tile is not None:
+                self.put(key, tile)
+            return tile
+
+        return None
+
+    def put(self, key: TileKey, tile: Tile):
+        """Store a tile, evicting the least recently used ones over budget"""
+        old = self._tiles.pop(key, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+        self._tiles[key] = tile
+        self._bytes += tile.nbytes
+
+        while self._bytes > self.max_bytes and len(self._tiles) > 1:
+            old_key, old_tile = self._tiles.popitem(last=False)
+            self._bytes -= old_tile.nbytes
+            if self._spill_dir is not None:
+                self._spill(old_key, old_tile)
+
+    def discard_zoom(self, keep_step: int):
+        """Drop in-memory tiles rendered at other zoom steps (after a resize)"""
+        for key in [key for key in self._tiles if key[1] != keep_step]:
+            self._bytes -= self._tiles.pop(key).nbytes
+
+    def clear(self):
+        """Drop all tiles, including spilled ones"""
+        self._tiles.clear()
+        self._bytes = 0
+        self._spilled.clear()
+        self._spill_bytes = 0
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+
+    def close(self):
+        """Drop all tiles and remove the spill directory"""
+        self.clear()
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    def stats(self) -> dict:
+        return {
+            "tiles": len(self._tiles),
+            "bytes": self._bytes,
+            "spilled_tiles": len(self._spilled),
+            "spilled_bytes": self._spill_bytes,
+        }
+
+    # ==================== Disk spill ====================
+
+    def _spill_path(self, key: TileKey) -> Path:
+        return self._spill_dir / ("%d_%d_%d.tile" % key)
+
+    def _spill(self, key: TileKey, tile: Tile):
+        if key in self._spilled:
+            self._spilled.move_to_end(key)
+            return
+
+        try:
+            with open(self._spill_path(key), "wb") as f:
+                f.write(self._HEADER.pack(tile.width, tile.height, tile.stride))
+                f.write(tile.samples)
+        except OSError as e:
+            logger.debug(f"Tile spill failed, dropping tile {key}: {e}")
+            return
+
+        size = self._HEADER.size + tile.nbytes
+        self._spilled[key] = size
+        self._spill_bytes += size
+
+        while self._spill_bytes > self.spill_max_bytes and self._spilled:
+            old_key, old_size = self._spilled.popitem(last=False)
+            self._spill_bytes -= old_size
+            self._spill_path(old_key).unlink(missing_ok=True)
+
+    def _read_spilled(self, key: TileKey) -> Optional[Tile]:
+        path = self._spill_path(key)
+        self._spill_bytes -= self._spilled.pop(key)
+        try:
+            data = path.read_bytes()
+            path.unlink(missing_ok=True)
+            width, height, stride = self._HEADER.unpack_from(data)
+            return Tile(width, height, stride, data[self._HEADER.size:])
+        except (OSError, struct.error) as e:
+            logger.debug(f"Spilled tile {key} unreadable: {e}")
+            return None
+
+
+class TileRenderer:
+    """
+    Renders tiles of one PDF with PyMuPDF
+
+    Each page is interpreted once into a display list (a few are kept) and
+    its tiles are rendered from that list with clipped pixmaps. Not
+    thread-safe: create, use and close it on the same thread. Each call
+    holds FITZ_LOCK, so tiles render between the pages of an import.
+    """
+
+    def __init__(self, pdf_path, display_lists: int = 4):
+        import fitz  # PyMuPDF
+
+        with FITZ_LOCK:
+            self.doc = fitz.open(pdf_path)
+        self._display_lists = OrderedDict()  # page index -> fitz.DisplayList
+        self._max_display_lists = display_lists
+
+    def _display_list(self, page_idx: int):
+        display_list = self._display_lists.get(page_idx)
+        if display_list is None:
+            display_list = self.doc.load_page(page_idx).get_displaylist()
+            self._display_lists[page_idx] = display_list
+            if len(self._display_lists) > self._max_display_lists:
+                self._display_lists.popitem(last=False)
+        else:
+            self._display_lists.move_to_end(page_idx)
+        return display_list
+
+    def render(self, key: TileKey) -> Tile:
+        """Render one tile"""
+        import fitz  # PyMuPDF
+
+        page_idx, step, row = key
+        zoom = step / ZOOM_STEPS
+
+        with FITZ_LOCK:
+            display_list = self._display_list(page_idx)
+            rect = display_list.rect
+
+            # Tile rows are fixed in device pixels; the clip is in page points
+            top = rect.y0 + row * TILE_HEIGHT / zoom
+            bottom = min(top + TILE_HEIGHT / zoom, rect.y1)
+            clip = fitz.Rect(rect.x0, top, rect.x1, bottom)
+
+            pixmap = display_list.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip, alpha=False)
+            tile = Tile(pixmap.width, pixmap.height, pixmap.stride, pixmap.samples)
+            del pixmap, display_list
+        return tile
+
+    def close(self):
+        with FITZ_LOCK:
+            self._display_lists.clear()
+            self.doc.close()
+
+
+def page_sizes(pdf_path) -> List[Tuple[float, float]]:
+    """(width, height) in points of every page"""
+    import fitz  # PyMuPDF
+
+    with FITZ_LOCK, fitz.open(pdf_path) as doc:
+        return [(page.rect.width, page.rect.height) for page in doc]
+
+
+class PageMarkers:
+    """
+    Maps Markdown lines to PDF pages and back
+
+    Built from the first Markdown line of every page, recorded while the
+    PDF is imported. Positions between two page starts are interpolated,
+    so a page position of 3.5 is the middle of the fourth page.
+
+    Usage:
+        markers = PageMarkers([0, 40, 85])
+        markers.page_at_line(60)   # 1.44
+        markers.line_at_page(1.5)  # 62
+    """
+
+    def __init__(self, page_lines: Optional[List[int]] = None, total_lines: int = 0):
+        """
+        Args:
+            page_lines: First Markdown line (0-based) of each page, in page order
+            total_lines: Line count of the whole Markdown document
+        """
+        self.page_lines = list(page_lines or [])
+        self.total_lines = total_lines
+
+    def __len__(self) -> int:
+        return len(self.page_lines)
+
+    def add_page(self, page_num: int, line: int):
+        """Record the first line of a page (1-based page number, in page order)"""
+        while len(self.page_lines) < page_num:
+            self.page_lines.append(line)
+
+    def _page_span(self, page_idx: int) -> Tuple[int, int]:
+        start = self.page_lines[page_idx]
+        if page_idx + 1 < len(self.page_lines):
+            end = self.page_lines[page_idx + 1]
+        else:
+            end = max(self.total_lines, start + 1)
+        return start, end
+
+    def page_at_line(self, line: int) -> float:
+        """Page position (0-based page index plus fraction) of a Markdown line"""
+        if not self.page_lines:
+            return 0.0
+        page_idx = max(bisect_right(self.page_lines, line) - 1, 0)
+        start, end = self._page_span(page_idx)
+        fraction = (line - start) / (end - start) if end > start else 0.0
+        return page_idx + min(max(fraction, 0.0), 1.0)
+
+    def line_at_page(self, position: float) -> int:
+        """Markdown line shown at a page position"""
+        if not self.page_lines:
+            return 0
+        page_idx = min(max(int(position), 0), len(self.page_lines) - 1)
+        start, end = self._page_span(page_idx)
+        return start + int((position - page_idx) * (end - start))
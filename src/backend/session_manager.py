@@ -68,6 +68,10 @@ class SessionManager:
                         "is_modified": tab.is_modified,
                         "created_at": tab.created_at.isoformat()
                     }
+                    if tab.source_pdf:
+                        tab_data["source_pdf"] = str(tab.source_pdf)
+                        if tab.page_markers:
+                            tab_data["page_lines"] = tab.page_markers.page_lines
                     session_data["tabs"].append(tab_data)
 
             # Write to file
@@ -9,6 +9,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from backend.pdf_source import PageMarkers
+
 
 @dataclass
 class TabInfo:
@@ -21,6 +23,8 @@ class TabInfo:
     cursor_position: Tuple[int, int] = (0, 0)
     created_at: datetime = field(default_factory=datetime.now)
     last_accessed: datetime = field(default_factory=datetime.now)
+    source_pdf: Optional[Path] = None  # PDF the document was imported from
+    page_markers: Optional[PageMarkers] = None  # Markdown line <-> PDF page map
 
     def get_display_name(self) -> str:
         """Get display name for tab title"""
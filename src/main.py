@@ -7,6 +7,7 @@ Initializes the PyQt6 application and creates the main window.
 
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt
@@ -91,4 +92,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the PDF import process pool in the frozen (PyInstaller) build
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,550 @@
+"""
+PDF export profiling script for Saekim
+Micro-benchmarks for the Markdown/HTML → PDF export path
+
+Usage:
+    python profile_pdf_export.py engine [--exports N] [--paragraphs N]
+    python profile_pdf_export.py runtime [--calls N]
+    python profile_pdf_export.py probe [--repeat N]
+    python profile_pdf_export.py engines [--exports N] [--paragraphs N]
+    python profile_pdf_export.py diagrams [--diagrams N] [--edited N]
+    python profile_pdf_export.py chunked [--paragraphs N] [--parallel N]
+    python profile_pdf_export.py optimize [--pages N] [--diagrams N] [--quality Q]
+    python profile_pdf_export.py book [--chapters N] [--paragraphs N]
+"""
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+def sample_html(paragraphs: int = 20) -> str:
+    """Rendered-preview-like HTML: headings, paragraphs, a list, code and a table"""
+    parts = []
+    for idx in range(paragraphs):
+        if idx % 10 == 0:
+            parts.append(f"<h1>Chapter {idx // 10 + 1}</h1>")
+        parts.append(f"<h2>Section {idx + 1}</h2>")
+        parts.append("<p>" + "새김 마크다운 에디터 export benchmark paragraph. " * 12 + "</p>")
+        if idx % 3 == 0:
+            parts.append("<ul><li>first item</li><li>second item</li><li>third item</li></ul>")
+        if idx % 4 == 0:
+            parts.append("<pre><code>def render(node):\n    return node.value\n</code></pre>")
+        if idx % 7 == 0:
+            parts.append('<p>Inline math <span class="katex"><span class="katex-html">'
+                         'E = mc<sup>2</sup></span></span> in a sentence.</p>')
+        if idx % 5 == 0:
+            parts.append("<table><tr><th>Name</th><th>Value</th></tr>"
+                         "<tr><td>alpha</td><td>1</td></tr><tr><td>beta</td><td>2</td></tr></table>")
+    return "\n".join(parts)
+
+
+def _median(values: list) -> float:
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def _report(label: str, times: list):
+    """First export, median of the repeats after it, and total in ms"""
+    repeats = times[1:] or times
+    print(f"{label:20}: first {times[0]:7.0f} ms, repeat median {_median(repeats):7.0f} ms, "
+          f"total {sum(times):8.0f} ms")
+
+
+def profile_engine(args):
+    """Repeated exports with a fresh browser per export vs. the kept-alive engine"""
+    from backend.converter import DocumentConverter
+    from backend.export_engine import PdfExportEngine
+
+    converter = DocumentConverter()
+    html = converter._create_full_html_for_pdf(sample_html(args.paragraphs), "Benchmark")
+    options = converter._pdf_page_options()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        # Old behaviour: Playwright and Chromium started and stopped for every export
+        cold = []
+        for idx in range(args.exports):
+            engine = PdfExportEngine()
+            start = time.perf_counter()
+            success, error = engine.export(html, str(Path(out_dir) / f"cold_{idx}.pdf"), options)
+            engine.close()
+            cold.append((time.perf_counter() - start) * 1000)
+            if not success:
+                print(f"export failed: {error}")
+                return 1
+
+        warm = []
+        engine = PdfExportEngine(max_jobs=args.max_jobs)
+        for idx in range(args.exports):
+            start = time.perf_counter()
+            success, error = engine.export(html, str(Path(out_dir) / f"warm_{idx}.pdf"), options)
+            warm.append((time.perf_counter() - start) * 1000)
+            if not success:
+                print(f"export failed: {error}")
+                return 1
+        stats = engine.stats
+        engine.close()
+
+    _report("browser per export", cold)
+    _report("kept-alive engine", warm)
+    speedup = _median(cold[1:] or cold) / _median(warm[1:] or warm)
+    print(f"launches {stats['launches']}, recycles {stats['recycles']}, repeat export speedup {speedup:.1f}x")
+
+    # Small documents should print well under a second once the browser is up
+    ok = _median(warm[1:] or warm) < 1000
+    print(f"{'ok' if ok else 'FAIL':4} repeat export under 1 s")
+    return 0 if ok else 1
+
+
+def legacy_run_async(coro):
+    """Former converter helper: a new thread and event loop per call (Qt's loop is always running)"""
+    import asyncio
+    import concurrent.futures
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        future = executor.submit(asyncio.run, coro)
+        return future.result()
+
+
+def profile_runtime(args):
+    """Per-call overhead and concurrency of the converter runtime vs. a loop per call"""
+    import asyncio
+    from backend.async_runtime import get_runtime, shutdown_runtime
+
+    async def tiny():
+        return 1
+
+    async def wait(seconds: float):
+        await asyncio.sleep(seconds)
+        return seconds
+
+    runtime = get_runtime()
+    runtime.run(tiny())  # start the loop thread outside the timing
+
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        legacy_run_async(tiny())
+    legacy = (time.perf_counter() - start) / args.calls * 1e6
+
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        runtime.run(tiny())
+    shared = (time.perf_counter() - start) / args.calls * 1e6
+
+    print(f"loop per call  : {legacy:8.0f} us/call")
+    print(f"shared runtime : {shared:8.0f} us/call ({legacy / shared:.1f}x)")
+
+    # Ten 100 ms waits submitted at once overlap on the shared loop
+    start = time.perf_counter()
+    futures = [runtime.submit(wait(0.1)) for _ in range(10)]
+    for future in futures:
+        future.result()
+    print(f"10 x 100 ms concurrent: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    shutdown_runtime()
+    return 0
+
+
+def legacy_check_playwright_browser() -> bool:
+    """Former installation check: launches Chromium to see whether it exists"""
+    try:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as p:
+            try:
+                p.chromium.launch(executable_path=None).close()
+            except Exception:
+                return False
+        return True
+    except Exception:
+        return False
+
+
+def profile_probe(args):
+    """Browser installation check: launching Chromium vs. the cached probe"""
+    import threading
+    from backend.async_runtime import shutdown_runtime
+    from backend.export_engine import BrowserProbe, playwright_version
+
+    def timed(label: str, check, repeat: int):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = check()
+            times.append((time.perf_counter() - start) * 1000)
+        print(f"{label:28}: {_median(times):8.2f} ms -> {result}")
+
+    print(f"playwright {playwright_version()}")
+
+    # The old check used the sync API, which refuses to run on a thread with an event loop
+    legacy = []
+    thread = threading.Thread(target=lambda: timed("launch Chromium (old)", legacy_check_playwright_browser, args.repeat))
+    thread.start()
+    thread.join()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_file = Path(cache_dir) / "probe.json"
+        timed("probe, no cache", lambda: BrowserProbe(cache_file).check(refresh=True), args.repeat)
+
+        probe = BrowserProbe(cache_file)
+        probe.check()
+        timed("probe, cached in memory", probe.check, args.repeat)
+        timed("probe, cached on disk", lambda: BrowserProbe(cache_file).check(), args.repeat)
+        print(f"cache file written: {cache_file.exists()} (only when the browser was found)")
+
+    shutdown_runtime()
+    return 0
+
+
+def profile_engines(args):
+    """Export latency of the Playwright engine vs. printing a loaded page with QtWebEngine"""
+    from PyQt6.QtCore import QEventLoop, QUrl
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtWebEngineCore import QWebEnginePage
+    from backend.async_runtime import shutdown_runtime
+    from backend.converter import DocumentConverter
+    from backend.native_pdf import NativePdfExport
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    converter = DocumentConverter()
+    html = converter._create_full_html_for_pdf(sample_html(args.paragraphs), "Benchmark")
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        # QtWebEngine: the page is loaded once, like the preview that is already on screen
+        page = QWebEnginePage()
+        loaded = QEventLoop()
+        page.loadFinished.connect(loaded.quit)
+        page.setHtml(html, QUrl("https://saekim.export/"))
+        loaded.exec()
+
+        native = []
+        for idx in range(args.exports):
+            done = QEventLoop()
+            results = []
+            export = NativePdfExport(page, str(Path(out_dir) / f"qt_{idx}.pdf"))
+            export.finished.connect(lambda *result: (results.append(result), done.quit()))
+            start = time.perf_counter()
+            export.start()
+            done.exec()
+            native.append((time.perf_counter() - start) * 1000)
+            if not results[0][0]:
+                print(f"QtWebEngine export failed: {results[0][2]}")
+                return 1
+
+        playwright = []
+        for idx in range(args.exports):
+            start = time.perf_counter()
+            success, error = converter.export_engine.export(
+                html, str(Path(out_dir) / f"pw_{idx}.pdf"), converter._pdf_page_options())
+            playwright.append((time.perf_counter() - start) * 1000)
+            if not success:
+                print(f"Playwright export failed: {error}")
+                break
+        converter.export_engine.close()
+
+    _report("QtWebEngine", native)
+    if len(playwright) == args.exports:
+        _report("Playwright", playwright)
+    shutdown_runtime()
+    app.processEvents()
+    return 0
+
+
+def sample_png(width: int, height: int, seed: int) -> bytes:
+    """A diagram-sized PNG: white canvas with a few filled boxes"""
+    import fitz  # PyMuPDF
+
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, width, height), False)
+    pix.set_rect(pix.irect, (255, 255, 255))
+    for idx in range(6):
+        x = (seed * 37 + idx * 90) % max(width - 80, 1)
+        y = (seed * 53 + idx * 70) % max(height - 40, 1)
+        pix.set_rect(fitz.IRect(x, y, x + 80, y + 40), (200, 220 - idx * 20, 255))
+    return pix.tobytes("png")
+
+
+def profile_diagrams(args):
+    """Diagram cache lookups for a document whose diagrams mostly did not change"""
+    import base64
+    from backend.diagram_cache import DiagramCache
+
+    sources = [f"graph TD\n    A{idx}[Start] --> B{idx}{{Check}}\n    B{idx} --> C{idx}[End]"
+               for idx in range(args.diagrams)]
+    pngs = [DiagramCache.DATA_URL_PREFIX + base64.b64encode(sample_png(1060, 700, idx)).decode("ascii")
+            for idx in range(args.diagrams)]
+    size_kb = sum(len(png) for png in pngs) / len(pngs) / 1024
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = DiagramCache(Path(cache_dir))
+
+        # First export: every diagram is a miss and gets stored
+        start = time.perf_counter()
+        keys = [cache.diagram_key(source, "default", 2) for source in sources]
+        misses = sum(1 for key in keys if cache.get_data_url(key) is None)
+        for key, png in zip(keys, pngs):
+            cache.put_data_url(key, png)
+        cache.trim()
+        first = (time.perf_counter() - start) * 1000
+
+        # Next export after editing a few diagrams
+        edited = list(sources)
+        for idx in range(min(args.edited, len(edited))):
+            edited[idx] += f"\n    C{idx} --> D{idx}[Edited]"
+        start = time.perf_counter()
+        keys = [cache.diagram_key(source, "default", 2) for source in edited]
+        hits = sum(1 for key in keys if cache.get_data_url(key) is not None)
+        second = (time.perf_counter() - start) * 1000
+
+        # Another Mermaid theme or raster scale must not hit
+        themed = sum(1 for source in sources
+                     if cache.get_data_url(cache.diagram_key(source, "dark", 2)) is not None)
+        scaled = sum(1 for source in sources
+                     if cache.get_data_url(cache.diagram_key(source, "default", 3)) is not None)
+        stats = cache.stats()
+
+    print(f"{args.diagrams} diagrams, {size_kb:.0f} KB per PNG data URL")
+    print(f"first export : {misses} misses, lookup + store {first:7.1f} ms")
+    print(f"after edit   : {hits} hits, lookup {second:7.1f} ms ({second / args.diagrams:.2f} ms/diagram)")
+    print(f"cache        : {stats['diagrams']} files, {stats['size_bytes'] / 1024:.0f} KB")
+
+    ok = hits == args.diagrams - min(args.edited, args.diagrams) and themed == 0 and scaled == 0
+    print(f"{'ok' if ok else 'FAIL':4} only unchanged diagrams hit (other theme {themed}, other scale {scaled})")
+    return 0 if ok else 1
+
+
+def sample_chunk_pdfs(out_dir: Path, chunks: int, pages: int) -> list:
+    """Chunk-like PDFs with a line of text on every page"""
+    import fitz  # PyMuPDF
+
+    paths = []
+    for idx in range(chunks):
+        path = out_dir / f"chunk_{idx:04d}.pdf"
+        with fitz.open() as doc:
+            for page_idx in range(pages):
+                page = doc.new_page(width=595, height=842)
+                page.insert_text((72, 100), f"chunk {idx} page {page_idx}")
+            doc.save(path)
+        paths.append(path)
+    return paths
+
+
+def profile_chunked(args):
+    """Splitting, merging and (with Chromium) whole vs. chunked export of a long document"""
+    import fitz  # PyMuPDF
+    from backend.async_runtime import get_runtime, shutdown_runtime
+    from backend.chunked_export import ChunkedPdfExport, merge_pdfs
+    from backend.converter import DocumentConverter
+
+    converter = DocumentConverter()
+    rendered = sample_html(args.paragraphs)
+    export = ChunkedPdfExport(converter.export_engine, converter._create_full_html_for_pdf,
+                              max_parallel=args.parallel)
+
+    start = time.perf_counter()
+    chunks = export.chunks(rendered)
+    split_ms = (time.perf_counter() - start) * 1000
+    sizes = [len(chunk) for chunk in chunks]
+    print(f"document {len(rendered) / 1024:.0f} KB -> {len(chunks)} chunks "
+          f"({min(sizes) / 1024:.0f}-{max(sizes) / 1024:.0f} KB), split in {split_ms:.1f} ms")
+    ok = "".join(chunks) == rendered
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_dir = Path(out_dir)
+
+        # Merge and continuous numbering, independent of the browser
+        paths = sample_chunk_pdfs(out_dir, len(chunks), args.chunk_pages)
+        start = time.perf_counter()
+        pages = merge_pdfs(paths, str(out_dir / "merged.pdf"))
+        merge_ms = (time.perf_counter() - start) * 1000
+        with fitz.open(out_dir / "merged.pdf") as merged:
+            last_footer = merged[-1].get_text().split()[-3:]
+        numbered = last_footer == [str(pages), "/", str(pages)]
+        print(f"merge {len(paths)} x {args.chunk_pages} pages: {merge_ms:7.0f} ms, last footer {' '.join(last_footer)}")
+        ok = ok and numbered
+
+        full_html = converter._create_full_html_for_pdf(rendered, "Benchmark")
+        start = time.perf_counter()
+        success, error = converter.export_engine.export(full_html, str(out_dir / "whole.pdf"),
+                                                        converter._pdf_page_options())
+        whole_ms = (time.perf_counter() - start) * 1000
+        if success:
+            start = time.perf_counter()
+            success, error = get_runtime().run(export.export_async(
+                chunks, "Benchmark", str(out_dir / "chunked.pdf"), converter._pdf_page_options()))
+            chunked_ms = (time.perf_counter() - start) * 1000
+            with fitz.open(out_dir / "whole.pdf") as whole, fitz.open(out_dir / "chunked.pdf") as chunked:
+                print(f"whole document : {whole_ms:7.0f} ms, {whole.page_count} pages")
+                print(f"chunked ({args.parallel} par): {chunked_ms:7.0f} ms, {chunked.page_count} pages")
+        else:
+            print(f"browser export skipped: {error.splitlines()[0]}")
+        converter.export_engine.close()
+
+    shutdown_runtime()
+    print(f"{'ok' if ok else 'FAIL':4} chunks cover the document, pages numbered across chunks")
+    return 0 if ok else 1
+
+
+def sample_export_pdf(path: Path, pages: int, diagrams: int):
+    """
+    PDF shaped like a merged export: every chunk carries its own copy of the
+    same diagram PNGs, written without compression
+    """
+    import fitz  # PyMuPDF
+
+    pngs = [sample_png(1060, 700, idx) for idx in range(diagrams)]
+    with fitz.open() as merged:
+        for page_idx in range(pages):
+            with fitz.open() as chunk:
+                page = chunk.new_page(width=595, height=842)
+                page.insert_text((72, 72), f"Page {page_idx + 1} " + "export text " * 8)
+                page.insert_image(fitz.Rect(72, 120, 523, 418), stream=pngs[page_idx % diagrams])
+                merged.insert_pdf(chunk)
+        merged.save(path, deflate=True)
+
+
+def profile_optimize(args):
+    """Size and time of the PyMuPDF optimization stage on a diagram-heavy export"""
+    from backend.async_runtime import shutdown_runtime
+    from backend.pdf_optimize import submit_optimize
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        path = Path(out_dir) / "export.pdf"
+        sample_export_pdf(path, args.pages, args.diagrams)
+
+        result = submit_optimize(path, image_quality=args.quality).result()
+        print(f"{args.pages} pages, {args.diagrams} distinct diagrams")
+        print(f"size      : {result.summary()}")
+        print(f"images    : {result.images} streams, {result.duplicate_images} duplicates merged")
+        print(f"linearized: {result.linearized}, recompressed: {result.recompressed}")
+        print(f"time      : {result.elapsed_ms:7.0f} ms (converter runtime, off the UI thread)")
+
+        import fitz  # PyMuPDF
+        with fitz.open(path) as doc:
+            pages_ok = doc.page_count == args.pages
+
+    shutdown_runtime()
+    ok = pages_ok and result.size_after < result.size_before
+    print(f"{'ok' if ok else 'FAIL':4} optimized file is smaller and keeps all pages")
+    return 0 if ok else 1
+
+
+def sample_markdown(chapter: int, paragraphs: int) -> str:
+    """A Markdown chapter: title, sections, lists and code"""
+    parts = [f"# Chapter {chapter}: 새김 매뉴얼\n"]
+    for idx in range(paragraphs):
+        parts.append(f"## Section {chapter}.{idx + 1}\n")
+        parts.append("새김 마크다운 에디터 book build benchmark paragraph. " * 12 + "\n")
+        if idx % 3 == 0:
+            parts.append("- first item\n- second item\n- third item\n")
+        if idx % 4 == 0:
+            parts.append("```python\ndef render(node):\n    return node.value\n```\n")
+    return "\n".join(parts)
+
+
+def profile_book(args):
+    """Full book build vs. rebuild after editing one chapter"""
+    from backend.async_runtime import shutdown_runtime
+    from backend.book_builder import BookBuilder, ChapterCache
+    from backend.converter import DocumentConverter
+
+    converter = DocumentConverter()
+
+    with tempfile.TemporaryDirectory() as book_dir, tempfile.TemporaryDirectory() as cache_dir:
+        book_dir = Path(book_dir)
+        for idx in range(args.chapters):
+            (book_dir / f"{idx + 1:02d}-chapter.md").write_text(
+                sample_markdown(idx + 1, args.paragraphs), encoding="utf-8")
+        cache = ChapterCache(Path(cache_dir))
+
+        def build(label: str):
+            report = BookBuilder.from_directory(book_dir, converter=converter, cache=cache).run()
+            print(f"{label:22}: {report.elapsed * 1000:7.0f} ms, {len(report.rendered)} rendered, "
+                  f"{len(report.cached)} cached, {report.total_pages} pages")
+            return report
+
+        first = build("full build")
+        if first.error:
+            print(f"book build failed: {first.error.splitlines()[0]}")
+            converter.export_engine.close()
+            shutdown_runtime()
+            return 1
+
+        unchanged = build("rebuild, no changes")
+
+        chapter = book_dir / f"{args.chapters // 2 + 1:02d}-chapter.md"
+        chapter.write_text(chapter.read_text(encoding="utf-8") + "\nOne more edited paragraph.\n", encoding="utf-8")
+        edited = build("rebuild, 1 chapter edited")
+
+    converter.export_engine.close()
+    shutdown_runtime()
+
+    ok = len(unchanged.rendered) == 0 and len(edited.rendered) == 1 and edited.elapsed < 5
+    print(f"{'ok' if ok else 'FAIL':4} a one-chapter edit re-renders one chapter in seconds")
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saekim PDF export profiling")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    engine_parser = subparsers.add_parser(
+        "engine", help="repeated export latency, browser per export vs. kept-alive engine")
+    engine_parser.add_argument("--exports", type=int, default=5)
+    engine_parser.add_argument("--paragraphs", type=int, default=20)
+    engine_parser.add_argument("--max-jobs", type=int, default=50, help="exports before the browser is replaced")
+    engine_parser.set_defaults(func=profile_engine)
+
+    runtime_parser = subparsers.add_parser(
+        "runtime", help="coroutine call overhead, shared runtime vs. a loop per call")
+    runtime_parser.add_argument("--calls", type=int, default=500)
+    runtime_parser.set_defaults(func=profile_runtime)
+
+    probe_parser = subparsers.add_parser(
+        "probe", help="Playwright browser installation check, old launch vs. cached probe")
+    probe_parser.add_argument("--repeat", type=int, default=5)
+    probe_parser.set_defaults(func=profile_probe)
+
+    engines_parser = subparsers.add_parser(
+        "engines", help="export latency, Playwright vs. QtWebEngine printToPdf")
+    engines_parser.add_argument("--exports", type=int, default=5)
+    engines_parser.add_argument("--paragraphs", type=int, default=20)
+    engines_parser.set_defaults(func=profile_engines)
+
+    diagrams_parser = subparsers.add_parser(
+        "diagrams", help="diagram raster cache lookups after editing a few diagrams")
+    diagrams_parser.add_argument("--diagrams", type=int, default=30)
+    diagrams_parser.add_argument("--edited", type=int, default=3, help="diagrams changed before the second export")
+    diagrams_parser.set_defaults(func=profile_diagrams)
+
+    chunked_parser = subparsers.add_parser(
+        "chunked", help="long document export, splitting, merging, whole vs. chunked printing")
+    chunked_parser.add_argument("--paragraphs", type=int, default=3000)
+    chunked_parser.add_argument("--parallel", type=int, default=2, help="chunks printed at the same time")
+    chunked_parser.add_argument("--chunk-pages", type=int, default=50, help="pages per chunk in the merge test")
+    chunked_parser.set_defaults(func=profile_chunked)
+
+    optimize_parser = subparsers.add_parser(
+        "optimize", help="PDF optimization stage, size before and after")
+    optimize_parser.add_argument("--pages", type=int, default=60)
+    optimize_parser.add_argument("--diagrams", type=int, default=6, help="distinct diagram images")
+    optimize_parser.add_argument("--quality", type=int, default=0, help="JPEG quality for images, 0 keeps them lossless")
+    optimize_parser.set_defaults(func=profile_optimize)
+
+    book_parser = subparsers.add_parser(
+        "book", help="multi-file book build, full build vs. rebuild after a one-chapter edit")
+    book_parser.add_argument("--chapters", type=int, default=12)
+    book_parser.add_argument("--paragraphs", type=int, default=30, help="sections per chapter")
+    book_parser.set_defaults(func=profile_book)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
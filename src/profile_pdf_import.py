@@ -0,0 +1,1493 @@
+"""
+PDF import profiling script for Saekim
+Micro-benchmarks for the PDF → Markdown pipeline
+
+Usage:
+    python profile_pdf_import.py classifier [file.pdf ...]
+    python profile_pdf_import.py languages [--scale N]
+    python profile_pdf_import.py batch folder [--workers N]
+    python profile_pdf_import.py memory file.pdf [--modes string file low-memory]
+    python profile_pdf_import.py tables file.pdf [...]
+    python profile_pdf_import.py lines file.pdf [...]
+    python profile_pdf_import.py spans file.pdf [...]
+    python profile_pdf_import.py columns
+    python profile_pdf_import.py headers [file.pdf ...]
+    python profile_pdf_import.py figures [file.pdf ...] [--dpi N ...]
+    python profile_pdf_import.py viewer [file.pdf] [--pages N] [--memory-mb N]
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+# Mix of prose, markdown-ish text and code from several languages.
+# Used when no PDFs are given on the command line.
+SAMPLE_LINES = [
+    "The quick brown fox jumps over the lazy dog.",
+    "In this chapter we look at how the parser handles nested blocks.",
+    "1. Install the package and restart the editor",
+    "- Bullet item with some *emphasis* and a link",
+    "## Section heading",
+    "새김 마크다운 에디터에 오신 것을 환영합니다.",
+    "Table 3 shows the results (higher is better).",
+    "See https://example.com/docs for details.",
+    "def parse_args(argv=None) -> Namespace:",
+    "class TokenStream(object):",
+    "from collections import defaultdict",
+    "    for item in items:",
+    "        result.append(item.value)",
+    "    return result",
+    "if __name__ == '__main__':",
+    "const total = values.reduce((a, b) => a + b, 0);",
+    "function render(node) {",
+    "console.log('done');",
+    "public static void main(String[] args) {",
+    "#include <stdio.h>",
+    "printf(\"%d\\n\", count);",
+    "std::cout << value << std::endl;",
+    "// TODO: handle the empty case",
+    "x = {'a': 1, 'b': 2}",
+    "total_count = user_count + guest_count",
+    "$ pip install pymupdf",
+    "    }",
+    "",
+]
+
+# Labelled code blocks for language detection: (expected language, code)
+LANGUAGE_CORPUS = [
+    ("python", """def load_config(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)"""),
+    ("python", """class Stack:
+    def __init__(self):
+        self.items = []
+
+    def push(self, item):
+        self.items.append(item)"""),
+    ("python", """from pathlib import Path
+for name in sorted(names):
+    if name is None:
+        continue
+    print(name)"""),
+    ("javascript", """const sum = (a, b) => a + b;
+console.log(sum(1, 2));"""),
+    ("javascript", """function toggle(id) {
+    const el = document.getElementById(id);
+    if (el.value === undefined || el.value === null) return;
+}"""),
+    ("typescript", """interface User {
+    name: string;
+    age: number;
+}
+const greet = (user: User): void => console.log(user.name);"""),
+    ("java", """public class Main {
+    public static void main(String[] args) {
+        System.out.println("Hello");
+    }
+}"""),
+    ("java", """@Override
+private final List<String> names = new ArrayList<>();"""),
+    ("c", """#include <stdio.h>
+int main(void) {
+    printf("%d\\n", 42);
+    return 0;
+}"""),
+    ("cpp", """#include <iostream>
+int main() {
+    std::cout << "hi" << std::endl;
+}"""),
+    ("cpp", """template <typename T>
+class Box {
+    T value;
+};"""),
+    ("csharp", """using System;
+namespace Demo {
+    class Program {
+        static void Main() { Console.WriteLine("Hi"); }
+    }
+}"""),
+    ("go", """package main
+import "fmt"
+func main() {
+    x := 10
+    fmt.Println(x)
+}"""),
+    ("rust", """fn main() {
+    let mut v = vec![1, 2, 3];
+    println!("{:?}", v);
+}"""),
+    ("rust", """impl Point {
+    pub fn new(x: i32) -> Self { Point { x } }
+}"""),
+    ("html", """<!DOCTYPE html>
+<html>
+<body><div class="main">Hello</div></body>
+</html>"""),
+    ("css", """.container {
+    margin: 0 auto;
+    padding: 16px;
+}"""),
+    ("sql", """SELECT name, age FROM users
+WHERE age > 30
+ORDER BY name;"""),
+    ("sql", """INSERT INTO users (name) VALUES ('kim');"""),
+    ("bash", """#!/bin/bash
+export PATH=$HOME/bin:$PATH
+echo "done\""""),
+    ("bash", """$ pip install pymupdf
+$ git clone https://example.com/repo.git"""),
+    ("json", """{
+  "name": "saekim",
+  "version": "1.0.0"
+}"""),
+    ("xml", """<?xml version="1.0"?>
+<note><to>Tove</to></note>"""),
+    ("yaml", """server:
+  port: 8080
+  host: localhost"""),
+    ("yaml", """steps:
+  - name: checkout
+  - run: make"""),
+    ("", """x + y"""),
+]
+
+
+def legacy_looks_like_code(text: str) -> bool:
+    """
+    Detect if text looks like code based on content patterns.
+    This is a fallback when font detection doesn't work.
+
+    Copy of the original per-call implementation, kept as the baseline
+    for the classifier benchmark.
+    """
+    import re
+
+    text_stripped = text.strip()
+    if not text_stripped:
+        return False
+
+    # Strong indicators - if any match, it's very likely code
+    strong_patterns = [
+        # Python specific
+        r'^def\s+\w+\s*\([^)]*\)\s*(->\s*\w+)?:',  # def func() -> Type:
+        r'^class\s+\w+.*:',  # class Foo:
+        r'^(from|import)\s+\w+',  # import/from
+        r'^@\w+',  # @decorator
+        r'^\s*if\s+.+:$',  # if condition:
+        r'^\s*elif\s+.+:$',  # elif condition:
+        r'^\s*else\s*:$',  # else:
+        r'^\s*for\s+\w+\s+in\s+.+:',  # for x in ...:
+        r'^\s*while\s+.+:',  # while ...:
+        r'^\s*try\s*:',  # try:
+        r'^\s*except.*:',  # except:
+        r'^\s*finally\s*:',  # finally:
+        r'^\s*with\s+.+:',  # with ...:
+        r'^\s*return\s+',  # return
+        r'^\s*yield\s+',  # yield
+        r'^\s*raise\s+',  # raise
+        r'^\s*pass\s*$',  # pass
+        r'^\s*break\s*$',  # break
+        r'^\s*continue\s*$',  # continue
+        r'\w+\s*=\s*\[.*\]',  # list assignment
+        r'\w+\s*=\s*\{.*\}',  # dict assignment
+        r'\w+\s*=\s*\(.*\)',  # tuple assignment
+        r'lambda\s+\w+\s*:',  # lambda
+        r'map\s*\(.+\)',  # map()
+        r'filter\s*\(.+\)',  # filter()
+        r'list\s*\(.+\)',  # list()
+        r'dict\s*\(.+\)',  # dict()
+        r'range\s*\(.+\)',  # range()
+        r'print\s*\(.+\)',  # print()
+        r'input\s*\(.+\)',  # input()
+        r'len\s*\(.+\)',  # len()
+        r'\.split\s*\(',  # .split()
+        r'\.join\s*\(',  # .join()
+        r'\.append\s*\(',  # .append()
+        r'int\s*\(.+\)',  # int()
+        r'str\s*\(.+\)',  # str()
+        r'float\s*\(.+\)',  # float()
+
+        # JavaScript/TypeScript
+        r'^(const|let|var)\s+\w+\s*=',
+        r'^function\s+\w+\s*\(',
+        r'^\s*=>\s*\{',
+        r'console\.(log|error|warn)\s*\(',
+
+        # Java/C#
+        r'^(public|private|protected)\s+(static\s+)?(void|int|String|boolean)',
+        r'^(public|private|protected)\s+class\s+\w+',
+
+        # C/C++
+        r'^#include\s*[<"]',
+        r'^#define\s+\w+',
+        r'^int\s+main\s*\(',
+        r'printf\s*\(',
+        r'cout\s*<<',
+
+        # General
+        r'^\s*//.*$',  # // comment
+        r'^\s*#(?!#)\s*\w+',  # # comment (but not ## heading)
+        r'^\s*/\*',  # /* comment
+        r'^\s*\*/',  # */ end comment
+    ]
+
+    for pattern in strong_patterns:
+        if re.search(pattern, text_stripped):
+            logger.debug(f"Code pattern matched: {pattern} in '{text_stripped[:50]}...'")
+            return True
+
+    # Check for code-like characteristics
+    code_indicators = 0
+
+    # Has significant indentation (4+ spaces or tab at start)
+    if re.match(r'^(\t|    +)', text):
+        code_indicators += 3
+
+    # Line ends with colon (Python)
+    if text_stripped.endswith(':') and not text_stripped.startswith('#'):
+        code_indicators += 2
+
+    # Contains brackets/braces
+    bracket_count = len(re.findall(r'[\{\}\[\]\(\)]', text_stripped))
+    if bracket_count >= 2:
+        code_indicators += 2
+    elif bracket_count >= 1:
+        code_indicators += 1
+
+    # Contains operators common in code
+    if re.search(r'[=!<>]=|&&|\|\||=>|->|\+\+|--|==|!=', text_stripped):
+        code_indicators += 2
+
+    # Contains semicolon at end (C-style)
+    if text_stripped.endswith(';'):
+        code_indicators += 2
+
+    # Multiple assignment operators
+    if text_stripped.count('=') >= 1 and re.search(r'\w+\s*=\s*\w+', text_stripped):
+        code_indicators += 1
+
+    # Contains common code symbols
+    if re.search(r'[$@]\w+', text_stripped):  # $var, @decorator
+        code_indicators += 2
+
+    # Has snake_case identifiers (common in Python)
+    if re.search(r'\b[a-z]+_[a-z_]+\b', text_stripped):
+        code_indicators += 1
+
+    # Contains string literals with quotes
+    if re.search(r'["\'][^"\']+["\']', text_stripped):
+        code_indicators += 1
+
+    # Line is a comment (# followed by space and text)
+    if re.match(r'^\s*#\s+\S', text_stripped):
+        code_indicators += 2
+
+    # Contains method/function call pattern
+    if re.search(r'\w+\.\w+\(', text_stripped):
+        code_indicators += 2
+
+    # Threshold for considering it code
+    if code_indicators >= 3:
+        logger.debug(f"Code indicators: {code_indicators} for '{text_stripped[:50]}...'")
+        return True
+
+    return False
+
+
+def legacy_detect_code_language(code_lines: list) -> str:
+    """
+    Detect programming language from code content using scoring system.
+    Returns the language with highest confidence score.
+
+    Copy of the original hard-coded implementation, kept as the baseline
+    for the language detection benchmark.
+    """
+    import re
+
+    code_text = '\n'.join(code_lines)
+    code_lower = code_text.lower()
+
+    # Score-based detection
+    scores = {
+        'python': 0,
+        'javascript': 0,
+        'typescript': 0,
+        'java': 0,
+        'c': 0,
+        'cpp': 0,
+        'csharp': 0,
+        'go': 0,
+        'rust': 0,
+        'html': 0,
+        'css': 0,
+        'sql': 0,
+        'bash': 0,
+        'json': 0,
+        'xml': 0,
+        'yaml': 0,
+        'markdown': 0,
+    }
+
+    # === Python (very specific patterns) ===
+    if re.search(r'\bdef\s+\w+\s*\([^)]*\)\s*(->\s*\w+)?\s*:', code_text):
+        scores['python'] += 10  # def func(): or def func() -> Type:
+    if re.search(r'\bclass\s+\w+.*:', code_text):
+        scores['python'] += 8
+    if 'self.' in code_text or 'self,' in code_text:
+        scores['python'] += 10  # Very Python-specific
+    if '__init__' in code_text or '__name__' in code_text or '__main__' in code_text:
+        scores['python'] += 10
+    if re.search(r'^\s*@\w+', code_text, re.MULTILINE):  # Decorators
+        scores['python'] += 5
+    if re.search(r'\bif\s+.+:', code_text) or re.search(r'\bfor\s+\w+\s+in\s+', code_text):
+        scores['python'] += 3  # Colon-based control flow
+    if re.search(r'\belif\b', code_text):
+        scores['python'] += 8  # elif is Python-only
+    if re.search(r'\bexcept\s+\w+.*:', code_text):
+        scores['python'] += 5
+    if 'import ' in code_lower and ';' not in code_text:
+        scores['python'] += 3
+    if 'from ' in code_lower and ' import ' in code_lower:
+        scores['python'] += 8  # from x import y
+    if re.search(r'\bprint\s*\(', code_text):
+        scores['python'] += 2
+    if re.search(r'\bNone\b', code_text):
+        scores['python'] += 3
+    if re.search(r'\bTrue\b|\bFalse\b', code_text):
+        scores['python'] += 2
+    if re.search(r'\blambda\s+\w+\s*:', code_text):
+        scores['python'] += 5
+
+    # === JavaScript ===
+    if re.search(r'\bconst\s+\w+\s*=', code_text):
+        scores['javascript'] += 5
+    if re.search(r'\blet\s+\w+\s*=', code_text):
+        scores['javascript'] += 5
+    if re.search(r'\bvar\s+\w+\s*=', code_text):
+        scores['javascript'] += 3
+    if re.search(r'\bfunction\s+\w+\s*\(', code_text):
+        scores['javascript'] += 5
+    if '=>' in code_text:
+        scores['javascript'] += 5  # Arrow function
+    if 'console.log' in code_text:
+        scores['javascript'] += 8
+    if re.search(r'\bdocument\.|window\.', code_text):
+        scores['javascript'] += 8
+    if re.search(r'require\s*\(', code_text):
+        scores['javascript'] += 5
+    if re.search(r'\bnull\b', code_text) and re.search(r'\bundefined\b', code_text):
+        scores['javascript'] += 3
+    if '===' in code_text or '!==' in code_text:
+        scores['javascript'] += 5
+
+    # === TypeScript ===
+    if re.search(r':\s*(string|number|boolean|any|void)\b', code_text):
+        scores['typescript'] += 8
+    if re.search(r'\binterface\s+\w+\s*\{', code_text):
+        scores['typescript'] += 10
+    if re.search(r'\btype\s+\w+\s*=', code_text):
+        scores['typescript'] += 8
+    if '<T>' in code_text or '<T,' in code_text:
+        scores['typescript'] += 3
+    if scores['typescript'] > 0:
+        scores['typescript'] += scores['javascript'] // 2  # TS inherits JS patterns
+
+    # === Java ===
+    if re.search(r'\bpublic\s+class\s+\w+', code_text):
+        scores['java'] += 10
+    if re.search(r'\bpublic\s+static\s+void\s+main', code_text):
+        scores['java'] += 15
+    if re.search(r'\bSystem\.out\.print', code_text):
+        scores['java'] += 10
+    if re.search(r'\bprivate\s+(static\s+)?(final\s+)?\w+\s+\w+', code_text):
+        scores['java'] += 5
+    if re.search(r'\bnew\s+\w+\s*\(', code_text) and ';' in code_text:
+        scores['java'] += 3
+    if re.search(r'@Override|@Autowired|@Component', code_text):
+        scores['java'] += 8
+
+    # === C ===
+    if re.search(r'#include\s*<\w+\.h>', code_text):
+        scores['c'] += 10
+    if re.search(r'\bint\s+main\s*\(', code_text):
+        scores['c'] += 8
+    if re.search(r'\bprintf\s*\(', code_text):
+        scores['c'] += 8
+    if re.search(r'\bscanf\s*\(', code_text):
+        scores['c'] += 8
+    if re.search(r'\bmalloc\s*\(|\bfree\s*\(', code_text):
+        scores['c'] += 5
+    if re.search(r'\bstruct\s+\w+\s*\{', code_text):
+        scores['c'] += 3
+
+    # === C++ ===
+    if re.search(r'#include\s*<\w+>', code_text) and not re.search(r'\.h>', code_text):
+        scores['cpp'] += 5  # Modern C++ headers without .h
+    if 'std::' in code_text:
+        scores['cpp'] += 10
+    if 'cout' in code_text or 'cin' in code_text:
+        scores['cpp'] += 8
+    if re.search(r'\bclass\s+\w+\s*\{', code_text) and ';' in code_text:
+        scores['cpp'] += 5
+    if '::' in code_text:
+        scores['cpp'] += 3
+    if re.search(r'\bnamespace\s+\w+', code_text):
+        scores['cpp'] += 8
+    if re.search(r'\btemplate\s*<', code_text):
+        scores['cpp'] += 8
+    scores['cpp'] += scores['c'] // 2  # C++ inherits C patterns
+
+    # === C# ===
+    if re.search(r'\busing\s+System', code_text):
+        scores['csharp'] += 10
+    if re.search(r'\bnamespace\s+\w+', code_text) and '{' in code_text:
+        scores['csharp'] += 5
+    if re.search(r'\bConsole\.(WriteLine|ReadLine)', code_text):
+        scores['csharp'] += 10
+    if re.search(r'\basync\s+Task', code_text):
+        scores['csharp'] += 8
+    if re.search(r'\bvar\s+\w+\s*=', code_text) and ';' in code_text:
+        scores['csharp'] += 3
+
+    # === Go ===
+    if re.search(r'\bpackage\s+\w+', code_text):
+        scores['go'] += 10
+    if re.search(r'\bfunc\s+\w+\s*\(', code_text):
+        scores['go'] += 8
+    if re.search(r'\bfmt\.(Print|Println|Printf)', code_text):
+        scores['go'] += 10
+    if ':=' in code_text:
+        scores['go'] += 8  # Go's short declaration
+    if re.search(r'\bgo\s+\w+\(', code_text):
+        scores['go'] += 5  # Goroutine
+    if re.search(r'\bdefer\s+', code_text):
+        scores['go'] += 8
+
+    # === Rust ===
+    if re.search(r'\bfn\s+\w+\s*\(', code_text):
+        scores['rust'] += 8
+    if re.search(r'\blet\s+mut\s+', code_text):
+        scores['rust'] += 10  # Rust's mutable let
+    if re.search(r'\bimpl\s+\w+', code_text):
+        scores['rust'] += 10
+    if re.search(r'\bpub\s+fn\s+', code_text):
+        scores['rust'] += 8
+    if 'println!' in code_text or 'vec!' in code_text:
+        scores['rust'] += 10  # Rust macros
+    if re.search(r'->\s*\w+', code_text) and '::' in code_text:
+        scores['rust'] += 5
+
+    # === HTML ===
+    if re.search(r'<(!DOCTYPE|html|head|body|div|span|p|a|img)\b', code_text, re.IGNORECASE):
+        scores['html'] += 10
+    if re.search(r'</\w+>', code_text):
+        scores['html'] += 5
+    if re.search(r'<\w+\s+\w+="[^"]*"', code_text):
+        scores['html'] += 3
+
+    # === CSS ===
+    if re.search(r'\{[^}]*:\s*[^;]+;[^}]*\}', code_text):
+        scores['css'] += 5
+    if re.search(r'\b(margin|padding|font-size|color|background|display)\s*:', code_text):
+        scores['css'] += 8
+    if re.search(r'\.([\w-]+)\s*\{', code_text):
+        scores['css'] += 5  # Class selector
+    if re.search(r'#[\w-]+\s*\{', code_text):
+        scores['css'] += 5  # ID selector
+
+    # === SQL ===
+    if re.search(r'\bSELECT\s+.+\s+FROM\b', code_text, re.IGNORECASE):
+        scores['sql'] += 15
+    if re.search(r'\bINSERT\s+INTO\b', code_text, re.IGNORECASE):
+        scores['sql'] += 10
+    if re.search(r'\bCREATE\s+(TABLE|DATABASE|INDEX)\b', code_text, re.IGNORECASE):
+        scores['sql'] += 10
+    if re.search(r'\bWHERE\s+', code_text, re.IGNORECASE):
+        scores['sql'] += 5
+    if re.search(r'\bJOIN\s+', code_text, re.IGNORECASE):
+        scores['sql'] += 5
+
+    # === Bash/Shell ===
+    if re.search(r'^#!/bin/(bash|sh|zsh)', code_text, re.MULTILINE):
+        scores['bash'] += 15
+    if re.search(r'^\$\s+\w+', code_text, re.MULTILINE):
+        scores['bash'] += 5
+    if re.search(r'\b(sudo|apt|yum|brew|npm|pip|git|docker|kubectl)\s+', code_text):
+        scores['bash'] += 5
+    if re.search(r'\becho\s+', code_text):
+        scores['bash'] += 3
+    if re.search(r'\bexport\s+\w+=', code_text):
+        scores['bash'] += 5
+    if re.search(r'\$\{\w+\}|\$\w+', code_text):
+        scores['bash'] += 3
+
+    # === JSON ===
+    stripped = code_text.strip()
+    if (stripped.startswith('{') and stripped.endswith('}')) or \
+       (stripped.startswith('[') and stripped.endswith(']')):
+        if re.search(r'"\w+"\s*:', code_text):
+            scores['json'] += 15
+
+    # === XML ===
+    if re.search(r'<\?xml\s+version=', code_text):
+        scores['xml'] += 15
+    if re.search(r'<\w+[^>]*>[^<]*</\w+>', code_text) and '<html' not in code_lower:
+        scores['xml'] += 5
+
+    # === YAML ===
+    if re.search(r'^\w+:\s*$', code_text, re.MULTILINE):
+        scores['yaml'] += 5
+    if re.search(r'^\s*-\s+\w+:', code_text, re.MULTILINE):
+        scores['yaml'] += 8
+    if re.search(r'^\w+:\s+\w+', code_text, re.MULTILINE) and '{' not in code_text:
+        scores['yaml'] += 3
+
+    # Find language with highest score
+    max_score = max(scores.values())
+    if max_score < 5:
+        return ""  # Not confident enough
+
+    best_lang = max(scores, key=scores.get)
+
+    # Log for debugging
+    top_scores = sorted(scores.items(), key=lambda x: -x[1])[:3]
+    logger.debug(f"Language detection scores: {top_scores}")
+
+    return best_lang
+
+
+def load_pdf_lines(pdf_paths: list) -> list:
+    """Collect the text lines of the given PDFs as the import sees them"""
+    import fitz  # PyMuPDF
+
+    lines = []
+    for pdf_path in pdf_paths:
+        with fitz.open(pdf_path) as doc:
+            for page in doc:
+                blocks = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)["blocks"]
+                for block in blocks:
+                    for line in block.get("lines", []):
+                        lines.append("".join(span.get("text", "") for span in line.get("spans", [])))
+    return lines
+
+
+def time_lines(classify, lines: list, repeat: int) -> float:
+    """Best-of-N items/second for a classifier function"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            classify(line)
+        best = min(best, time.perf_counter() - start)
+    return len(lines) / best
+
+
+def profile_classifier(args):
+    """Compare the compiled classifier against the original implementation"""
+    from backend.code_detection import CodeLineClassifier
+
+    if args.pdfs:
+        lines = load_pdf_lines(args.pdfs)
+        source = ", ".join(Path(p).name for p in args.pdfs)
+    else:
+        lines = SAMPLE_LINES * 200
+        source = "built-in sample lines"
+
+    start = time.perf_counter()
+    classifier = CodeLineClassifier()
+    build_time = time.perf_counter() - start
+
+    # Both implementations must agree on every line
+    mismatches = [line for line in lines
+                  if legacy_looks_like_code(line) != classifier.is_code(line)]
+
+    legacy_rate = time_lines(legacy_looks_like_code, lines, args.repeat)
+    compiled_rate = time_lines(classifier.is_code, lines, args.repeat)
+    code_lines = sum(1 for line in lines if classifier.is_code(line))
+
+    print("=== Code Line Classifier ===\n")
+    print(f"Lines:      {len(lines)} ({code_lines} code) from {source}")
+    print(f"Build time: {build_time * 1000:.2f}ms")
+    print(f"Before:     {legacy_rate:12,.0f} lines/s")
+    print(f"After:      {compiled_rate:12,.0f} lines/s  ({compiled_rate / legacy_rate:.1f}x)")
+    print(f"Mismatches: {len(mismatches)}")
+    for line in mismatches[:10]:
+        print(f"  {line!r}")
+
+    return 1 if mismatches else 0
+
+
+def profile_languages(args):
+    """Compare the table-driven language detector against the original implementation"""
+    from backend.code_detection import CodeLanguageDetector
+
+    start = time.perf_counter()
+    detector = CodeLanguageDetector()
+    build_time = time.perf_counter() - start
+
+    blocks = [code.split('\n') for _expected, code in LANGUAGE_CORPUS]
+    expected = [language for language, _code in LANGUAGE_CORPUS]
+
+    legacy_results = [legacy_detect_code_language(lines) for lines in blocks]
+    results = [detector.detect(lines) for lines in blocks]
+
+    legacy_correct = sum(1 for got, want in zip(legacy_results, expected) if got == want)
+    correct = sum(1 for got, want in zip(results, expected) if got == want)
+    mismatches = [(want, old, new) for want, old, new in zip(expected, legacy_results, results)
+                  if old != new]
+
+    # Thousands of fragments, as in a large technical PDF
+    workload = blocks * args.scale
+    legacy_rate = time_lines(legacy_detect_code_language, workload, args.repeat)
+    rate = time_lines(detector.detect, workload, args.repeat)
+
+    print("=== Code Language Detection ===\n")
+    print(f"Languages:  {len(detector.languages)}, build time {build_time * 1000:.2f}ms")
+    print(f"Corpus:     {len(blocks)} labelled blocks")
+    print(f"Accuracy:   before {legacy_correct}/{len(blocks)}, after {correct}/{len(blocks)}")
+    for (want, _code), got in zip(LANGUAGE_CORPUS, results):
+        if got != want:
+            print(f"  expected {want or '(none)'!r}, got {got or '(none)'!r}")
+    print(f"Before:     {legacy_rate:12,.0f} blocks/s")
+    print(f"After:      {rate:12,.0f} blocks/s  ({rate / legacy_rate:.1f}x)")
+    print(f"Mismatches: {len(mismatches)}")
+    for want, old, new in mismatches[:10]:
+        print(f"  {want!r}: before {old!r}, after {new!r}")
+
+    return 1 if mismatches else 0
+
+
+def profile_batch(args):
+    """Convert a folder of PDFs and report aggregate pages/s"""
+    from backend.batch_import import BatchImporter
+
+    importer = BatchImporter(args.directory, workers=args.workers, recursive=args.recursive)
+
+    def progress(done, total, result):
+        state = "skipped" if result.skipped else ("ok" if result.success else "FAILED")
+        print(f"[{done}/{total}] {state:7} {result.pages:4d} pages {result.seconds:6.2f}s  "
+              f"{Path(result.pdf_path).name}")
+
+    report = importer.run(progress=progress)
+    print(report.summary())
+    for result in report.failures:
+        print(f"  {result.pdf_path}: {result.error}")
+
+    return 1 if report.failures else 0
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        import psutil  # Windows
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+
+
+def _memory_run(mode: str, pdf_path: str, out_dir: str, results):
+    """Child process of profile_memory: convert once and report peak RSS"""
+    from backend.converter import DocumentConverter
+    from backend.pdf_import import PdfImportOptions
+
+    converter = DocumentConverter()
+    images_dir = str(Path(out_dir) / "images")
+    start = time.perf_counter()
+
+    if mode == "string":
+        success, content, error = converter.pdf_to_markdown(pdf_path, images_dir)
+        size = len(content.encode("utf-8"))
+    else:
+        options = PdfImportOptions(low_memory=(mode == "low-memory"))
+        md_path = Path(out_dir) / "out.md"
+        success, _, error = converter.pdf_to_markdown_file(pdf_path, str(md_path), images_dir,
+                                                           options=options)
+        size = md_path.stat().st_size if success else 0
+
+    results.put((mode, success, error, size, time.perf_counter() - start, peak_rss_mb()))
+
+
+def profile_memory(args):
+    """Peak RSS of a full conversion, each mode in a fresh process"""
+    import multiprocessing
+    import tempfile
+
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{'mode':12} {'peak RSS':>10} {'time':>8} {'output':>10}")
+    failed = False
+    for mode in args.modes:
+        with tempfile.TemporaryDirectory() as out_dir:
+            results = ctx.Queue()
+            process = ctx.Process(target=_memory_run, args=(mode, args.pdf, out_dir, results))
+            process.start()
+            mode, success, error, size, seconds, peak = results.get()
+            process.join()
+
+        if not success:
+            print(f"{mode:12} failed: {error}")
+            failed = True
+            continue
+        print(f"{mode:12} {peak:8.1f}MB {seconds:7.1f}s {size / 1024:8.0f}KB")
+
+    return 1 if failed else 0
+
+
+def profile_tables(args):
+    """Import time without and with the table pre-check, and with fitz tables"""
+    import tempfile
+    from backend.converter import DocumentConverter
+    from backend.pdf_import import PdfImportOptions
+
+    converter = DocumentConverter()
+    configs = [
+        ("plumber, no pre-check", PdfImportOptions(table_precheck=False)),
+        ("plumber, pre-check", PdfImportOptions()),
+        ("fitz, pre-check", PdfImportOptions(table_engine="fitz")),
+    ]
+
+    mismatches = 0
+    for pdf_path in args.pdfs:
+        print(Path(pdf_path).name)
+        baseline = None
+        for name, options in configs:
+            with tempfile.TemporaryDirectory() as out_dir:
+                start = time.perf_counter()
+                success, content, error = converter.pdf_to_markdown(
+                    pdf_path, str(Path(out_dir) / "images"), options=options)
+                elapsed = time.perf_counter() - start
+            if not success:
+                print(f"  {name:22} failed: {error}")
+                continue
+
+            note = ""
+            if baseline is None:
+                baseline = content
+            elif options.table_engine == "pdfplumber" and content != baseline:
+                # The pre-check must never change the pdfplumber result
+                note = "  OUTPUT DIFFERS"
+                mismatches += 1
+            stats = converter.last_import_stats
+            print(f"  {name:22} {elapsed:7.2f}s  skipped {stats.table_pages_skipped}/{stats.pages} pages, "
+                  f"{stats.tables} tables{note}")
+
+    return 1 if mismatches else 0
+
+
+def legacy_group_chars(chars: list) -> list:
+    """Line grouping of the pdfplumber fallback before cluster_char_lines"""
+    lines_by_y = {}
+    for char in chars:
+        y = round(char['top'], 1)  # Round to group nearby chars
+        if y not in lines_by_y:
+            lines_by_y[y] = []
+        lines_by_y[y].append(char)
+
+    lines = []
+    for y in sorted(lines_by_y.keys()):
+        line_chars = sorted(lines_by_y[y], key=lambda c: c['x0'])
+        line_text = ''.join(c['text'] for c in line_chars)
+        fonts = set(c.get('fontname', '') for c in line_chars)
+        lines.append((y, line_text, fonts))
+    return lines
+
+
+def profile_lines(args):
+    """Char-to-line grouping of the pdfplumber fallback (chars/s) before and after"""
+    import pdfplumber
+    from backend.pdf_import import cluster_char_lines
+
+    # page.chars is parsed once up front; only the grouping is timed
+    pages = []
+    for pdf_path in args.pdfs:
+        with pdfplumber.open(pdf_path) as pdf:
+            pages.extend(list(page.chars) for page in pdf.pages)
+    char_count = sum(len(chars) for chars in pages)
+
+    def run(group):
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for chars in pages:
+                group(chars)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    before = run(legacy_group_chars)
+    after = run(cluster_char_lines)
+    old_lines = sum(len(legacy_group_chars(chars)) for chars in pages)
+    new_lines = sum(len(cluster_char_lines(chars)) for chars in pages)
+
+    print(f"{len(pages)} pages, {char_count} chars")
+    print(f"before: {char_count / before:12,.0f} chars/s  {old_lines} lines")
+    print(f"after:  {char_count / after:12,.0f} chars/s  {new_lines} lines")
+    print(f"speedup: {before / after:.1f}x")
+    return 0
+
+
+def legacy_is_monospace_font(font_name: str) -> bool:
+    """Monospace font check as it was called for every span"""
+    monospace_fonts = [
+        'courier', 'consolas', 'monaco', 'menlo', 'inconsolata',
+        'source code', 'sourcecodepro', 'fira code', 'firacode',
+        'fira mono', 'firamono', 'dejavu mono', 'dejavumono',
+        'liberation mono', 'liberationmono', 'droid mono', 'droidmono',
+        'ubuntu mono', 'ubuntumono', 'roboto mono', 'robotomono',
+        'jetbrains mono', 'jetbrainsmono', 'cascadia', 'hack',
+        'mono', 'fixed', 'terminal', 'andale',
+        'd2coding', 'd2 coding', 'nanum gothic coding', 'nanumgothiccoding',
+        '나눔고딕코딩', 'malgun gothic coding',
+        'cour', 'cmtt', 'cmsy', 'lmtt',
+        'nixie', 'ocr', 'typewriter',
+    ]
+    font_lower = font_name.lower().replace(' ', '').replace('-', '').replace('_', '')
+    logger.debug(f"Checking font: {font_name} -> {font_lower}")
+    result = any(mono.replace(' ', '') in font_lower for mono in monospace_fonts)
+    if result:
+        logger.debug(f"  -> Detected as monospace!")
+    return result
+
+
+def legacy_extract_block_lines(converter, block: dict) -> list:
+    """Span walk of the PyMuPDF importer before the font table"""
+    from backend.pdf_import import LineContent
+
+    lines = []
+    for line in block.get("lines", []):
+        line_text = ""
+        is_monospace = False
+        max_font_size = 0
+        is_bold = False
+        is_italic = False
+
+        for span in line.get("spans", []):
+            text = span.get("text", "")
+            font_size = span.get("size", 12)
+            font_name = span.get("font", "").lower()
+
+            max_font_size = max(max_font_size, font_size)
+            if legacy_is_monospace_font(font_name):
+                is_monospace = True
+            if "bold" in font_name or "black" in font_name:
+                is_bold = True
+            if "italic" in font_name or "oblique" in font_name:
+                is_italic = True
+            line_text += text
+
+        if not is_monospace and line_text.strip():
+            is_monospace = converter._looks_like_code(line_text)
+
+        lines.append(LineContent(line_text, max_font_size, is_bold, is_italic, is_monospace))
+    return lines
+
+
+def profile_spans(args):
+    """Span-to-line conversion of the PyMuPDF importer: time and allocations"""
+    import cProfile
+    import pstats
+    import fitz  # PyMuPDF
+    from backend.converter import DocumentConverter
+    from backend.pdf_import import FontTable
+
+    converter = DocumentConverter()
+
+    # Page dicts are read once up front; only the span walk is measured
+    blocks = []
+    for pdf_path in args.pdfs:
+        with fitz.open(pdf_path) as doc:
+            for page in doc:
+                page_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+                blocks.extend(block for block in page_dict["blocks"] if block["type"] == 0)
+    span_count = sum(len(line["spans"]) for block in blocks for line in block["lines"])
+
+    def before():
+        return [legacy_extract_block_lines(converter, block) for block in blocks]
+
+    def after():
+        fonts = FontTable()
+        return [converter._extract_block_lines(block, fonts) for block in blocks]
+
+    if before() != after():
+        print("Line records differ!")
+        return 1
+
+    print(f"{len(blocks)} text blocks, {span_count} spans")
+
+    def measure():
+        for name, run in (("before", before), ("after", after)):
+            best = float('inf')
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                run()
+                best = min(best, time.perf_counter() - start)
+
+            # Function calls stand in for the per-span temporaries (font name
+            # copies, the marker list, concatenated strings) they create
+            profiler = cProfile.Profile()
+            profiler.runcall(run)
+            calls = pstats.Stats(profiler).total_calls
+            print(f"  {name:7} {span_count / best:12,.0f} spans/s  {calls:10,} calls")
+
+    print("full line classification:")
+    measure()
+
+    # The content-based code check is shared by both versions; leave it
+    # out to see the span walk itself
+    converter._looks_like_code = lambda text: False
+    print("span walk only (content code check excluded):")
+    measure()
+    return 0
+
+
+LAYOUT_WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor".split()
+
+
+def _layout_text(marker: str, words: int = 40) -> str:
+    """Paragraph starting with a marker that can be found in the Markdown"""
+    return marker + " " + " ".join(LAYOUT_WORDS[i % len(LAYOUT_WORDS)] for i in range(words))
+
+
+def build_layout_pdfs(out_dir: Path) -> list:
+    """
+    Synthetic PDFs for the reading-order check
+
+    Multi-column pages are written in row order (the first paragraph of
+    every column, then the second, ...) so the PDF stream order is
+    interleaved, like many generated and typeset PDFs.
+
+    Returns:
+        (name, pdf_path, expected marker order) tuples
+    """
+    import fitz  # PyMuPDF
+
+    cases = []
+
+    def columns(page, top, count, rows, prefix, row_height=110, margin=50, gap=24):
+        """Fill count columns row by row; returns markers in reading order"""
+        width = (page.rect.width - 2 * margin - (count - 1) * gap) / count
+        for row in range(rows):
+            for col in range(count):
+                x0 = margin + col * (width + gap)
+                y0 = top + row * row_height
+                page.insert_textbox(fitz.Rect(x0, y0, x0 + width, y0 + row_height - 10),
+                                    _layout_text(f"Q{prefix}{col}{row}", 24), fontsize=9)
+        return [f"Q{prefix}{col}{row}" for col in range(count) for row in range(rows)]
+
+    def wide(page, y0, marker, height=40):
+        page.insert_textbox(fitz.Rect(50, y0, page.rect.width - 50, y0 + height),
+                            _layout_text(marker, 30), fontsize=9)
+        return [marker]
+
+    for count in (2, 3):
+        doc = fitz.open()
+        page = doc.new_page()
+        expected = wide(page, 60, "QTITLE")
+        expected += columns(page, 120, count, 5, "A")
+        path = out_dir / f"columns{count}.pdf"
+        doc.save(path)
+        cases.append((f"{count} columns, interleaved", path, expected))
+
+    # Column sections separated by a full-width paragraph, centered page number
+    doc = fitz.open()
+    page = doc.new_page()
+    expected = wide(page, 60, "QTITLE")
+    expected += columns(page, 110, 2, 3, "A")
+    expected += wide(page, 450, "QWIDE")
+    expected += columns(page, 510, 2, 2, "B")
+    page.insert_text((page.rect.width / 2 - 4, 780), "QPAGE", fontsize=8)
+    expected += ["QPAGE"]
+    path = out_dir / "sections.pdf"
+    doc.save(path)
+    cases.append(("2 columns with a wide break", path, expected))
+
+    # Single column with a label/value list: stream order must be kept
+    doc = fitz.open()
+    page = doc.new_page()
+    expected = wide(page, 60, "QINTRO")
+    for row in range(8):
+        y = 130 + row * 30
+        page.insert_text((60, y), f"QKEY{row}", fontsize=10)
+        page.insert_text((200, y), f"QVAL{row} " + " ".join(LAYOUT_WORDS[:5]), fontsize=10)
+        expected += [f"QKEY{row}", f"QVAL{row}"]
+    expected += wide(page, 400, "QOUTRO")
+    path = out_dir / "labels.pdf"
+    doc.save(path)
+    cases.append(("single column label list", path, expected))
+
+    return cases
+
+
+def profile_columns(args):
+    """Reading order on synthetic multi-column PDFs, and ordering cost per page"""
+    import re
+    import random
+    import tempfile
+    from types import SimpleNamespace
+    from backend.converter import DocumentConverter
+    from backend.pdf_layout import order_blocks
+
+    converter = DocumentConverter()
+    failures = 0
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        for name, pdf_path, expected in build_layout_pdfs(Path(out_dir)):
+            success, content, error = converter.pdf_to_markdown(str(pdf_path), str(Path(out_dir) / "images"))
+            found = re.findall(r"Q[A-Z]+\d*", content) if success else []
+            ok = found == expected
+            failures += not ok
+            print(f"{'ok' if ok else 'FAIL':4} {name}")
+            if not ok:
+                print(f"     expected {expected}\n     got      {found or error}")
+
+    # Ordering cost on dense pages: n blocks in 4 columns
+    page_rect = SimpleNamespace(x0=0.0, x1=612.0)
+    random.seed(1)
+    print("order_blocks on dense 4-column pages:")
+    for count in (1000, 4000, 16000):
+        blocks = []
+        for _ in range(count):
+            col = random.randrange(4)
+            x0 = 40 + col * 140 + random.random() * 5
+            y0 = random.random() * 700
+            blocks.append({"bbox": (x0, y0, x0 + 110, y0 + 8)})
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            order_blocks(blocks, page_rect)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        print(f"  {count:6} blocks  {elapsed * 1000:8.2f} ms  {elapsed / count * 1e6:6.2f} us/block")
+
+    return 1 if failures else 0
+
+
+def build_running_header_pdf(out_dir: Path, pages: int = 12) -> tuple:
+    """
+    Synthetic book for the header/footer check
+
+    A cover page with its title and date inside the edge regions, then
+    pages with a running header printed lower than a fixed 5% band,
+    alternating left/right page headers and page number footers.
+
+    Returns:
+        (pdf_path, markers that must be kept, markers that must be removed)
+    """
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    cover = doc.new_page()
+    cover.insert_text((72, 36), "QCOVERTITLE Annual Report", fontsize=12)
+    cover.insert_text((72, 800), "QCOVERDATE 2024-03-01", fontsize=10)
+    keep = ["QCOVERTITLE", "QCOVERDATE"]
+
+    for page_num in range(2, pages + 1):
+        page = doc.new_page()
+        page.insert_text((72, 66), f"QRUNNING Annual Report {page_num}", fontsize=9)
+        side = "QLEFT Part One" if page_num % 2 else "QRIGHT Chapter Notes"
+        page.insert_text((360, 40), side, fontsize=8)
+        page.insert_textbox(fitz.Rect(72, 120, 520, 700), _layout_text(f"QBODY{page_num}", 80), fontsize=10)
+        page.insert_text((290, 810), f"- {page_num} -", fontsize=9)
+        keep.append(f"QBODY{page_num}")
+
+    path = out_dir / "running.pdf"
+    doc.save(path)
+    return path, keep, ["QRUNNING", "QLEFT", "QRIGHT"]
+
+
+def legacy_normalize_for_comparison(text: str) -> str:
+    """Header/footer normalization as before (patterns compiled on every call)"""
+    import re
+
+    text = text.strip()
+    for pattern in [r'^-?\s*\d+\s*-?$', r'^page\s*\d+$', r'^\d+\s*/\s*\d+$',
+                    r'^p\.?\s*\d+$', r'^\d+\s*페이지$', r'^제?\s*\d+\s*쪽$']:
+        if re.match(pattern, text, re.IGNORECASE):
+            return ""
+    text = re.sub(r'\s*-?\s*\d+\s*-?\s*$', '', text)
+    text = re.sub(r'^\s*-?\s*\d+\s*-?\s*', '', text)
+    text = re.sub(r'\s*page\s*\d+\s*', ' ', text, flags=re.IGNORECASE)
+    text = re.sub(r'\s*\d+\s*/\s*\d+\s*', ' ', text)
+    for pattern in [r'\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}', r'\d{1,2}[-/\.]\d{1,2}[-/\.]\d{4}',
+                    r'\d{4}년\s*\d{1,2}월\s*\d{1,2}일']:
+        text = re.sub(pattern, '', text)
+    return text.strip()
+
+
+def profile_headers(args):
+    """Running header/footer removal on a synthetic book, and first-pass cost"""
+    import re
+    import tempfile
+    import fitz  # PyMuPDF
+    from backend.converter import DocumentConverter
+    from backend.pdf_layout import RunningTextIndex, RUNNING_TEXT_SAMPLE_PAGES, normalize_running_text
+
+    converter = DocumentConverter()
+    failures = 0
+
+    # 95 pages is longer than the running text sample and has an even sample
+    # step, which left the odd-page headers out of a sample of single pages
+    for pages in (12, 95):
+        with tempfile.TemporaryDirectory() as out_dir:
+            pdf_path, keep, drop = build_running_header_pdf(Path(out_dir), pages)
+            success, content, error = converter.pdf_to_markdown(str(pdf_path), str(Path(out_dir) / "images"))
+            found = set(re.findall(r"Q[A-Z]+\d*", content)) if success else set()
+            missing = [marker for marker in keep if marker not in found]
+            leaked = [marker for marker in drop if marker in found]
+            page_numbers = re.findall(r"^- \d+ -$", content, re.MULTILINE)
+            for label, problems in (("content kept", missing), ("running headers removed", leaked),
+                                    ("page numbers removed", page_numbers)):
+                failures += bool(problems)
+                print(f"{'FAIL' if problems else 'ok':4} {pages} pages: {label}"
+                      + (f": {problems}" if problems else ""))
+            if not success:
+                print(f"     {error}")
+
+    # Normalization throughput, patterns compiled per call vs once
+    samples = ["Annual Report 17", "- 17 -", "Page 3 of 10", "Chapter Notes 2024-03-01",
+               "QBODY lorem ipsum dolor sit amet", "12 페이지"] * 2000
+    for label, normalize in (("before", legacy_normalize_for_comparison), ("after", normalize_running_text)):
+        start = time.perf_counter()
+        for text in samples:
+            normalize(text)
+        elapsed = time.perf_counter() - start
+        print(f"normalize {label:6} {len(samples) / elapsed:10.0f} texts/s")
+
+    # Cost of the first pass over real documents, all pages vs the sample
+    for pdf in args.pdfs:
+        with fitz.open(pdf) as doc:
+            indexes = {}
+            for label, max_pages in (("all", None), ("sampled", RUNNING_TEXT_SAMPLE_PAGES)):
+                start = time.perf_counter()
+                indexes[label] = RunningTextIndex.build(doc, max_pages=max_pages)
+                elapsed = time.perf_counter() - start
+                print(f"{Path(pdf).name}: {label:7} index of {indexes[label].page_count} pages "
+                      f"in {elapsed:.2f}s, {len(indexes[label].running_keys())} running texts")
+            if indexes["all"].running_keys() != indexes["sampled"].running_keys():
+                failures += 1
+                print(f"FAIL {Path(pdf).name}: sampled running texts differ from the full index")
+
+    return 1 if failures else 0
+
+
+def build_figure_pdf(out_dir: Path) -> Path:
+    """
+    Synthetic PDF for the vector figure check
+
+    Page 1 has a box-and-arrow diagram between two paragraphs, a rounded
+    callout box around text, a ruled table and underlined text. Page 2 is
+    drawing-heavy: a line plot made of a few thousand segments.
+    """
+    import math
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_textbox(fitz.Rect(72, 60, 520, 110), _layout_text("QINTRO", 30), fontsize=10)
+
+    # Diagram: three labelled boxes joined by arrows, and a circle
+    for idx, x in enumerate((90, 250, 410)):
+        page.draw_rect(fitz.Rect(x, 140, x + 100, 190), color=(0, 0, 0.6), fill=(0.85, 0.9, 1))
+        page.insert_text((x + 20, 170), f"QLABEL{idx}", fontsize=9)
+        if idx:
+            page.draw_line((x - 60, 165), (x, 165), color=(0, 0, 0))
+            page.draw_polyline([(x - 8, 160), (x, 165), (x - 8, 170)], color=(0, 0, 0))
+    page.draw_circle((300, 240), 25, color=(0.6, 0, 0))
+    page.draw_line((300, 190), (300, 215), color=(0, 0, 0))
+
+    page.insert_textbox(fitz.Rect(72, 290, 520, 340), _layout_text("QAFTER", 30), fontsize=10)
+
+    # Callout: rounded frame around a paragraph, stays text
+    page.draw_rect(fitz.Rect(72, 350, 520, 420), color=(0.5, 0.5, 0.5), radius=0.1)
+    page.insert_textbox(fitz.Rect(80, 358, 512, 414), _layout_text("QCALLOUT", 30), fontsize=10)
+
+    # Ruled table, becomes a Markdown table
+    for row in range(4):
+        page.draw_line((72, 450 + row * 20), (372, 450 + row * 20), color=(0, 0, 0), width=0.5)
+    for col in range(4):
+        page.draw_line((72 + col * 100, 450), (72 + col * 100, 510), color=(0, 0, 0), width=0.5)
+    for row in range(3):
+        for col in range(3):
+            page.insert_text((78 + col * 100, 464 + row * 20), f"QCELL{row}{col}", fontsize=8)
+
+    # Underlined text
+    page.insert_text((72, 560), "QLINK see the documentation", fontsize=10)
+    page.draw_line((72, 562), (220, 562), color=(0, 0, 1))
+
+    # Drawing-heavy page: a plot of a few thousand segments with axes
+    page = doc.new_page()
+    page.insert_textbox(fitz.Rect(72, 60, 520, 110), _layout_text("QPLOT", 30), fontsize=10)
+    shape = page.new_shape()
+    shape.draw_line((80, 420), (520, 420))
+    shape.draw_line((80, 420), (80, 140))
+    points = [(80 + i * 0.15, 280 - 120 * math.sin(i / 60) * math.cos(i / 7)) for i in range(2900)]
+    for a, b in zip(points, points[1:]):
+        shape.draw_line(a, b)
+    shape.finish(color=(0, 0.3, 0), width=0.5)
+    shape.commit()
+    page.insert_text((280, 440), "QAXIS time", fontsize=9)
+
+    path = out_dir / "figures.pdf"
+    doc.save(path)
+    return path
+
+
+def profile_figures(args):
+    """Vector figure capture on a synthetic PDF, and its cost per page by DPI"""
+    import re
+    import tempfile
+    from backend.converter import DocumentConverter
+    from backend.pdf_import import PdfImportOptions, PdfImportSession, ImageBlockContent
+
+    converter = DocumentConverter()
+    failures = 0
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        pdf_path = build_figure_pdf(Path(out_dir))
+        images_dir = Path(out_dir) / "images"
+        success, content, error = converter.pdf_to_markdown(
+            str(pdf_path), str(images_dir), options=PdfImportOptions()
+        )
+        markers = re.findall(r"Q[A-Z]+\d*", content) if success else []
+        images = re.findall(r"!\[[^\]]*\]\(([^)]+)\)", content)
+
+        checks = [
+            ("two figures linked", len(images) == 2),
+            ("figure files written", all((Path(out_dir) / image).exists() for image in images)),
+            ("figure between its paragraphs", bool(re.search(r"QINTRO[^!]*!\[[^Q]*QAFTER", content))),
+            ("diagram labels only in the figure", not any(m.startswith("QLABEL") for m in markers)),
+            ("callout kept as text", "QCALLOUT" in markers),
+            ("table kept as Markdown", "| QCELL00" in content),
+            ("underlined text kept", "QLINK" in markers),
+        ]
+        for label, ok in checks:
+            failures += not ok
+            print(f"{'ok' if ok else 'FAIL':4} {label}")
+        if not success:
+            print(f"     {error}")
+
+        # Extraction time per page with figure capture off and at each DPI
+        pdfs = [Path(pdf) for pdf in args.pdfs] or [pdf_path]
+        runs = [("off", PdfImportOptions(vector_figures=False))]
+        runs += [(f"{dpi} dpi", PdfImportOptions(figure_dpi=dpi)) for dpi in args.dpi]
+        for pdf in pdfs:
+            with PdfImportSession(pdf) as session:
+                for label, options in runs:
+                    start = time.perf_counter()
+                    figures = pixels = 0
+                    for page_idx in range(session.page_count):
+                        page_content = converter._extract_page_content(session, page_idx, options)
+                        for block in page_content.blocks:
+                            if isinstance(block, ImageBlockContent) and block.ext == "png":
+                                figures += 1
+                                pixels += block.width * block.height
+                        session.release_page(page_idx)
+                    elapsed = time.perf_counter() - start
+                    print(f"{pdf.name} figures {label:8}: {elapsed / session.page_count * 1000:7.1f} ms/page, "
+                          f"{figures} png images, {pixels / 1e6:.1f} MP")
+
+    return 1 if failures else 0
+
+
+def build_long_pdf(out_dir: Path, pages: int) -> Path:
+    """Synthetic text PDF with a heading and a few paragraphs per page"""
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    for page_num in range(1, pages + 1):
+        page = doc.new_page()
+        page.insert_text((72, 80), f"Page {page_num}", fontsize=16)
+        page.insert_textbox(fitz.Rect(72, 100, 520, 760), _layout_text(f"P{page_num}", 300), fontsize=10)
+    path = out_dir / "long.pdf"
+    doc.save(path)
+    return path
+
+
+def _scroll_through(pdf_path, cache, width: int, screen: int, step_px: int, reverse: bool = False):
+    """
+    Scroll a viewer-sized window over every page the way PdfPageView does
+
+    Returns:
+        (frame times in ms, tiles rendered, tiles served by the cache, peak cache bytes)
+    """
+    from backend.pdf_source import TileRenderer, TILE_HEIGHT, ZOOM_STEPS, page_sizes, tile_rows, zoom_step
+
+    sizes = page_sizes(pdf_path)
+    zoom = width / max(w for w, _h in sizes)
+    step = zoom_step(zoom)
+    row_height = TILE_HEIGHT / (step / ZOOM_STEPS) * zoom
+
+    # Tile rows in document order with their top in view coordinates
+    rows, top = [], 0.0
+    for page_idx, (_w, h) in enumerate(sizes):
+        for row in range(tile_rows(h, step)):
+            rows.append(((page_idx, step, row), top + row * row_height))
+        top += h * zoom
+    total_height = top
+
+    renderer = TileRenderer(pdf_path)
+    frames, rendered, hits, peak = [], 0, 0, 0
+    positions = range(0, int(total_height) - screen, step_px)
+    for y in (reversed(positions) if reverse else positions):
+        start = time.perf_counter()
+        for key, row_top in rows:
+            if row_top + row_height < y or row_top > y + screen:
+                continue
+            if cache.get(key) is None:
+                cache.put(key, renderer.render(key))
+                rendered += 1
+            else:
+                hits += 1
+        frames.append((time.perf_counter() - start) * 1000)
+        peak = max(peak, cache.stats()["bytes"])
+    renderer.close()
+    return frames, rendered, hits, peak
+
+
+def profile_viewer(args):
+    """PDF source viewer: tile render cost, scrolling a long PDF, cache bounds and disk spill"""
+    import tempfile
+    from backend.pdf_source import TileCache, TileRenderer, PageMarkers, page_sizes
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as out_dir:
+        pdf_path = Path(args.pdf) if args.pdf else build_long_pdf(Path(out_dir), args.pages)
+        page_count = len(page_sizes(pdf_path))
+        print(f"{pdf_path.name}: {page_count} pages, {args.width}px wide, {args.screen}px screen")
+
+        # Cost of one tile with and without the page's display list cached
+        renderer = TileRenderer(pdf_path)
+        cold, warm = [], []
+        for page_idx in range(0, page_count, max(page_count // 20, 1)):
+            start = time.perf_counter()
+            renderer.render((page_idx, 20, 0))
+            cold.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            renderer.render((page_idx, 20, 1))
+            warm.append((time.perf_counter() - start) * 1000)
+        renderer.close()
+        print(f"tile render: {sum(cold) / len(cold):.1f} ms first on a page, "
+              f"{sum(warm) / len(warm):.1f} ms from its display list")
+
+        # Scroll top to bottom and back with a small memory budget
+        budget = args.memory_mb * 1024 * 1024
+        for spill in (False, True):
+            cache = TileCache(max_bytes=budget, spill=spill)
+            down = _scroll_through(pdf_path, cache, args.width, args.screen, args.step)
+            up = _scroll_through(pdf_path, cache, args.width, args.screen, args.step, reverse=True)
+            stats = cache.stats()
+            cache.close()
+
+            label = "spill" if spill else "memory"
+            for direction, (frames, rendered, hits, peak) in (("down", down), ("up", up)):
+                frames.sort()
+                print(f"{label:6} {direction:4}: {len(frames)} frames, "
+                      f"p50 {frames[len(frames) // 2]:.1f} ms, p99 {frames[int(len(frames) * 0.99)]:.1f} ms, "
+                      f"max {frames[-1]:.1f} ms, {rendered} rendered, {hits} cached, "
+                      f"peak {peak / (1024 * 1024):.1f} MB")
+            ok = max(down[3], up[3]) <= budget
+            failures += not ok
+            print(f"{'ok' if ok else 'FAIL':4} memory stays within {args.memory_mb} MB"
+                  f" ({stats['spilled_tiles']} tiles spilled, {stats['spilled_bytes'] / (1024 * 1024):.1f} MB)")
+            if spill:
+                ok = up[1] < down[1]
+                failures += not ok
+                print(f"{'ok' if ok else 'FAIL':4} scrolling back reads spilled tiles instead of rendering")
+
+        # Editor line <-> page position round trip
+        markers = PageMarkers([page * 40 for page in range(page_count)], page_count * 40)
+        ok = all(abs(markers.page_at_line(markers.line_at_page(pos / 4)) - pos / 4) < 0.05
+                 for pos in range(page_count * 4))
+        failures += not ok
+        print(f"{'ok' if ok else 'FAIL':4} page markers round trip")
+
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saekim PDF import profiling")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    classifier_parser = subparsers.add_parser(
+        "classifier", help="code line classifier throughput (lines/s) before and after")
+    classifier_parser.add_argument("pdfs", nargs="*", help="PDFs to take lines from")
+    classifier_parser.add_argument("--repeat", type=int, default=5)
+    classifier_parser.set_defaults(func=profile_classifier)
+
+    languages_parser = subparsers.add_parser(
+        "languages", help="code language detection accuracy and throughput (blocks/s)")
+    languages_parser.add_argument("--scale", type=int, default=100,
+                                  help="times the labelled corpus is repeated for timing")
+    languages_parser.add_argument("--repeat", type=int, default=3)
+    languages_parser.set_defaults(func=profile_languages)
+
+    batch_parser = subparsers.add_parser(
+        "batch", help="convert every PDF in a folder (resumable) and report pages/s")
+    batch_parser.add_argument("directory")
+    batch_parser.add_argument("--workers", type=int, default=0, help="0 = one per CPU core")
+    batch_parser.add_argument("--recursive", action="store_true")
+    batch_parser.set_defaults(func=profile_batch)
+
+    memory_parser = subparsers.add_parser(
+        "memory", help="peak RSS of in-memory, streamed and low-memory conversion")
+    memory_parser.add_argument("pdf")
+    memory_parser.add_argument("--modes", nargs="+", default=["string", "file", "low-memory"],
+                               choices=["string", "file", "low-memory"])
+    memory_parser.set_defaults(func=profile_memory)
+
+    tables_parser = subparsers.add_parser(
+        "tables", help="table stage cost with and without the ruling-line pre-check")
+    tables_parser.add_argument("pdfs", nargs="+")
+    tables_parser.set_defaults(func=profile_tables)
+
+    lines_parser = subparsers.add_parser(
+        "lines", help="pdfplumber fallback char-to-line grouping throughput")
+    lines_parser.add_argument("pdfs", nargs="+")
+    lines_parser.add_argument("--repeat", type=int, default=5)
+    lines_parser.set_defaults(func=profile_lines)
+
+    spans_parser = subparsers.add_parser(
+        "spans", help="PyMuPDF span walk throughput and allocations before and after")
+    spans_parser.add_argument("pdfs", nargs="+")
+    spans_parser.add_argument("--repeat", type=int, default=5)
+    spans_parser.set_defaults(func=profile_spans)
+
+    columns_parser = subparsers.add_parser(
+        "columns", help="reading order on synthetic multi-column PDFs")
+    columns_parser.add_argument("--repeat", type=int, default=5)
+    columns_parser.set_defaults(func=profile_columns)
+
+    headers_parser = subparsers.add_parser(
+        "headers", help="running header/footer removal and first-pass index cost")
+    headers_parser.add_argument("pdfs", nargs="*", help="PDFs to time the first pass on")
+    headers_parser.set_defaults(func=profile_headers)
+
+    figures_parser = subparsers.add_parser(
+        "figures", help="vector figure capture checks and cost per page by DPI")
+    figures_parser.add_argument("pdfs", nargs="*", help="PDFs to time (default: the synthetic one)")
+    figures_parser.add_argument("--dpi", type=int, nargs="+", default=[72, 150, 300])
+    figures_parser.set_defaults(func=profile_figures)
+
+    viewer_parser = subparsers.add_parser(
+        "viewer", help="PDF source viewer tile rendering, scrolling and cache bounds")
+    viewer_parser.add_argument("pdf", nargs="?", help="PDF to scroll (default: a synthetic one)")
+    viewer_parser.add_argument("--pages", type=int, default=500, help="pages of the synthetic PDF")
+    viewer_parser.add_argument("--width", type=int, default=600, help="viewer width in pixels")
+    viewer_parser.add_argument("--screen", type=int, default=900, help="viewer height in pixels")
+    viewer_parser.add_argument("--step", type=int, default=120, help="pixels scrolled per frame")
+    viewer_parser.add_argument("--memory-mb", type=int, default=32)
+    viewer_parser.set_defaults(func=profile_viewer)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -443,6 +443,23 @@ window.setEditorContent = function (content) {
     }
 };
 
+// Global function for appending streamed content (PDF import) from Python backend
+window.appendEditorContent = function (content) {
+    if (typeof EditorModule !== 'undefined' && EditorModule.appendContent) {
+        EditorModule.appendContent(content);
+        App.state.editorContent = EditorModule.getContent();
+    } else {
+        console.error('❌ EditorModule not available');
+    }
+};
+
+// Global function for blocking edits while content streams in from Python backend
+window.setEditorReadOnly = function (readOnly) {
+    if (typeof EditorModule !== 'undefined' && EditorModule.setReadOnly) {
+        EditorModule.setReadOnly(readOnly);
+    }
+};
+
 // Global function for setting current file path from Python backend
 window.setCurrentFile = function (filePath) {
     App.state.currentFile = filePath;
@@ -76,11 +76,28 @@ const EditorModule = {
             }
         });
 
+        // Report the top line so the PDF source viewer can follow.
+        // Throttled while scrolling, plus one report once scrolling stops
+        const reportScroll = Utils.throttle(() => this.reportTopLine(), 100);
+        const reportScrollEnd = Utils.debounce(() => this.reportTopLine(), 150);
+
         // Scroll synchronization
         this.editor.addEventListener('scroll', () => {
             if (typeof PreviewModule !== 'undefined') {
                 PreviewModule.syncScroll(this.editor);
             }
+
+            // Scrolls requested by the PDF viewer are not reported back
+            if (this.scrollingFromSource) {
+                this.scrollingFromSource = false;
+                return;
+            }
+            reportScroll();
+            reportScrollEnd();
+        });
+
+        this.editor.addEventListener('input', () => {
+            this.lineCount = null;
         });
     },
 
@@ -97,6 +114,7 @@ const EditorModule = {
     setContent(content) {
         if (this.editor) {
             this.editor.value = content;
+            this.lineCount = null;
             this.updateWordCount();
 
             if (typeof PreviewModule !== 'undefined') {
@@ -105,11 +123,94 @@ const EditorModule = {
         }
     },
 
+    /**
+     * Append text to the end of the editor (streamed imports)
+     * Keeps the cursor and scroll position; preview refresh is debounced
+     */
+    appendContent(text) {
+        if (!this.editor) return;
+
+        const { selectionStart, selectionEnd, scrollTop } = this.editor;
+        this.editor.value += text;
+        this.lineCount = null;
+        this.editor.setSelectionRange(selectionStart, selectionEnd);
+        this.editor.scrollTop = scrollTop;
+        this.updateWordCount();
+
+        if (!this.schedulePreviewUpdate) {
+            this.schedulePreviewUpdate = Utils.debounce(() => {
+                if (typeof PreviewModule !== 'undefined') {
+                    PreviewModule.update(this.getContent());
+                }
+            }, 300);
+        }
+        this.schedulePreviewUpdate();
+    },
+
+    /**
+     * Block or allow editing (e.g. while a PDF import streams into the editor)
+     */
+    setReadOnly(readOnly) {
+        if (!this.editor) return;
+
+        this.editor.readOnly = readOnly;
+        this.editor.classList.toggle('read-only', readOnly);
+    },
+
+    /**
+     * Number of lines in the editor (cached until the content changes)
+     */
+    getLineCount() {
+        if (this.lineCount == null) {
+            const content = this.getContent();
+            let count = 1;
+            for (let i = content.indexOf('\n'); i !== -1; i = content.indexOf('\n', i + 1)) {
+                count++;
+            }
+            this.lineCount = count;
+        }
+        return this.lineCount;
+    },
+
+    /**
+     * Line at the top of the editor, estimated from the scroll position
+     */
+    getTopLine() {
+        const maxScroll = this.editor.scrollHeight;
+        if (maxScroll <= 0) return 0;
+        return Math.floor(this.editor.scrollTop / maxScroll * this.getLineCount());
+    },
+
+    /**
+     * Tell the backend which line is at the top (PDF source viewer sync)
+     */
+    reportTopLine() {
+        if (!this.editor) return;
+        if (typeof App !== 'undefined' && App.backend && App.backend.editor_scrolled) {
+            App.backend.editor_scrolled(this.getTopLine(), this.getLineCount());
+        }
+    },
+
+    /**
+     * Scroll so a line is at the top (called when the PDF source viewer scrolls)
+     */
+    scrollToLine(line) {
+        if (!this.editor) return;
+        const scrollTop = Math.round(line / this.getLineCount() * this.editor.scrollHeight);
+        const before = this.editor.scrollTop;
+        this.scrollingFromSource = true;
+        this.editor.scrollTop = scrollTop;
+        // No scroll event follows if the position did not change
+        if (this.editor.scrollTop === before) {
+            this.scrollingFromSource = false;
+        }
+    },
+
     /**
      * Insert text at cursor position
      */
     insertText(text) {
-        if (!this.editor) return;
+        if (!this.editor || this.editor.readOnly) return;
 
         const start = this.editor.selectionStart;
         const end = this.editor.selectionEnd;
@@ -134,7 +235,7 @@ const EditorModule = {
      * Wrap selected text with given strings
      */
     wrapSelection(before, after) {
-        if (!this.editor) return;
+        if (!this.editor || this.editor.readOnly) return;
 
         const start = this.editor.selectionStart;
         const end = this.editor.selectionEnd;
@@ -160,6 +160,19 @@ const FileModule = {
             const savePath = pathResult.filepath;
             console.log('✅ 저장 경로 선택됨:', savePath);
 
+            // Print the preview in place when the QtWebEngine engine is selected
+            const engine = await new Promise((resolve) => {
+                if (typeof App.backend.get_pdf_export_engine !== 'function') {
+                    resolve('playwright');
+                    return;
+                }
+                App.backend.get_pdf_export_engine(resolve);
+            });
+            if (engine === 'qt') {
+                await this.exportToPDFNative(savePath);
+                return;
+            }
+
             // Step 2: NOW show progress modal and start conversion
             this.showPDFProgress(0, '시작 중...', 'PDF 변환을 준비하고 있습니다...');
 
@@ -221,118 +234,7 @@ const FileModule = {
             }
 
             // Convert Mermaid SVGs to PNG images for better PDF compatibility
-            const svgs = clonedPreview.querySelectorAll('.mermaid-container svg');
-            console.log(`🔄 Converting ${svgs.length} Mermaid diagrams to PNG...`);
-
-            if (svgs.length === 0) {
-                this.showPDFProgress(70, 'HTML 준비 중...', '다이어그램이 없습니다. 다음 단계로 진행합니다...');
-            } else {
-                this.showPDFProgress(10, '다이어그램 변환 중...', `${svgs.length}개의 Mermaid 다이어그램을 이미지로 변환하고 있습니다...`);
-            }
-
-            let completedSVGs = 0;
-            const totalSVGs = svgs.length;
-
-            const svgConversionPromises = Array.from(svgs).map(async (svg, index) => {
-                try {
-                    // Serialize SVG to string
-                    const svgData = new XMLSerializer().serializeToString(svg);
-
-                    // Convert SVG to Base64 Data URL (avoids CORS issues)
-                    const base64SVG = btoa(unescape(encodeURIComponent(svgData)));
-                    const svgDataUrl = `data:image/svg+xml;base64,${base64SVG}`;
-
-                    // Create an image from SVG
-                    const img = new Image();
-                    img.crossOrigin = 'anonymous'; // Prevent CORS issues
-
-                    return new Promise((resolve, reject) => {
-                        img.onload = () => {
-                            try {
-                                // Create canvas with appropriate size
-                                const canvas = document.createElement('canvas');
-                                const scale = 2; // Higher resolution for better quality
-
-                                // Get SVG dimensions
-                                let svgWidth = svg.viewBox.baseVal.width || svg.width.baseVal.value || 800;
-                                let svgHeight = svg.viewBox.baseVal.height || svg.height.baseVal.value || 600;
-
-                                // Maximum size for A4 page (in pixels at 96 DPI)
-                                // A4 width with margins: ~14cm = ~530px
-                                // A4 height with margins: ~22cm = ~830px
-                                const MAX_WIDTH = 530;
-                                const MAX_HEIGHT = 830;
-
-                                // Calculate scaling factor to fit within max dimensions
-                                const widthRatio = MAX_WIDTH / svgWidth;
-                                const heightRatio = MAX_HEIGHT / svgHeight;
-                                const scaleFactor = Math.min(widthRatio, heightRatio, 1); // Don't upscale
-
-                                // Apply scaling
-                                svgWidth = svgWidth * scaleFactor;
-                                svgHeight = svgHeight * scaleFactor;
-
-                                canvas.width = svgWidth * scale;
-                                canvas.height = svgHeight * scale;
-
-                                const ctx = canvas.getContext('2d');
-                                ctx.fillStyle = 'white'; // White background
-                                ctx.fillRect(0, 0, canvas.width, canvas.height);
-                                ctx.scale(scale, scale);
-                                ctx.drawImage(img, 0, 0, svgWidth, svgHeight);
-
-                                // Convert to PNG
-                                const pngUrl = canvas.toDataURL('image/png');
-
-                                // Replace SVG with IMG tag
-                                const imgElement = document.createElement('img');
-                                imgElement.src = pngUrl;
-                                imgElement.style.maxWidth = '100%';
-                                imgElement.style.height = 'auto';
-                                imgElement.alt = `Mermaid diagram ${index + 1}`;
-
-                                svg.parentElement.replaceChild(imgElement, svg);
-
-                                console.log(`✅ Converted diagram ${index + 1}`);
-
-                                // Update progress
-                                completedSVGs++;
-                                const svgProgress = (completedSVGs / totalSVGs) * 60; // SVG conversion: 10% - 70%
-                                this.showPDFProgress(
-                                    10 + svgProgress,
-                                    '다이어그램 변환 중...',
-                                    `${completedSVGs}/${totalSVGs} 다이어그램 변환 완료`
-                                );
-
-                                resolve();
-                            } catch (canvasError) {
-                                console.error(`❌ Canvas error for diagram ${index + 1}:`, canvasError);
-                                // Keep original SVG on error
-                                completedSVGs++;
-                                resolve();
-                            }
-                        };
-
-                        img.onerror = (error) => {
-                            console.error(`❌ Failed to load SVG ${index + 1}:`, error);
-                            // Keep original SVG on error
-                            completedSVGs++;
-                            resolve();
-                        };
-
-                        img.src = svgDataUrl;
-                    });
-                } catch (error) {
-                    console.error(`❌ Error processing diagram ${index + 1}:`, error);
-                    // Keep original SVG on error
-                    completedSVGs++;
-                    return Promise.resolve();
-                }
-            });
-
-            // Wait for all SVG conversions to complete
-            await Promise.all(svgConversionPromises);
-            console.log('✅ All diagrams converted to PNG');
+            await this.rasterizeDiagrams(clonedPreview);
 
             this.showPDFProgress(70, 'HTML 준비 중...', '변환된 콘텐츠를 준비하고 있습니다...');
 
@@ -383,60 +285,296 @@ const FileModule = {
             // Step 3: Generate PDF to the selected path
             App.backend.generate_pdf_from_html(renderedHTML, title, savePath, (resultJson) => {
                 clearInterval(progressInterval); // Stop fake progress
+                this.showPDFResult(JSON.parse(resultJson));
+            });
+        } catch (error) {
+            // Hide progress modal on error
+            this.hidePDFProgress();
+            console.error('❌ PDF 내보내기 실패:', error);
+            if (typeof Utils !== 'undefined') {
+                Utils.showToast(`PDF 내보내기 오류: ${error.message}`, 'error');
+            }
+        }
+    },
 
-                const result = JSON.parse(resultJson);
+    // Diagrams drawn to a canvas at the same time during export
+    DIAGRAM_CONCURRENCY: 3,
 
-                if (result.success) {
-                    this.showPDFProgress(100, '✅ 완료!', `PDF 생성이 완료되었습니다!`);
+    // Canvas scale of rasterized diagrams (higher resolution for better quality)
+    DIAGRAM_SCALE: 2,
 
-                    // Add success styling
-                    const modalContent = document.querySelector('.modal-content');
-                    if (modalContent) {
-                        modalContent.classList.add('success', 'complete');
-                    }
+    /**
+     * Replace the Mermaid SVGs of the export copy with PNG images
+     * Diagrams whose source, theme and scale are unchanged since an earlier
+     * export come from the backend's diagram cache; only the rest are drawn
+     * to a canvas, a few at a time, and stored for the next export
+     */
+    async rasterizeDiagrams(container) {
+        const svgs = Array.from(container.querySelectorAll('.mermaid-container svg'));
+        console.log(`🔄 Converting ${svgs.length} Mermaid diagrams to PNG...`);
 
-                    console.log('✅ PDF 생성 성공:', result.filepath);
-
-                    // Show completion message for 2 seconds, then hide
-                    setTimeout(() => {
-                        this.hidePDFProgress();
-                        // Remove success classes
-                        if (modalContent) {
-                            modalContent.classList.remove('success', 'complete');
-                        }
-                        if (typeof Utils !== 'undefined') {
-                            Utils.showToast(`PDF를 생성했습니다\n${result.filepath}`, 'success');
-                        }
-                    }, 2000);
-                } else if (result.error !== 'Cancelled') {
-                    clearInterval(progressInterval); // Stop fake progress on error
-                    this.hidePDFProgress();
-                    console.error('❌ PDF 생성 실패:', result.error);
+        if (svgs.length === 0) {
+            this.showPDFProgress(70, 'HTML 준비 중...', '다이어그램이 없습니다. 다음 단계로 진행합니다...');
+            return;
+        }
+        this.showPDFProgress(10, '다이어그램 변환 중...', `${svgs.length}개의 Mermaid 다이어그램을 이미지로 변환하고 있습니다...`);
+
+        const diagrams = svgs.map((svg) => {
+            const parent = svg.closest('.mermaid-container');
+            return {
+                svg,
+                source: parent.dataset.source || '',
+                theme: parent.dataset.theme || 'default',
+                key: null,
+                pngUrl: null
+            };
+        });
+
+        // Look up the diagrams that have a source (all but ones rendered before it was recorded)
+        const cacheable = diagrams.filter((diagram) => diagram.source);
+        if (cacheable.length > 0 && typeof App.backend.get_cached_diagrams === 'function') {
+            const lookup = await new Promise((resolve) => {
+                const request = cacheable.map(({ source, theme }) => ({ source, theme, scale: this.DIAGRAM_SCALE }));
+                App.backend.get_cached_diagrams(JSON.stringify(request), (resultJson) => {
+                    resolve(JSON.parse(resultJson));
+                });
+            });
+            if (lookup.success) {
+                lookup.diagrams.forEach((cached, index) => {
+                    cacheable[index].key = cached.key;
+                    cacheable[index].pngUrl = cached.data_url;
+                });
+            }
+        }
 
-                    // Provide helpful error messages
-                    let errorMessage = 'PDF 생성 실패';
-                    if (result.error.includes('Playwright')) {
-                        errorMessage = 'Playwright가 필요합니다. pip install playwright && playwright install chromium';
-                    } else {
-                        errorMessage = `PDF 생성 실패: ${result.error}`;
-                    }
+        const totalSVGs = diagrams.length;
+        let completedSVGs = 0;
+        const reportProgress = () => {
+            completedSVGs++;
+            const svgProgress = (completedSVGs / totalSVGs) * 60; // SVG conversion: 10% - 70%
+            this.showPDFProgress(
+                10 + svgProgress,
+                '다이어그램 변환 중...',
+                `${completedSVGs}/${totalSVGs} 다이어그램 변환 완료`
+            );
+        };
+
+        const hits = diagrams.filter((diagram) => diagram.pngUrl);
+        hits.forEach((diagram) => {
+            this.replaceSVGWithImage(diagram, diagrams.indexOf(diagram));
+            reportProgress();
+        });
+        console.log(`♻️ ${hits.length}/${totalSVGs} diagrams reused from cache`);
+
+        const misses = diagrams.filter((diagram) => !diagram.pngUrl);
+        await this.runWithConcurrency(misses, this.DIAGRAM_CONCURRENCY, async (diagram) => {
+            const index = diagrams.indexOf(diagram);
+            try {
+                diagram.pngUrl = await this.rasterizeSVG(diagram.svg);
+                this.replaceSVGWithImage(diagram, index);
+                console.log(`✅ Converted diagram ${index + 1}`);
+            } catch (error) {
+                // Keep original SVG on error
+                console.error(`❌ Error processing diagram ${index + 1}:`, error);
+            }
+            reportProgress();
+        });
 
-                    if (typeof Utils !== 'undefined') {
-                        Utils.showToast(errorMessage, 'error');
-                    }
-                } else {
-                    clearInterval(progressInterval); // Stop fake progress on cancel
-                    this.hidePDFProgress();
-                    console.log('PDF 내보내기 취소됨');
+        const rendered = misses.filter((diagram) => diagram.key && diagram.pngUrl);
+        if (rendered.length > 0 && typeof App.backend.store_diagrams === 'function') {
+            const entries = rendered.map(({ key, pngUrl }) => ({ key, data_url: pngUrl }));
+            App.backend.store_diagrams(JSON.stringify(entries), (resultJson) => {
+                const result = JSON.parse(resultJson);
+                if (!result.success) {
+                    console.warn('⚠️ 다이어그램 캐시 저장 실패:', result.error);
                 }
             });
-        } catch (error) {
-            // Hide progress modal on error
+        }
+
+        // The sources were only needed for the cache keys
+        container.querySelectorAll('.mermaid-container[data-source]').forEach((element) => {
+            delete element.dataset.source;
+        });
+
+        console.log('✅ All diagrams converted to PNG');
+    },
+
+    /**
+     * Run an async worker over items with at most `limit` running at once
+     */
+    async runWithConcurrency(items, limit, worker) {
+        let next = 0;
+        const runners = Array.from({ length: Math.min(limit, items.length) }, async () => {
+            while (next < items.length) {
+                await worker(items[next++]);
+            }
+        });
+        await Promise.all(runners);
+    },
+
+    /**
+     * Draw an SVG element to a canvas and return it as a PNG data URL
+     * The diagram is scaled down to fit an A4 page, never up
+     */
+    rasterizeSVG(svg) {
+        // Serialize SVG to string
+        const svgData = new XMLSerializer().serializeToString(svg);
+
+        // Convert SVG to Base64 Data URL (avoids CORS issues)
+        const base64SVG = btoa(unescape(encodeURIComponent(svgData)));
+        const svgDataUrl = `data:image/svg+xml;base64,${base64SVG}`;
+
+        return new Promise((resolve, reject) => {
+            // Create an image from SVG
+            const img = new Image();
+            img.crossOrigin = 'anonymous'; // Prevent CORS issues
+
+            img.onload = () => {
+                try {
+                    const canvas = document.createElement('canvas');
+                    const scale = this.DIAGRAM_SCALE;
+
+                    // Get SVG dimensions
+                    let svgWidth = svg.viewBox.baseVal.width || svg.width.baseVal.value || 800;
+                    let svgHeight = svg.viewBox.baseVal.height || svg.height.baseVal.value || 600;
+
+                    // Maximum size for A4 page (in pixels at 96 DPI)
+                    // A4 width with margins: ~14cm = ~530px
+                    // A4 height with margins: ~22cm = ~830px
+                    const MAX_WIDTH = 530;
+                    const MAX_HEIGHT = 830;
+
+                    // Calculate scaling factor to fit within max dimensions
+                    const widthRatio = MAX_WIDTH / svgWidth;
+                    const heightRatio = MAX_HEIGHT / svgHeight;
+                    const scaleFactor = Math.min(widthRatio, heightRatio, 1); // Don't upscale
+
+                    // Apply scaling
+                    svgWidth = svgWidth * scaleFactor;
+                    svgHeight = svgHeight * scaleFactor;
+
+                    canvas.width = svgWidth * scale;
+                    canvas.height = svgHeight * scale;
+
+                    const ctx = canvas.getContext('2d');
+                    ctx.fillStyle = 'white'; // White background
+                    ctx.fillRect(0, 0, canvas.width, canvas.height);
+                    ctx.scale(scale, scale);
+                    ctx.drawImage(img, 0, 0, svgWidth, svgHeight);
+
+                    // Convert to PNG
+                    resolve(canvas.toDataURL('image/png'));
+                } catch (canvasError) {
+                    reject(canvasError);
+                }
+            };
+
+            img.onerror = () => reject(new Error('Failed to load SVG'));
+            img.src = svgDataUrl;
+        });
+    },
+
+    /**
+     * Replace a diagram's SVG with an IMG tag showing its PNG
+     */
+    replaceSVGWithImage(diagram, index) {
+        const imgElement = document.createElement('img');
+        imgElement.src = diagram.pngUrl;
+        imgElement.style.maxWidth = '100%';
+        imgElement.style.height = 'auto';
+        imgElement.alt = `Mermaid diagram ${index + 1}`;
+
+        diagram.svg.parentElement.replaceChild(imgElement, diagram.svg);
+    },
+
+    /**
+     * Show the outcome of a PDF export in the progress modal and a toast
+     */
+    showPDFResult(result) {
+        if (result.success) {
+            this.showPDFProgress(100, '✅ 완료!', `PDF 생성이 완료되었습니다!`);
+
+            // Add success styling
+            const modalContent = document.querySelector('.modal-content');
+            if (modalContent) {
+                modalContent.classList.add('success', 'complete');
+            }
+
+            console.log('✅ PDF 생성 성공:', result.filepath);
+
+            // Show completion message for 2 seconds, then hide
+            setTimeout(() => {
+                this.hidePDFProgress();
+                // Remove success classes
+                if (modalContent) {
+                    modalContent.classList.remove('success', 'complete');
+                }
+                if (typeof Utils !== 'undefined') {
+                    Utils.showToast(`PDF를 생성했습니다\n${result.filepath}`, 'success');
+                }
+            }, 2000);
+        } else if (result.error !== 'Cancelled') {
             this.hidePDFProgress();
-            console.error('❌ PDF 내보내기 실패:', error);
+            console.error('❌ PDF 생성 실패:', result.error);
+
+            // Provide helpful error messages
+            let errorMessage = 'PDF 생성 실패';
+            if (result.error.includes('Playwright')) {
+                errorMessage = 'Playwright가 필요합니다. pip install playwright && playwright install chromium';
+            } else {
+                errorMessage = `PDF 생성 실패: ${result.error}`;
+            }
+
             if (typeof Utils !== 'undefined') {
-                Utils.showToast(`PDF 내보내기 오류: ${error.message}`, 'error');
+                Utils.showToast(errorMessage, 'error');
             }
+        } else {
+            this.hidePDFProgress();
+            console.log('PDF 내보내기 취소됨');
+        }
+    },
+
+    /**
+     * Export to PDF by printing the preview with QtWebEngine
+     * Needs no separate browser and keeps diagrams as rendered; the
+     * backend reports completion through onNativePDFFinished
+     */
+    async exportToPDFNative(savePath) {
+        this.showPDFProgress(30, 'PDF 생성 중...', '미리보기를 PDF로 인쇄하고 있습니다...');
+
+        const result = await new Promise((resolve) => {
+            this.nativePDFResolve = resolve;
+            App.backend.print_preview_to_pdf(savePath, (resultJson) => {
+                const started = JSON.parse(resultJson);
+                if (!started.success) {
+                    this.nativePDFResolve = null;
+                    resolve(started);
+                }
+            });
+        });
+
+        this.showPDFResult(result);
+    },
+
+    /**
+     * Called by the backend when a QtWebEngine PDF export has finished
+     */
+    onNativePDFFinished(resultJson) {
+        const resolve = this.nativePDFResolve;
+        this.nativePDFResolve = null;
+        if (resolve) {
+            resolve(JSON.parse(resultJson));
+        }
+    },
+
+    /**
+     * Called by the backend when an exported PDF has been optimized
+     */
+    onPDFOptimized(resultJson) {
+        const result = JSON.parse(resultJson);
+        console.log('🗜️ PDF 최적화 완료:', result.summary, result.filepath);
+        if (typeof Utils !== 'undefined' && result.saved_percent > 0) {
+            Utils.showToast(`PDF 최적화 완료: ${result.summary}`, 'info');
         }
     },
 
@@ -574,23 +712,14 @@ const FileModule = {
                 const result = JSON.parse(resultJson);
 
                 if (result.success) {
-                    console.log('✅ PDF 변환 성공');
-                    console.log('  - 저장된 파일:', result.filepath);
-                    if (result.images_dir) {
-                        console.log('  - 이미지 폴더:', result.images_dir);
-                    }
-
-                    // File is already opened in new tab by backend
-                    // No need to set content here
-
-                    // Show success message
-                    let message = 'PDF를 마크다운으로 변환하여 새 탭에서 열었습니다';
-                    if (result.images_dir) {
-                        message += `\n이미지가 ${result.images_dir}에 저장되었습니다`;
-                    }
+                    console.log('✅ PDF 변환 시작');
+                    console.log('  - 저장할 파일:', result.filepath);
+                    console.log('  - 이미지 폴더:', result.images_dir);
 
+                    // Backend streams the converted pages into a new tab
+                    // and saves the file when conversion is complete
                     if (typeof Utils !== 'undefined') {
-                        Utils.showToast(message, 'success');
+                        Utils.showToast('PDF를 변환하는 중입니다. 변환된 페이지가 새 탭에 차례로 표시됩니다', 'info');
                     }
                 } else if (result.error !== 'Cancelled' && result.error !== 'Save cancelled') {
                     console.error('❌ PDF 변환 실패:', result.error);
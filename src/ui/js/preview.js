@@ -7,6 +7,7 @@ const PreviewModule = {
     currentContent: '',
     scrollSyncEnabled: true,
     isScrolling: false,
+    mermaidTheme: 'default',
 
     /**
      * Initialize the preview module
@@ -467,7 +468,7 @@ const PreviewModule = {
             // Initialize Mermaid with configuration
             mermaid.initialize({
                 startOnLoad: false,
-                theme: 'default',
+                theme: this.mermaidTheme,
                 securityLevel: 'loose',
                 fontFamily: 'Malgun Gothic, 맑은 고딕, Segoe UI, Arial, sans-serif',
                 fontSize: 14,
@@ -495,6 +496,9 @@ const PreviewModule = {
                 const diagramContainer = document.createElement('div');
                 diagramContainer.className = 'mermaid-container';
                 diagramContainer.id = diagramId;
+                // Source and theme key the rasterized diagram in the PDF export cache
+                diagramContainer.dataset.source = code;
+                diagramContainer.dataset.theme = this.mermaidTheme;
 
                 // Render the diagram
                 mermaid.render(`mermaid-svg-${Date.now()}-${index}`, code).then(({ svg }) => {
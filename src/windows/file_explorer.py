@@ -21,6 +21,8 @@ class FileExplorer(QDockWidget):
     # Signals for drag & drop
     file_dropped = pyqtSignal(str)  # file_path for .md/.txt files
     pdf_dropped = pyqtSignal(str)   # file_path for .pdf files
+    pdf_folder_import_requested = pyqtSignal(str)  # folder whose PDFs should be converted
+    book_build_requested = pyqtSignal(str)  # folder whose Markdown chapters become one PDF
     
     # New signals for UI actions
     settings_requested = pyqtSignal()
@@ -140,6 +142,10 @@ class FileExplorer(QDockWidget):
         # Connect double-click signal
         self.tree.doubleClicked.connect(self._on_double_click)
 
+        # Folder context menu
+        self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.tree.customContextMenuRequested.connect(self._show_context_menu)
+
         # Add tree to layout
         layout.addWidget(self.tree)
 
@@ -172,6 +178,32 @@ class FileExplorer(QDockWidget):
             # For files, emit signal to open in new tab
             self.file_double_clicked.emit(file_path)
 
+    def _show_context_menu(self, pos):
+        """
+        Show the context menu for a folder (or the root when clicking empty space)
+
+        Args:
+            pos: Click position in tree viewport coordinates
+        """
+        index = self.tree.indexAt(pos)
+        if index.isValid():
+            if not self.model.isDir(index):
+                return
+            folder = self.model.filePath(index)
+        elif self.has_root_path():
+            folder = self.model.rootPath()
+        else:
+            return
+
+        menu = QMenu(self)
+        import_action = menu.addAction("폴더의 PDF 모두 변환")
+        book_action = menu.addAction("마크다운 파일을 책 PDF로 만들기")
+        action = menu.exec(self.tree.viewport().mapToGlobal(pos))
+        if action == import_action:
+            self.pdf_folder_import_requested.emit(folder)
+        elif action == book_action:
+            self.book_build_requested.emit(folder)
+
     def set_root_path(self, path: str):
         """
         Set the root path for the file explorer
@@ -16,15 +16,17 @@ from PyQt6.QtWidgets import (QMainWindow, QTabWidget, QStackedWidget, QWidget,
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebEngineCore import QWebEngineSettings
 from PyQt6.QtWebChannel import QWebChannel
-from PyQt6.QtCore import QUrl, Qt, QFile, QTextStream, QEvent, QFileSystemWatcher
+from PyQt6.QtCore import QUrl, Qt, QFile, QTextStream, QEvent, QFileSystemWatcher, QSettings
 from PyQt6.QtGui import QCloseEvent, QShortcut, QKeySequence, QFont
 
 from .menu_bar import MenuBar
 from .toolbar import ToolBar
 from .status_bar import StatusBar
 from .file_explorer import FileExplorer
+from .pdf_viewer import PdfViewerDock
 from backend.api import BackendAPI
 from backend.tab_manager import TabManager
+from backend.pdf_source import PageMarkers
 from backend.session_manager import SessionManager
 from backend.file_manager import FileManager
 from utils.theme_manager import ThemeManager
@@ -51,6 +53,104 @@ class UpdateCheckThread(QThread):
             self.update_available.emit(None)
 
 
+class PdfImportThread(QThread):
+    """Background thread converting a PDF to markdown page by page"""
+    progress = pyqtSignal(int, int)  # (page_num, total_pages)
+    chunk = pyqtSignal(int, str)  # (page_num, Markdown of the pages finished so far)
+    import_finished = pyqtSignal(bool, str)  # (success, error_message)
+
+    def __init__(self, converter, pdf_path: str, images_dir: str, workers: int = 1, options=None):
+        super().__init__()
+        import threading
+        self.converter = converter
+        self.pdf_path = pdf_path
+        self.images_dir = images_dir
+        self.workers = workers
+        self.options = options
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Stop the conversion after the current page"""
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            for page_num, total_pages, chunk in self.converter.iter_pdf_to_markdown(
+                    self.pdf_path, self.images_dir, self.workers, self.cancel_event, self.options):
+                if chunk:
+                    self.chunk.emit(page_num, chunk)
+                self.progress.emit(page_num, total_pages)
+
+            if self.cancel_event.is_set():
+                self.import_finished.emit(False, "Cancelled")
+            else:
+                self.import_finished.emit(True, "")
+        except Exception as e:
+            print(f"[ERROR] PDF import failed: {e}")
+            self.import_finished.emit(False, str(e))
+
+
+class BatchImportThread(QThread):
+    """Background thread converting every PDF in a folder"""
+    progress = pyqtSignal(int, int, str)  # (files_done, total_files, pdf_path)
+    batch_finished = pyqtSignal(object)  # BatchImportReport
+
+    def __init__(self, directory: str, workers: int = 0, options=None):
+        super().__init__()
+        import threading
+        self.directory = directory
+        self.workers = workers
+        self.options = options
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Stop starting new files; conversions already running finish"""
+        self.cancel_event.set()
+
+    def run(self):
+        from backend.batch_import import BatchImporter, BatchImportReport
+        try:
+            importer = BatchImporter(self.directory, workers=self.workers, options=self.options)
+            report = importer.run(
+                progress=lambda done, total, result: self.progress.emit(done, total, result.pdf_path),
+                cancel_event=self.cancel_event
+            )
+        except Exception as e:
+            print(f"[ERROR] Batch PDF import failed: {e}")
+            report = BatchImportReport(self.directory, error=str(e))
+        self.batch_finished.emit(report)
+
+
+class BookBuildThread(QThread):
+    """Background thread building one PDF from a folder of Markdown chapters"""
+    progress = pyqtSignal(int, int, str)  # (chapters_done, total_chapters, chapter_title)
+    build_finished = pyqtSignal(object)  # BookBuildReport
+
+    def __init__(self, directory: str, converter):
+        super().__init__()
+        import threading
+        self.directory = directory
+        self.converter = converter
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Stop starting new chapters; chapters already printing finish"""
+        self.cancel_event.set()
+
+    def run(self):
+        from backend.book_builder import BookBuilder, BookBuildReport
+        try:
+            builder = BookBuilder.from_directory(self.directory, converter=self.converter)
+            report = builder.run(
+                progress=lambda done, total, chapter: self.progress.emit(done, total, chapter.title),
+                cancel_event=self.cancel_event
+            )
+        except Exception as e:
+            print(f"[ERROR] Book build failed: {e}")
+            report = BookBuildReport("", error=str(e))
+        self.build_finished.emit(report)
+
+
 class MainWindow(QMainWindow):
     """Main application window with tab interface"""
 
@@ -115,6 +215,18 @@ class MainWindow(QMainWindow):
         self.update_check_thread = None
         self._update_check_done = False
 
+        # Running PDF import (see start_pdf_import)
+        self._pdf_import = None
+
+        # Running folder import (see start_batch_pdf_import)
+        self._batch_import = None
+
+        # Running book build (see start_book_build)
+        self._book_build = None
+
+        # Export browser prewarm, scheduled once the first editor has loaded
+        self._export_prewarm_scheduled = False
+
     def showEvent(self, event):
         """Handle window show - start update check after delay"""
         super().showEvent(event)
@@ -446,8 +558,16 @@ class MainWindow(QMainWindow):
         self.file_explorer.file_double_clicked.connect(self.open_file_in_new_tab)
         self.file_explorer.file_dropped.connect(self.open_file_in_new_tab)
         self.file_explorer.pdf_dropped.connect(self._handle_dropped_pdf)
+        self.file_explorer.pdf_folder_import_requested.connect(self.start_batch_pdf_import)
+        self.file_explorer.book_build_requested.connect(self.start_book_build)
         self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.file_explorer)
 
+        # Source PDF of imported documents, shown next to the editor
+        self.pdf_viewer = PdfViewerDock(self)
+        self.pdf_viewer.source_scrolled.connect(self.on_pdf_source_scrolled)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.pdf_viewer)
+        self.pdf_viewer.hide()
+
         # Create tab widget
         self.tab_widget = QTabWidget()
         self.tab_widget.setTabsClosable(True)
@@ -627,6 +747,12 @@ class MainWindow(QMainWindow):
             if webview:
                 webview.page().runJavaScript(js_file_code)
 
+        # A PDF import streaming into this tab stays read-only until it is done
+        importing = self._pdf_import is not None and self._pdf_import['tab_id'] == tab_id
+        if importing:
+            self._sync_pdf_import_content(tab)
+            self._set_editor_read_only(tab_id, True)
+
         # Set content
         if tab.content:
             # Escape content for JavaScript
@@ -651,6 +777,20 @@ class MainWindow(QMainWindow):
 
         print(f"[OK] Tab {tab_id} content loaded")
 
+        if not self._export_prewarm_scheduled:
+            self._export_prewarm_scheduled = True
+            QTimer.singleShot(3000, self._prewarm_export_engine)
+
+    def _prewarm_export_engine(self):
+        """Start the PDF export browser in the background (optional, see settings)"""
+        settings = QSettings("Saekim", "SaekimEditor")
+        if not settings.value("export/prewarm", False, type=bool):
+            return
+        if settings.value("export/engine", "playwright", type=str) != "playwright":
+            return  # QtWebEngine prints in the tab itself
+        self.backend.converter.prewarm_export_engine()
+        print("[OK] PDF export engine prewarm started")
+
     def setup_custom_title_bar(self):
         """Setup custom title bar"""
         self.title_bar = TitleBar(self)
@@ -703,6 +843,108 @@ class MainWindow(QMainWindow):
             if webview:
                 webview.page().runJavaScript(js_code)
 
+    # ==================== Native PDF Export ====================
+
+    def print_active_tab_to_pdf(self, file_path: str) -> bool:
+        """
+        Print the active tab's preview to PDF with QtWebEngine
+
+        The result is passed to FileModule.onNativePDFFinished in the tab.
+
+        Returns:
+            True if printing started
+        """
+        from backend.native_pdf import NativePdfExport
+
+        tab = self.tab_manager.get_active_tab()
+        webview = self.webview_cache.get(tab.tab_id) if tab else None
+        if not webview:
+            return False
+
+        export = NativePdfExport(webview.page(), file_path, self)
+
+        def on_finished(success: bool, path: str, error: str):
+            result = json.dumps({"success": success, "filepath": path if success else "", "error": error})
+            webview.page().runJavaScript(
+                f"if (typeof FileModule !== 'undefined') {{ FileModule.onNativePDFFinished({json.dumps(result)}); }}"
+            )
+            export.deleteLater()
+            print(f"[OK] Native PDF export {'finished' if success else 'failed'}: {path} {error}")
+            if success:
+                self.optimize_exported_pdf(path)
+
+        export.finished.connect(on_finished)
+        export.start()
+        return True
+
+    def optimize_exported_pdf(self, file_path: str) -> bool:
+        """
+        Shrink an exported PDF in the background if enabled in settings
+
+        The export is already complete; the file is replaced once the
+        smaller version is written and the sizes are passed to
+        FileModule.onPDFOptimized in the active tab.
+
+        Returns:
+            True if optimization started
+        """
+        settings = QSettings("Saekim", "SaekimEditor")
+        if not settings.value("export/optimize", False, type=bool):
+            return False
+
+        from backend.async_runtime import FutureWatcher
+        from backend.pdf_optimize import submit_optimize
+
+        watcher = FutureWatcher(submit_optimize(file_path), self)
+
+        def on_finished(result):
+            watcher.deleteLater()
+            print(f"[OK] PDF optimized: {result.summary()} {file_path}")
+            data = dict(result.to_dict(), success=True, filepath=file_path, error="")
+            self.run_js_in_active_tab(
+                f"if (typeof FileModule !== 'undefined') {{ FileModule.onPDFOptimized({json.dumps(json.dumps(data))}); }}"
+            )
+
+        def on_failed(error: str):
+            watcher.deleteLater()
+            print(f"[WARN] PDF optimization failed, keeping the exported file: {error}")
+
+        watcher.finished.connect(on_finished)
+        watcher.failed.connect(on_failed)
+        return True
+
+    # ==================== PDF Source Viewer ====================
+
+    def update_pdf_viewer(self, tab):
+        """Show the source PDF of tab, or hide the viewer if it has none"""
+        if tab and tab.source_pdf and self.pdf_viewer.open_pdf(tab.source_pdf):
+            self.pdf_viewer.show()
+            return
+
+        self.pdf_viewer.close_pdf()
+        self.pdf_viewer.hide()
+
+    def on_editor_scrolled(self, top_line: int, line_count: int):
+        """Scroll the PDF source viewer along with the editor"""
+        tab = self.tab_manager.get_active_tab()
+        if not tab or not tab.page_markers or self.pdf_viewer.pdf_path != tab.source_pdf:
+            return
+
+        # The last page runs to the end of the document, which moves with edits
+        tab.page_markers.total_lines = line_count
+        self.pdf_viewer.scroll_to(tab.page_markers.page_at_line(top_line))
+
+    def on_pdf_source_scrolled(self, position: float):
+        """Scroll the editor along with the PDF source viewer"""
+        tab = self.tab_manager.get_active_tab()
+        if not tab or not tab.page_markers or self.pdf_viewer.pdf_path != tab.source_pdf:
+            return
+
+        line = tab.page_markers.line_at_page(position)
+        self.run_js_in_active_tab(
+            f"if (typeof EditorModule !== 'undefined') {{ EditorModule.scrollToLine({line}); }}"
+        )
+
     def toggle_file_explorer(self):
         """Toggle file explorer visibility"""
         if self.file_explorer.isVisible():
@@ -845,6 +1087,8 @@ class MainWindow(QMainWindow):
             self.file_explorer.set_root_path(str(tab.file_path.parent))
             self.file_explorer.focus_on_file(str(tab.file_path))
 
+        self.update_pdf_viewer(tab)
+
     def on_tab_close_requested(self, index: int):
         """
         Called when user requests to close a tab
@@ -877,6 +1121,7 @@ class MainWindow(QMainWindow):
 
         # If no tabs left, show welcome screen
         if self.tab_widget.count() == 0:
+            self.update_pdf_viewer(None)
             self.setWindowTitle("새김 - 마크다운 에디터")
             if hasattr(self, 'title_bar'):
                 self.title_bar.set_title("새김 - 마크다운 에디터")
@@ -1028,12 +1273,20 @@ class MainWindow(QMainWindow):
                 if file_path and Path(file_path).exists():
                     success, content, error = FileManager.open_file(file_path)
                     if success:
-                        self.create_new_tab(file_path, content)
+                        tab_id = self.create_new_tab(file_path, content)
                         restored_tabs += 1
 
+                        source_pdf = tab_data.get('source_pdf')
+                        if source_pdf:
+                            tab = self.tab_manager.get_tab(tab_id)
+                            tab.source_pdf = Path(source_pdf)
+                            tab.page_markers = PageMarkers(tab_data.get('page_lines'),
+                                                           content.count('\n') + 1)
+
         # Scenario 1: Tabs were restored successfully
         if restored_tabs > 0:
             print(f"[OK] Session restored: {restored_tabs} tabs")
+            self.update_pdf_viewer(self.tab_manager.get_active_tab())
             # Set file explorer to first tab's directory
             first_tab = self.tab_manager.get_active_tab()
             if first_tab and first_tab.file_path:
@@ -1082,6 +1335,28 @@ class MainWindow(QMainWindow):
             self.session_manager.clear_session()
             print("[OK] Session cleared on exit (no files open)")
 
+        # Stop the PDF viewer's render thread and remove spilled tiles
+        self.pdf_viewer.close_pdf()
+
+        # A book build prints on the export engine, so it stops first
+        if self._book_build:
+            self._book_build['thread'].cancel()
+            self._book_build['thread'].wait()
+
+        # Shut down the export browser, then the loop it runs on
+        if self.backend._converter is not None:
+            self.backend._converter.export_engine.close()
+        from backend.async_runtime import shutdown_runtime
+        shutdown_runtime()
+
+        # Stop a running PDF import before the window goes away
+        if self._pdf_import:
+            self._pdf_import['thread'].cancel()
+            self._pdf_import['thread'].wait()
+        if self._batch_import:
+            self._batch_import['thread'].cancel()
+            self._batch_import['thread'].wait()
+
         # Accept the close event
         event.accept()
 
@@ -1181,7 +1456,7 @@ class MainWindow(QMainWindow):
 
     def _handle_dropped_pdf(self, pdf_path: str):
         """Handle dropped PDF file - convert to markdown and open"""
-        from PyQt6.QtWidgets import QFileDialog, QMessageBox
+        from PyQt6.QtWidgets import QFileDialog
         from pathlib import Path
         
         # Suggest output filename
@@ -1202,26 +1477,384 @@ class MainWindow(QMainWindow):
         if not save_path.endswith('.md'):
             save_path += '.md'
         
-        try:
-            # Convert PDF to markdown
-            success, content, error = self.backend_api.converter.pdf_to_markdown(
-                pdf_path,
-                output_dir=str(Path(save_path).parent)
+        self.start_pdf_import(pdf_path, save_path)
+
+    # ==================== PDF Import ====================
+
+    def start_pdf_import(self, pdf_path: str, save_path: str) -> bool:
+        """
+        Convert a PDF in the background and stream it into a new tab
+
+        Pages appear in the tab as soon as they are converted; the editor
+        is read-only until the import ends so nothing typed meanwhile can
+        go missing. The markdown file is written to save_path once the
+        whole document is done; a cancelled or failed import leaves the
+        partial result unsaved.
+
+        Args:
+            pdf_path: PDF file to import
+            save_path: Markdown file to create
+
+        Returns:
+            True if the import was started
+        """
+        from PyQt6.QtWidgets import QMessageBox, QProgressDialog
+
+        if self._pdf_import:
+            QMessageBox.information(self, "PDF 가져오기", "이미 PDF를 변환하고 있습니다.")
+            return False
+
+        # Images go next to the markdown file so the relative links resolve
+        images_dir = Path(save_path).parent / f"{Path(pdf_path).stem}_images"
+
+        tab_id = self.create_new_tab(save_path, "")
+
+        # Keep the source PDF open next to the tab, with the first line of each page
+        # recorded as it streams in so both sides can scroll together
+        tab = self.tab_manager.get_tab(tab_id)
+        tab.source_pdf = Path(pdf_path).resolve()
+        tab.page_markers = PageMarkers()
+        self.update_pdf_viewer(tab)
+
+        progress_dialog = QProgressDialog("PDF 변환 중...", "취소", 0, 0, self)
+        progress_dialog.setWindowTitle("PDF 가져오기")
+        progress_dialog.setWindowModality(Qt.WindowModality.NonModal)
+        progress_dialog.setMinimumDuration(500)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+
+        thread = PdfImportThread(
+            self.backend.converter, pdf_path, str(images_dir),
+            workers=self.backend._pdf_import_workers(),
+            options=self.backend._pdf_import_options()
+        )
+
+        self._pdf_import = {
+            'thread': thread,
+            'tab_id': tab_id,
+            'save_path': save_path,
+            'images_dir': images_dir,
+            'parts': [],
+            'lines': 0,
+            'dialog': progress_dialog,
+        }
+
+        progress_dialog.canceled.connect(thread.cancel)
+        thread.chunk.connect(self._on_pdf_import_chunk)
+        thread.progress.connect(self._on_pdf_import_progress)
+        thread.import_finished.connect(self._on_pdf_import_finished)
+        thread.start()
+
+        print(f"[OK] PDF import started: {pdf_path} -> {save_path}")
+        return True
+
+    def _on_pdf_import_chunk(self, page_num: int, chunk: str):
+        """Append newly converted markdown to the import tab"""
+        state = self._pdf_import
+        if not state:
+            return
+
+        state['parts'].append(chunk)
+        first_line = state['lines']
+        state['lines'] += chunk.count('\n')
+
+        tab = self.tab_manager.get_tab(state['tab_id'])
+        if not tab:
+            # Tab was closed - no one is waiting for the rest of the document
+            state['thread'].cancel()
+            return
+
+        if tab.page_markers is not None:
+            # Pages without any Markdown start where the next page starts
+            tab.page_markers.add_page(page_num, first_line)
+            tab.page_markers.total_lines = state['lines'] + 1
+
+        # The tab's content is brought up to date from the parts only when
+        # it is read (joining it per page is quadratic). A webview that is
+        # still loading picks it up in on_webview_loaded, so appending is
+        # only needed once it's ready
+        webview = self.webview_cache.get(tab.tab_id)
+        if webview:
+            escaped_chunk = json.dumps(chunk)
+            webview.page().runJavaScript(
+                f"if (typeof window.appendEditorContent === 'function') "
+                f"{{ window.appendEditorContent({escaped_chunk}); }}"
             )
-            
-            if success:
-                # Save converted content
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                
-                # Open in new tab
-                self.open_file_in_new_tab(save_path)
-                print(f"[OK] Drag & drop PDF: converted {pdf_path} -> {save_path}")
-            else:
+
+    def _on_pdf_import_progress(self, page_num: int, total_pages: int):
+        """Update the import progress dialog"""
+        state = self._pdf_import
+        if not state:
+            return
+
+        dialog = state['dialog']
+        dialog.setMaximum(total_pages)
+        dialog.setValue(page_num)
+        dialog.setLabelText(f"PDF 변환 중... ({page_num}/{total_pages} 페이지)")
+
+    def _on_pdf_import_finished(self, success: bool, error: str):
+        """Save the imported document once conversion is complete"""
+        from PyQt6.QtWidgets import QMessageBox
+
+        state = self._pdf_import
+        self._pdf_import = None
+        if not state:
+            return
+
+        state['dialog'].close()
+        state['thread'].wait()
+
+        tab = self.tab_manager.get_tab(state['tab_id'])
+        if tab:
+            self._sync_pdf_import_content(tab, state)
+            self._set_editor_read_only(tab.tab_id, False)
+
+        if not success:
+            if tab:
+                # Keep what was converted so far, but don't write a partial file
+                self.tab_manager.update_tab_modified(tab.tab_id, True)
+            if error != "Cancelled":
                 QMessageBox.warning(self, "PDF 변환 실패", f"PDF 변환 중 오류 발생:\n{error}")
-                
-        except Exception as e:
-            QMessageBox.warning(self, "오류", f"PDF 처리 중 오류 발생:\n{str(e)}")
+            print(f"[WARN] PDF import stopped: {error}")
+            return
+
+        save_path = state['save_path']
+        content = tab.content if tab else ''.join(state['parts'])
+        save_success, _, save_error = FileManager.save_file(content, save_path, None)
+        if not save_success:
+            if tab:
+                self.tab_manager.update_tab_modified(tab.tab_id, True)
+            QMessageBox.warning(self, "오류", f"마크다운 파일 저장 실패:\n{save_error}")
+            return
+
+        if tab:
+            self.tab_manager.update_tab_modified(tab.tab_id, False)
+
+            # Add file to watcher for auto-refresh
+            abs_path = str(Path(save_path).resolve())
+            if abs_path not in self.file_watcher.files():
+                self.file_watcher.addPath(abs_path)
+
+        self.file_explorer.set_root_path(str(Path(save_path).parent))
+
+        print(f"[OK] PDF import finished: {save_path}")
+        if state['images_dir'].exists():
+            print(f"[OK] Images extracted to: {state['images_dir']}")
+
+    def _sync_pdf_import_content(self, tab, state=None):
+        """Bring tab.content up to the pages a running import has streamed in so far"""
+        state = state or self._pdf_import
+        if state and state['tab_id'] == tab.tab_id:
+            self.tab_manager.update_tab_content(tab.tab_id, ''.join(state['parts']))
+
+    def _set_editor_read_only(self, tab_id: str, read_only: bool):
+        """Block typing in a tab whose content is still streaming in"""
+        webview = self.webview_cache.get(tab_id)
+        if webview:
+            webview.page().runJavaScript(
+                f"if (typeof window.setEditorReadOnly === 'function') "
+                f"{{ window.setEditorReadOnly({'true' if read_only else 'false'}); }}"
+            )
+
+    def start_batch_pdf_import(self, directory: str) -> bool:
+        """
+        Convert every PDF in a folder in the background
+
+        Each PDF becomes {stem}.md with images in {stem}_images next to it.
+        Files converted by an earlier (possibly interrupted) run are skipped.
+
+        Args:
+            directory: Folder containing the PDFs
+
+        Returns:
+            True if the import was started
+        """
+        from PyQt6.QtWidgets import QMessageBox, QProgressDialog
+        from backend.batch_import import find_pdfs
+
+        if self._batch_import:
+            QMessageBox.information(self, "PDF 일괄 변환", "이미 폴더를 변환하고 있습니다.")
+            return False
+
+        pdf_count = len(find_pdfs(directory))
+        if pdf_count == 0:
+            QMessageBox.information(self, "PDF 일괄 변환", "폴더에 PDF 파일이 없습니다.")
+            return False
+
+        reply = QMessageBox.question(
+            self, "PDF 일괄 변환",
+            f"{pdf_count}개의 PDF를 마크다운으로 변환합니다.\n"
+            f"결과는 각 PDF와 같은 폴더에 저장됩니다. 계속하시겠습니까?"
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return False
+
+        progress_dialog = QProgressDialog("PDF 일괄 변환 중...", "취소", 0, pdf_count, self)
+        progress_dialog.setWindowTitle("PDF 일괄 변환")
+        progress_dialog.setWindowModality(Qt.WindowModality.NonModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+
+        thread = BatchImportThread(
+            directory,
+            workers=self.backend._pdf_import_workers(),
+            options=self.backend._pdf_import_options()
+        )
+        self._batch_import = {'thread': thread, 'dialog': progress_dialog, 'directory': directory}
+
+        progress_dialog.canceled.connect(thread.cancel)
+        thread.progress.connect(self._on_batch_import_progress)
+        thread.batch_finished.connect(self._on_batch_import_finished)
+        thread.start()
+
+        print(f"[OK] Batch PDF import started: {directory}")
+        return True
+
+    def _on_batch_import_progress(self, done: int, total: int, pdf_path: str):
+        """Update the folder import progress dialog"""
+        state = self._batch_import
+        if not state:
+            return
+
+        dialog = state['dialog']
+        dialog.setMaximum(total)
+        dialog.setValue(done)
+        dialog.setLabelText(f"PDF 일괄 변환 중... ({done}/{total})\n{Path(pdf_path).name}")
+
+    def _on_batch_import_finished(self, report):
+        """Show the summary of a folder import"""
+        from PyQt6.QtWidgets import QMessageBox
+
+        state = self._batch_import
+        self._batch_import = None
+        if not state:
+            return
+
+        state['dialog'].close()
+        state['thread'].wait()
+
+        if report.error:
+            QMessageBox.warning(self, "PDF 일괄 변환 실패", f"PDF 일괄 변환 중 오류 발생:\n{report.error}")
+            return
+
+        message = (f"변환: {len(report.converted)}개, 건너뜀: {len(report.skipped)}개, "
+                   f"실패: {len(report.failures)}개\n"
+                   f"{report.total_pages} 페이지 / {report.elapsed:.1f}초 "
+                   f"({report.pages_per_second:.1f} 페이지/초)")
+        if report.cancelled:
+            message += "\n\n취소되었습니다. 다시 실행하면 남은 파일부터 이어서 변환합니다."
+        if report.failures:
+            failed = "\n".join(f"- {Path(r.pdf_path).name}: {r.error}" for r in report.failures[:10])
+            if len(report.failures) > 10:
+                failed += f"\n... 외 {len(report.failures) - 10}개"
+            message += f"\n\n실패한 파일:\n{failed}"
+
+        if report.failures:
+            QMessageBox.warning(self, "PDF 일괄 변환", message)
+        else:
+            QMessageBox.information(self, "PDF 일괄 변환", message)
+
+        self.file_explorer.set_root_path(state['directory'])
+        print(f"[OK] Batch PDF import finished: {report.summary()}")
+
+    def start_book_build(self, directory: str) -> bool:
+        """
+        Build one PDF from the Markdown chapters of a folder in the background
+
+        The chapter order comes from book.json in the folder, or from the
+        file names. Unchanged chapters are taken from the chapter cache.
+
+        Args:
+            directory: Folder containing the chapters
+
+        Returns:
+            True if the build was started
+        """
+        from PyQt6.QtWidgets import QMessageBox, QProgressDialog
+        from backend.book_builder import BookBuilder
+
+        if self._book_build:
+            QMessageBox.information(self, "책 PDF 만들기", "이미 책을 만들고 있습니다.")
+            return False
+
+        try:
+            builder = BookBuilder.from_directory(directory, converter=self.backend.converter)
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self, "책 PDF 만들기", f"book.json을 읽을 수 없습니다:\n{e}")
+            return False
+
+        if not builder.chapters:
+            QMessageBox.information(self, "책 PDF 만들기", "폴더에 마크다운 파일이 없습니다.")
+            return False
+
+        if not self.backend._ensure_playwright_browser():
+            return False
+
+        reply = QMessageBox.question(
+            self, "책 PDF 만들기",
+            f"{len(builder.chapters)}개의 장으로 PDF를 만듭니다.\n"
+            f"저장 위치: {builder.output_path}\n계속하시겠습니까?"
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return False
+
+        progress_dialog = QProgressDialog("책 PDF 만드는 중...", "취소", 0, len(builder.chapters), self)
+        progress_dialog.setWindowTitle("책 PDF 만들기")
+        progress_dialog.setWindowModality(Qt.WindowModality.NonModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+
+        thread = BookBuildThread(directory, self.backend.converter)
+        self._book_build = {'thread': thread, 'dialog': progress_dialog, 'directory': directory}
+
+        progress_dialog.canceled.connect(thread.cancel)
+        thread.progress.connect(self._on_book_build_progress)
+        thread.build_finished.connect(self._on_book_build_finished)
+        thread.start()
+
+        print(f"[OK] Book build started: {directory}")
+        return True
+
+    def _on_book_build_progress(self, done: int, total: int, title: str):
+        """Update the book build progress dialog"""
+        state = self._book_build
+        if not state:
+            return
+
+        dialog = state['dialog']
+        dialog.setMaximum(total)
+        dialog.setValue(done)
+        dialog.setLabelText(f"책 PDF 만드는 중... ({done}/{total})\n{title}")
+
+    def _on_book_build_finished(self, report):
+        """Show the summary of a book build"""
+        from PyQt6.QtWidgets import QMessageBox
+
+        state = self._book_build
+        self._book_build = None
+        if not state:
+            return
+
+        state['dialog'].close()
+        state['thread'].wait()
+
+        if report.error:
+            QMessageBox.warning(self, "책 PDF 만들기 실패", f"책 PDF를 만드는 중 오류 발생:\n{report.error}")
+            return
+        if report.cancelled:
+            QMessageBox.information(self, "책 PDF 만들기", "취소되었습니다. 완성된 장은 다음에 다시 사용됩니다.")
+            return
+
+        QMessageBox.information(
+            self, "책 PDF 만들기",
+            f"{report.output_path}\n\n"
+            f"{len(report.chapters)}개 장 (새로 렌더링: {len(report.rendered)}개, 캐시: {len(report.cached)}개)\n"
+            f"{report.total_pages} 페이지 / {report.elapsed:.1f}초"
+        )
+        self.file_explorer.set_root_path(state['directory'])
+        print(f"[OK] Book build finished: {report.summary()}")
 
     # ==================== Drag Visual Feedback ====================
     
@@ -0,0 +1,379 @@
+"""
+PDF Source Viewer
+Shows the source PDF of an imported document next to its Markdown tab
+"""
+
+import threading
+from bisect import bisect_right
+from pathlib import Path
+
+from PyQt6.QtWidgets import (QDockWidget, QAbstractScrollArea, QWidget, QVBoxLayout,
+                              QHBoxLayout, QLabel, QToolButton, QSizePolicy)
+from PyQt6.QtCore import pyqtSignal, Qt, QThread, QRectF, QSettings
+from PyQt6.QtGui import QPainter, QImage, QColor
+
+from backend.pdf_source import (TileCache, TileRenderer, TILE_HEIGHT, ZOOM_STEPS,
+                                page_sizes, tile_rows, zoom_step)
+from utils.design_manager import DesignManager
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+# Space around and between pages, in logical pixels
+PAGE_MARGIN = 8
+PAGE_GAP = 8
+
+
+class TileRenderThread(QThread):
+    """
+    Renders requested tiles off the GUI thread
+
+    Only the most recent request matters: a new request replaces the
+    tiles still waiting, so scrolling quickly never queues up renders
+    of pages that are no longer visible.
+    """
+
+    tile_ready = pyqtSignal(object, object)  # TileKey, Tile
+
+    def __init__(self, pdf_path, parent=None):
+        super().__init__(parent)
+        self.pdf_path = str(pdf_path)
+        self._wake = threading.Condition()
+        self._pending = []  # keys, most urgent first
+        self._stopping = False
+
+    def request(self, keys):
+        """Replace the waiting tiles with keys"""
+        with self._wake:
+            self._pending = list(keys)
+            self._wake.notify()
+
+    def stop(self):
+        """Stop rendering and wait for the thread to finish"""
+        with self._wake:
+            self._stopping = True
+            self._pending = []
+            self._wake.notify()
+        self.wait()
+
+    def run(self):
+        try:
+            renderer = TileRenderer(self.pdf_path)
+        except Exception as e:
+            logger.error(f"Could not open PDF for viewing: {e}")
+            return
+
+        try:
+            while True:
+                with self._wake:
+                    while not self._pending and not self._stopping:
+                        self._wake.wait()
+                    if self._stopping:
+                        break
+                    key = self._pending.pop(0)
+
+                try:
+                    tile = renderer.render(key)
+                except Exception as e:
+                    logger.warning(f"Could not render tile {key}: {e}")
+                    continue
+                self.tile_ready.emit(key, tile)
+        finally:
+            renderer.close()
+
+
+class PdfPageView(QAbstractScrollArea):
+    """
+    Continuous, fit-to-width view of all pages of a PDF
+
+    Pages are painted from cached tiles; tiles that are not cached yet are
+    requested from the render thread and drawn as blank pages until they
+    arrive.
+    """
+
+    # Emitted when the user scrolls, with the page position at the top
+    position_changed = pyqtSignal(float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.verticalScrollBar().setSingleStep(40)
+        self.verticalScrollBar().valueChanged.connect(self.on_scrolled)
+
+        self.pdf_path = None
+        self.cache = None
+        self.render_thread = None
+        self.sizes = []       # (width, height) in points per page
+        self.page_tops = []   # top of each page in logical pixels
+        self.zoom = 1.0       # logical pixels per point
+        self.step = ZOOM_STEPS  # zoom step tiles are rendered at
+        self.setting_position = False
+
+    def open(self, pdf_path, cache: TileCache):
+        """Show a PDF; tiles are kept in cache"""
+        self.close_document()
+
+        self.sizes = page_sizes(pdf_path)
+        self.pdf_path = Path(pdf_path)
+        self.cache = cache
+
+        self.render_thread = TileRenderThread(pdf_path, self)
+        self.render_thread.tile_ready.connect(self.on_tile_ready)
+        self.render_thread.start()
+
+        self.update_layout()
+        self.verticalScrollBar().setValue(0)
+        self.viewport().update()
+
+    def close_document(self):
+        """Stop rendering and drop all tiles"""
+        if self.render_thread is not None:
+            self.render_thread.stop()
+            self.render_thread.deleteLater()
+            self.render_thread = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+        self.pdf_path = None
+        self.sizes = []
+        self.page_tops = []
+        self.verticalScrollBar().setRange(0, 0)
+        self.viewport().update()
+
+    # ==================== Layout ====================
+
+    def update_layout(self):
+        """Fit pages to the viewport width and stack them"""
+        if not self.sizes:
+            return
+
+        widest = max(width for width, _height in self.sizes)
+        available = max(self.viewport().width() - 2 * PAGE_MARGIN, 50)
+        self.zoom = available / widest
+
+        # Tiles are rendered in device pixels so they stay sharp on HiDPI screens
+        step = zoom_step(self.zoom * self.devicePixelRatioF())
+        if step != self.step and self.cache is not None:
+            self.cache.discard_zoom(step)
+        self.step = step
+
+        self.page_tops = []
+        top = PAGE_MARGIN
+        for _width, height in self.sizes:
+            self.page_tops.append(top)
+            top += height * self.zoom + PAGE_GAP
+        total_height = top - PAGE_GAP + PAGE_MARGIN
+
+        bar = self.verticalScrollBar()
+        bar.setPageStep(self.viewport().height())
+        bar.setRange(0, max(int(total_height) - self.viewport().height(), 0))
+
+    def resizeEvent(self, event):
+        position = self.position()
+        super().resizeEvent(event)
+        self.update_layout()
+        self.set_position(position)
+
+    # ==================== Page position ====================
+
+    def position(self) -> float:
+        """Page position (0-based index plus fraction) at the top of the view"""
+        if not self.page_tops:
+            return 0.0
+        y = self.verticalScrollBar().value()
+        page_idx = max(bisect_right(self.page_tops, y) - 1, 0)
+        height = self.sizes[page_idx][1] * self.zoom
+        fraction = (y - self.page_tops[page_idx]) / height if height > 0 else 0.0
+        return page_idx + min(max(fraction, 0.0), 1.0)
+
+    def set_position(self, position: float):
+        """Scroll so the page position is at the top, without emitting position_changed"""
+        if not self.page_tops:
+            return
+        page_idx = min(max(int(position), 0), len(self.page_tops) - 1)
+        fraction = min(max(position - page_idx, 0.0), 1.0)
+        y = self.page_tops[page_idx] + fraction * self.sizes[page_idx][1] * self.zoom
+
+        self.setting_position = True
+        try:
+            self.verticalScrollBar().setValue(int(y))
+        finally:
+            self.setting_position = False
+
+    def on_scrolled(self, _value):
+        self.viewport().update()
+        if not self.setting_position:
+            self.position_changed.emit(self.position())
+
+    # ==================== Painting ====================
+
+    def _visible_tiles(self, top: float, bottom: float):
+        """(key, target rect) of every tile between two view coordinates"""
+        render_zoom = self.step / ZOOM_STEPS
+        rows_height = TILE_HEIGHT / render_zoom * self.zoom  # logical height of one row
+        first_page = max(bisect_right(self.page_tops, top) - 1, 0)
+
+        for page_idx in range(first_page, len(self.page_tops)):
+            page_top = self.page_tops[page_idx]
+            if page_top > bottom:
+                break
+            width, height = self.sizes[page_idx]
+            page_height = height * self.zoom
+            if page_top + page_height < top:
+                continue
+
+            first_row = max(int((top - page_top) // rows_height), 0)
+            last_row = min(int((bottom - page_top) // rows_height), tile_rows(height, self.step) - 1)
+            for row in range(first_row, last_row + 1):
+                row_top = page_top + row * rows_height
+                row_bottom = min(row_top + rows_height, page_top + page_height)
+                target = QRectF(PAGE_MARGIN, row_top, width * self.zoom, row_bottom - row_top)
+                yield (page_idx, self.step, row), target
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.fillRect(self.viewport().rect(), QColor("#808080"))
+        if not self.page_tops or self.cache is None:
+            return
+
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        scroll = self.verticalScrollBar().value()
+        height = self.viewport().height()
+        painter.translate(0, -scroll)
+
+        missing = []
+        for key, target in self._visible_tiles(scroll, scroll + height):
+            tile = self.cache.get(key)
+            if tile is None:
+                painter.fillRect(target, Qt.GlobalColor.white)
+                missing.append(key)
+                continue
+            image = QImage(tile.samples, tile.width, tile.height, tile.stride,
+                           QImage.Format.Format_RGB888)
+            painter.drawImage(target, image)
+        painter.end()
+
+        # Prefetch a screen below and above so scrolling finds tiles ready
+        prefetch = [key for key, _target in self._visible_tiles(scroll + height, scroll + 2 * height)]
+        prefetch += [key for key, _target in self._visible_tiles(scroll - height, scroll)]
+        missing += [key for key in prefetch if key not in self.cache]
+        if missing and self.render_thread is not None:
+            self.render_thread.request(missing)
+
+    def on_tile_ready(self, key, tile):
+        if self.cache is None:
+            return
+        self.cache.put(key, tile)
+        if key[1] == self.step:
+            self.viewport().update()
+
+
+class PdfViewerDock(QDockWidget):
+    """Dock showing the source PDF of the active tab, scrolled along with the editor"""
+
+    # Emitted when the user scrolls the PDF while sync is on
+    source_scrolled = pyqtSignal(float)  # page position
+
+    def __init__(self, parent=None):
+        super().__init__("PDF 원본", parent)
+
+        self.setAllowedAreas(Qt.DockWidgetArea.LeftDockWidgetArea |
+                            Qt.DockWidgetArea.RightDockWidgetArea)
+        self.setFeatures(QDockWidget.DockWidgetFeature.DockWidgetMovable |
+                        QDockWidget.DockWidgetFeature.DockWidgetClosable)
+        self.setMinimumWidth(200)
+
+        main_widget = QWidget()
+        layout = QVBoxLayout(main_widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        # Header: file name, page indicator, sync toggle
+        header_layout = QHBoxLayout()
+        header_layout.setContentsMargins(5, 2, 5, 2)
+
+        self.name_label = QLabel()
+        self.name_label.setFont(DesignManager.get_font("small"))
+        self.name_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Preferred)
+        header_layout.addWidget(self.name_label, 1)
+
+        self.page_label = QLabel()
+        self.page_label.setFont(DesignManager.get_font("small"))
+        header_layout.addWidget(self.page_label)
+
+        self.sync_button = QToolButton()
+        self.sync_button.setText("동기화")
+        self.sync_button.setToolTip("편집기와 스크롤 동기화 (Sync scrolling with the editor)")
+        self.sync_button.setCheckable(True)
+        self.sync_button.setChecked(True)
+        header_layout.addWidget(self.sync_button)
+
+        layout.addLayout(header_layout)
+
+        self.view = PdfPageView()
+        self.view.position_changed.connect(self.on_view_scrolled)
+        self.view.verticalScrollBar().valueChanged.connect(self.update_page_label)
+        layout.addWidget(self.view, 1)
+
+        self.setWidget(main_widget)
+
+    @property
+    def pdf_path(self):
+        return self.view.pdf_path
+
+    @property
+    def sync_enabled(self) -> bool:
+        return self.sync_button.isChecked()
+
+    def _tile_cache(self) -> TileCache:
+        settings = QSettings("Saekim", "SaekimEditor")
+        memory_mb = settings.value("pdf_viewer/memory_mb", 128, type=int)
+        spill = settings.value("pdf_viewer/disk_spill", False, type=bool)
+        return TileCache(max_bytes=memory_mb * 1024 * 1024, spill=spill)
+
+    def open_pdf(self, pdf_path) -> bool:
+        """
+        Show a PDF, unless it is already shown
+
+        Returns:
+            True if the PDF is shown
+        """
+        pdf_path = Path(pdf_path)
+        if self.view.pdf_path == pdf_path:
+            return True
+        if not pdf_path.exists():
+            self.close_pdf()
+            return False
+
+        try:
+            self.view.open(pdf_path, self._tile_cache())
+        except Exception as e:
+            logger.error(f"Could not show PDF {pdf_path}: {e}")
+            self.close_pdf()
+            return False
+
+        self.name_label.setText(pdf_path.name)
+        self.name_label.setToolTip(str(pdf_path))
+        self.update_page_label()
+        return True
+
+    def close_pdf(self):
+        """Close the shown PDF and free its tiles"""
+        self.view.close_document()
+        self.name_label.clear()
+        self.page_label.clear()
+
+    def scroll_to(self, position: float):
+        """Scroll to a page position (from the editor) if sync is on"""
+        if self.sync_enabled:
+            self.view.set_position(position)
+
+    def on_view_scrolled(self, position: float):
+        if self.sync_enabled:
+            self.source_scrolled.emit(position)
+
+    def update_page_label(self, *_args):
+        if self.view.sizes:
+            page = int(self.view.position()) + 1
+            self.page_label.setText(f"{page} / {len(self.view.sizes)}")
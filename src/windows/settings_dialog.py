@@ -3,8 +3,8 @@ Settings Dialog
 """
 
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QComboBox, QPushButton, QGroupBox, QFormLayout)
-from PyQt6.QtCore import Qt
+                             QComboBox, QPushButton, QGroupBox, QFormLayout, QCheckBox)
+from PyQt6.QtCore import Qt, QSettings
 from utils.design_manager import DesignManager
 from windows.license_dialog import LicenseDialog
 
@@ -14,7 +14,7 @@ class SettingsDialog(QDialog):
         self.theme_manager = theme_manager
         self.setWindowTitle("Settings")
         self.setFont(DesignManager.get_font("body"))
-        self.setFixedSize(400, 350)
+        self.setFixedSize(400, 745)
         self.setModal(True)
         
         layout = QVBoxLayout(self)
@@ -40,6 +40,112 @@ class SettingsDialog(QDialog):
         group_appearance.setLayout(form_layout)
         layout.addWidget(group_appearance)
         
+        # PDF Import Group
+        group_pdf = QGroupBox("PDF Import")
+        pdf_layout = QVBoxLayout()
+        
+        settings = QSettings("Saekim", "SaekimEditor")
+        self.check_page_cache = QCheckBox("페이지 캐시 사용 (Reuse unchanged pages)")
+        self.check_page_cache.setChecked(settings.value("pdf_import/page_cache", False, type=bool))
+        self.check_page_cache.toggled.connect(self.on_page_cache_toggled)
+        pdf_layout.addWidget(self.check_page_cache)
+        
+        cache_row = QHBoxLayout()
+        self.label_cache_stats = QLabel()
+        cache_row.addWidget(self.label_cache_stats, 1)
+        
+        btn_clear_cache = QPushButton("캐시 비우기 (Clear)")
+        btn_clear_cache.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        btn_clear_cache.clicked.connect(self.clear_pdf_cache)
+        cache_row.addWidget(btn_clear_cache)
+        pdf_layout.addLayout(cache_row)
+        
+        self.check_low_memory = QCheckBox("저메모리 모드 (Low memory for large PDFs)")
+        self.check_low_memory.setChecked(settings.value("pdf_import/low_memory", False, type=bool))
+        self.check_low_memory.toggled.connect(self.on_low_memory_toggled)
+        pdf_layout.addWidget(self.check_low_memory)
+        
+        self.check_columns = QCheckBox("다단 읽기 순서 (Read columns in order)")
+        self.check_columns.setChecked(settings.value("pdf_import/column_detection", True, type=bool))
+        self.check_columns.toggled.connect(self.on_column_detection_toggled)
+        pdf_layout.addWidget(self.check_columns)
+        
+        self.check_figures = QCheckBox("벡터 도형을 이미지로 (Capture vector figures)")
+        self.check_figures.setChecked(settings.value("pdf_import/vector_figures", True, type=bool))
+        self.check_figures.toggled.connect(self.on_vector_figures_toggled)
+        pdf_layout.addWidget(self.check_figures)
+        
+        image_row = QHBoxLayout()
+        image_row.addWidget(QLabel("이미지 축소 (Images):"))
+        self.combo_image_size = QComboBox()
+        self.combo_image_size.addItem("원본 유지 (Keep)", 0)
+        for size in (2048, 1600, 1024):
+            self.combo_image_size.addItem(f"최대 {size}px", size)
+        index = self.combo_image_size.findData(settings.value("pdf_import/image_max_dimension", 0, type=int))
+        if index >= 0:
+            self.combo_image_size.setCurrentIndex(index)
+        self.combo_image_size.currentIndexChanged.connect(self.on_image_size_changed)
+        image_row.addWidget(self.combo_image_size, 1)
+        
+        self.combo_image_format = QComboBox()
+        self.combo_image_format.addItem("JPEG", "jpeg")
+        self.combo_image_format.addItem("WebP", "webp")
+        self.combo_image_format.addItem("PNG", "png")
+        index = self.combo_image_format.findData(settings.value("pdf_import/image_format", "jpeg", type=str))
+        if index >= 0:
+            self.combo_image_format.setCurrentIndex(index)
+        self.combo_image_format.currentIndexChanged.connect(self.on_image_format_changed)
+        self.combo_image_format.setEnabled(self.combo_image_size.currentData() != 0)
+        image_row.addWidget(self.combo_image_format)
+        pdf_layout.addLayout(image_row)
+        
+        table_row = QHBoxLayout()
+        table_row.addWidget(QLabel("표 인식 (Tables):"))
+        self.combo_table_engine = QComboBox()
+        self.combo_table_engine.addItem("pdfplumber", "pdfplumber")
+        self.combo_table_engine.addItem("PyMuPDF", "fitz")
+        index = self.combo_table_engine.findData(settings.value("pdf_import/table_engine", "pdfplumber", type=str))
+        if index >= 0:
+            self.combo_table_engine.setCurrentIndex(index)
+        self.combo_table_engine.currentIndexChanged.connect(self.on_table_engine_changed)
+        table_row.addWidget(self.combo_table_engine, 1)
+        pdf_layout.addLayout(table_row)
+        
+        group_pdf.setLayout(pdf_layout)
+        layout.addWidget(group_pdf)
+        self.update_cache_stats()
+        
+        # PDF Export Group
+        group_export = QGroupBox("PDF Export")
+        export_layout = QVBoxLayout()
+        
+        self.check_prewarm = QCheckBox("내보내기 엔진 미리 시작 (Prewarm export engine)")
+        self.check_prewarm.setToolTip("편집기가 열리면 PDF 내보내기용 브라우저를 백그라운드에서 미리 실행합니다.")
+        self.check_prewarm.setChecked(settings.value("export/prewarm", False, type=bool))
+        self.check_prewarm.toggled.connect(self.on_prewarm_toggled)
+        export_layout.addWidget(self.check_prewarm)
+        
+        engine_row = QHBoxLayout()
+        engine_row.addWidget(QLabel("엔진 (Engine):"))
+        self.combo_export_engine = QComboBox()
+        self.combo_export_engine.addItem("Playwright (Chromium)", "playwright")
+        self.combo_export_engine.addItem("Qt WebEngine (미리보기 인쇄)", "qt")
+        index = self.combo_export_engine.findData(settings.value("export/engine", "playwright", type=str))
+        if index >= 0:
+            self.combo_export_engine.setCurrentIndex(index)
+        self.combo_export_engine.currentIndexChanged.connect(self.on_export_engine_changed)
+        engine_row.addWidget(self.combo_export_engine, 1)
+        export_layout.addLayout(engine_row)
+        
+        self.check_optimize = QCheckBox("내보낸 PDF 최적화 (Optimize exported PDF)")
+        self.check_optimize.setToolTip("내보낸 뒤 백그라운드에서 중복 이미지를 합치고 압축하여 파일 크기를 줄입니다.")
+        self.check_optimize.setChecked(settings.value("export/optimize", False, type=bool))
+        self.check_optimize.toggled.connect(self.on_optimize_toggled)
+        export_layout.addWidget(self.check_optimize)
+        
+        group_export.setLayout(export_layout)
+        layout.addWidget(group_export)
+        
         # About / License Group
         group_about = QGroupBox("About")
         about_layout = QVBoxLayout()
@@ -70,6 +176,67 @@ class SettingsDialog(QDialog):
         
         layout.addLayout(btn_layout)
         
+    def _page_cache(self):
+        from backend.pdf_cache import PdfPageCache
+        settings = QSettings("Saekim", "SaekimEditor")
+        max_mb = settings.value("pdf_import/page_cache_max_mb", 512, type=int)
+        return PdfPageCache(max_bytes=max_mb * 1024 * 1024)
+    
+    def update_cache_stats(self):
+        """Show size and page count of the PDF page cache"""
+        stats = self._page_cache().stats()
+        size_mb = stats["size_bytes"] / (1024 * 1024)
+        max_mb = stats["max_bytes"] / (1024 * 1024)
+        self.label_cache_stats.setText(f"{stats['pages']} pages, {size_mb:.1f} / {max_mb:.0f} MB")
+        self.label_cache_stats.setToolTip(stats["path"])
+    
+    def on_page_cache_toggled(self, checked):
+        settings = QSettings("Saekim", "SaekimEditor")
+        settings.setValue("pdf_import/page_cache", checked)
+    
+    def on_low_memory_toggled(self, checked):
+        settings = QSettings("Saekim", "SaekimEditor")
+        settings.setValue("pdf_import/low_memory", checked)
+    
+    def on_column_detection_toggled(self, checked):
+        settings = QSettings("Saekim", "SaekimEditor")
+        settings.setValue("pdf_import/column_detection", checked)
+    
+    def on_vector_figures_toggled(self, checked):
+        settings = QSettings("Saekim", "SaekimEditor")
+        settings.setValue("pdf_import/vector_figures", checked)
+    
+    def on_image_size_changed(self, index):
+        settings = QSettings("Saekim", "SaekimEditor")
+        size = self.combo_image_size.itemData(index)
+        settings.setValue("pdf_import/image_max_dimension", size)
+        self.combo_image_format.setEnabled(size != 0)
+    
+    def on_image_format_changed(self, index):
+        settings = QSettings("Saekim", "SaekimEditor")
+        settings.setValue("pdf_import/image_format", self.combo_image_format.itemData(index))
+    
+    def on_table_engine_changed(self, index):
+        settings = QSettings("Saekim", "SaekimEditor")
+        settings.setValue("pdf_import/table_engine", self.combo_table_engine.itemData(index))
+    
+    def on_export_engine_changed(self, index):
+        settings = QSettings("Saekim", "SaekimEditor")
+        settings.setValue("export/engine", self.combo_export_engine.itemData(index))
+    
+    def on_prewarm_toggled(self, checked):
+        settings = QSettings("Saekim", "SaekimEditor")
+        settings.setValue("export/prewarm", checked)
+    
+    def on_optimize_toggled(self, checked):
+        settings = QSettings("Saekim", "SaekimEditor")
+        settings.setValue("export/optimize", checked)
+    
+    def clear_pdf_cache(self):
+        """Delete all cached PDF pages"""
+        self._page_cache().clear()
+        self.update_cache_stats()
+    
     def open_license_dialog(self):
         """Open the license information dialog"""
         dialog = LicenseDialog(self)